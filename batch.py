@@ -0,0 +1,306 @@
+"""Sort many independent arrays on a pool of worker processes or threads.
+
+Every array is a job. Unless an algorithm is given, ``choose_algorithm``
+picks one per array: insertion sort for tiny arrays, radix sort for integer
+keys and merge sort otherwise. Small jobs are grouped into tasks of about
+``TASK_ELEMENTS`` values so the pool does not get one message per array, and
+the pool lives as long as the ``BatchSorter``, so its workers start once for
+the whole batch. Arrays of ``SHARED_MEMORY_SIZE`` values or more are handed to
+worker processes through shared memory instead of being pickled. The input
+may be any iterable, it is consumed as the workers keep up, and the results
+come back in the order of the input with the metrics of every sort:
+
+    with BatchSorter(workers=4) as sorter:
+        for result in sorter.sort(arrays):
+            print(result["index"], result["algorithm"], result["elapsed"])
+
+    python -m main batch arrays.txt --output sorted.txt --workers 8 --csv jobs.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+from sorting_engine import ALGORITHMS, SortStats, value_typecode
+
+EXECUTORS = ["process", "thread"]
+
+# Arrays up to this size are sorted by insertion sort
+SMALL_SIZE = 32
+
+# Values and jobs grouped into one task of the pool
+TASK_ELEMENTS = 1 << 16
+TASK_JOBS = 256
+
+# Arrays from this size on are passed to worker processes in shared memory
+SHARED_MEMORY_SIZE = 1 << 17
+
+# Tasks queued per worker, more input is only read when results are taken
+TASKS_PER_WORKER = 4
+
+INTEGER_TYPECODES = "bBhHiIlLqQ"
+
+CSV_FIELDS = ["index", "algorithm", "size", "comparisons", "swaps", "writes", "elapsed", "error"]
+
+
+def choose_algorithm(numbers):
+    if len(numbers) <= SMALL_SIZE:
+        return "Insertion Sort"
+    if isinstance(numbers, array):
+        integers = numbers.typecode in INTEGER_TYPECODES
+    else:
+        integers = value_typecode(numbers) == "q"
+    return "Radix Sort" if integers else "Merge Sort"
+
+
+class SharedBlock:
+    # An array in shared memory, by name so it pickles into a few bytes
+    def __init__(self, name, typecode, size):
+        self.name = name
+        self.typecode = typecode
+        self.size = size
+
+
+def share(numbers):
+    # Copy the numbers into a new shared memory block, None when they do not fit a typed array
+    typecode = numbers.typecode if isinstance(numbers, array) else value_typecode(numbers)
+    try:
+        data = numbers if isinstance(numbers, array) else array(typecode, numbers)
+    except OverflowError:
+        return None, None
+    shm = shared_memory.SharedMemory(create=True, size=max(len(data) * data.itemsize, 1))
+    view = shm.buf.cast(typecode)
+    view[:len(data)] = data
+    view.release()
+    return shm, SharedBlock(shm.name, typecode, len(data))
+
+
+def read_shared(shm, block):
+    view = shm.buf.cast(block.typecode)
+    try:
+        return array(block.typecode, view[:block.size].tobytes())
+    finally:
+        view.release()
+
+
+def sort_job(index, numbers, algorithm_name):
+    # Sort one array in the worker, numbers is a list, an array.array or a SharedBlock,
+    # or the ValueError of an input that could not be read
+    result = {"index": index, "algorithm": algorithm_name, "size": 0, "numbers": None, "comparisons": 0,
+              "swaps": 0, "writes": 0, "elapsed": 0.0, "error": None}
+    if isinstance(numbers, ValueError):
+        result["error"] = str(numbers)
+        return result
+    shm = None
+    try:
+        if isinstance(numbers, SharedBlock):
+            block = numbers
+            shm = shared_memory.SharedMemory(name=block.name)
+            values = read_shared(shm, block).tolist()
+        else:
+            values = numbers.tolist() if isinstance(numbers, array) else list(numbers)
+        result["size"] = len(values)
+
+        stats = SortStats()
+        stats.start()
+        values = ALGORITHMS[algorithm_name](values, stats)
+        stats.stop()
+        result.update(comparisons=stats.comparisons, swaps=stats.swaps, writes=stats.writes,
+                      elapsed=stats.elapsed())
+
+        if shm is not None:
+            # The sorted numbers go back the same way, the parent reads them from the block
+            view = shm.buf.cast(block.typecode)
+            view[:block.size] = array(block.typecode, values)
+            view.release()
+        elif isinstance(numbers, array):
+            result["numbers"] = array(numbers.typecode, values)
+        else:
+            result["numbers"] = values
+    except (TypeError, ValueError, RecursionError, MemoryError) as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if shm is not None:
+            shm.close()
+    return result
+
+
+def sort_task(jobs):
+    return [sort_job(index, numbers, algorithm_name) for index, numbers, algorithm_name in jobs]
+
+
+class BatchSorter:
+    def __init__(self, workers=None, executor="process", algorithm=None):
+        # algorithm is the name of the algorithm for every array, None chooses one per array
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor} (choose from {', '.join(EXECUTORS)})")
+        if algorithm is not None and algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm} (choose from {', '.join(ALGORITHMS)})")
+        self.workers = workers or os.cpu_count() or 1
+        self.algorithm = algorithm
+        # Threads share the arrays anyway, only processes need the shared memory
+        self.use_shared_memory = executor == "process"
+        if executor == "process":
+            # Started before the workers so they share it, else every worker would unlink the blocks it saw
+            resource_tracker.ensure_running()
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def close(self):
+        self.executor.shutdown()
+
+    def tasks(self, arrays):
+        # Group the jobs into tasks, yields (jobs, shared memory blocks by index)
+        jobs = []
+        elements = 0
+        for index, numbers in enumerate(arrays):
+            if isinstance(numbers, ValueError):
+                # Reported in its place among the results
+                jobs.append((index, numbers, None))
+                continue
+            algorithm_name = self.algorithm or choose_algorithm(numbers)
+            if self.use_shared_memory and len(numbers) >= SHARED_MEMORY_SIZE:
+                if jobs:
+                    yield jobs, {}
+                    jobs, elements = [], 0
+                shm, block = share(numbers)
+                if shm is not None:
+                    yield [(index, block, algorithm_name)], {index: (shm, block)}
+                    continue
+            jobs.append((index, numbers, algorithm_name))
+            elements += len(numbers)
+            if elements >= TASK_ELEMENTS or len(jobs) >= TASK_JOBS:
+                yield jobs, {}
+                jobs, elements = [], 0
+        if jobs:
+            yield jobs, {}
+
+    def sort(self, arrays):
+        # Results in the order of the arrays, a dict per array with the sorted numbers and the metrics
+        pending = deque()
+        limit = self.workers * TASKS_PER_WORKER
+        try:
+            for jobs, shared in self.tasks(arrays):
+                pending.append((self.executor.submit(sort_task, jobs), shared))
+                while len(pending) >= limit:
+                    yield from self.collect(*pending.popleft())
+            while pending:
+                yield from self.collect(*pending.popleft())
+        finally:
+            # Stopped early or failed, drop the queued tasks and free their blocks
+            for future, shared in pending:
+                future.cancel()
+                for shm, _ in shared.values():
+                    shm.close()
+                    shm.unlink()
+
+    def collect(self, future, shared):
+        try:
+            results = future.result()
+            for result in results:
+                if result["index"] in shared and result["error"] is None:
+                    result["numbers"] = read_shared(*shared[result["index"]])
+        finally:
+            for shm, _ in shared.values():
+                shm.close()
+                shm.unlink()
+        return results
+
+
+def sort_batch(arrays, workers=None, executor="process", algorithm=None):
+    # All results of a batch at once
+    with BatchSorter(workers, executor, algorithm) as sorter:
+        return list(sorter.sort(arrays))
+
+
+def read_arrays(stream):
+    # One array per line, numbers separated by commas or whitespace. A line that cannot
+    # be read is yielded as its ValueError, so the other lines are still sorted.
+    from input_loader import load_string
+
+    for line in stream:
+        try:
+            yield load_string(line)
+        except ValueError as e:
+            yield e
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main batch",
+                                     description="Sort many arrays, one per line of the input, on a pool of workers.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one array per line, '-' for stdin (default: -)")
+    parser.add_argument("--output", default="-", metavar="PATH", help="sorted arrays, '-' for stdout (default: -)")
+    parser.add_argument("--algorithm", default="auto", metavar="NAME",
+                        help=f"one of: {', '.join(ALGORITHMS)}, or auto to choose per array (default: auto)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes or threads (default: the number of CPUs)")
+    parser.add_argument("--executor", default="process", choices=EXECUTORS, help="(default: process)")
+    parser.add_argument("--csv", metavar="PATH", help="write the metrics of every array as CSV")
+    parser.add_argument("--stats", action="store_true", help="print a summary of the batch to stderr")
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        raise SystemExit("--workers must be at least 1")
+    algorithm = None if args.algorithm == "auto" else args.algorithm
+    try:
+        sorter = BatchSorter(args.workers, args.executor, algorithm)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    source = sys.stdin if args.input == "-" else None
+    out = sys.stdout if args.output == "-" else None
+    metrics = None
+    started = time.perf_counter()
+    jobs = elements = failed = 0
+    try:
+        source = source or open(args.input)
+        out = out or open(args.output, "w")
+        if args.csv:
+            metrics = open(args.csv, "w", newline="")
+            writer = csv.DictWriter(metrics, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+
+        for result in sorter.sort(read_arrays(source)):
+            jobs += 1
+            elements += result["size"]
+            if result["error"] is not None:
+                # An empty line keeps the output in line with the input
+                failed += 1
+                algorithm = f"{result['algorithm']}: " if result["algorithm"] is not None else ""
+                sys.stderr.write(f"Line {result['index'] + 1}: {algorithm}{result['error']}\n")
+                out.write("\n")
+            else:
+                out.write(" ".join(map(str, result["numbers"])) + "\n")
+            if metrics is not None:
+                writer.writerow(result)
+    except (OSError, ValueError) as e:
+        raise SystemExit(str(e))
+    finally:
+        sorter.close()
+        for f in (source, out, metrics):
+            if f is not None and f not in (sys.stdin, sys.stdout):
+                f.close()
+
+    if args.stats:
+        elapsed = time.perf_counter() - started
+        sys.stderr.write(f"{jobs} arrays, {elements} values in {elapsed:.3f} s "
+                         f"({jobs / elapsed if elapsed > 0 else 0:,.0f} arrays/s), {failed} failed\n")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Benchmark the sorting algorithms without the GUI.
+
+Example:
+
+    python benchmark.py --sizes 100 1000 10000 --distributions random sorted --repeat 5 --json results.json
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+import tracemalloc
+
+import datasets
+from sorting_engine import BACKENDS, QUADRATIC_ALGORITHMS, SortStats, get_algorithms
+
+# Distributions run by default, any of datasets.DISTRIBUTIONS can be chosen
+DISTRIBUTIONS = ["uniform", "sorted", "reversed", "nearly-sorted", "many-duplicates", "organ-pipe"]
+
+RESULT_FIELDS = ["algorithm", "backend", "distribution", "size", "repeat", "status",
+                 "wall_min", "wall_median", "wall_p90", "wall_max", "wall_mean",
+                 "cpu_min", "cpu_median", "cpu_p90", "cpu_max", "cpu_mean",
+                 "comparisons", "swaps", "writes", "max_depth", "ops_per_second", "peak_memory"]
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    index = max(math.ceil(fraction * len(values)) - 1, 0)
+    return values[index]
+
+
+def summarize(prefix, values):
+    values = sorted(values)
+    return {
+        f"{prefix}_min": values[0],
+        f"{prefix}_median": percentile(values, 0.5),
+        f"{prefix}_p90": percentile(values, 0.9),
+        f"{prefix}_max": values[-1],
+        f"{prefix}_mean": sum(values) / len(values),
+    }
+
+
+def prepare(data, backend):
+    # Fresh copy of the input in the representation of the backend, made outside the timing
+    if backend == "numpy":
+        from numpy_backend import as_array
+        return as_array(data)
+    return list(data)
+
+
+def is_sorted(numbers):
+    if hasattr(numbers, "dtype"):
+        return bool((numbers[:-1] <= numbers[1:]).all())
+    return all(numbers[i] <= numbers[i + 1] for i in range(len(numbers) - 1))
+
+
+def run_once(algorithm, data, backend="python"):
+    numbers = prepare(data, backend)
+    stats = SortStats()
+    cpu_start = time.process_time()
+    stats.start()
+    algorithm(numbers, stats)
+    stats.stop()
+    cpu_time = time.process_time() - cpu_start
+    wall_time = stats.elapsed()
+
+    if not is_sorted(numbers):
+        raise AssertionError("result is not sorted")
+    return wall_time, cpu_time, stats
+
+
+def measure_peak_memory(algorithm, data, backend="python"):
+    # Peak of the input plus everything the algorithm allocates
+    tracemalloc.start()
+    numbers = prepare(data, backend)
+    try:
+        algorithm(numbers, SortStats())
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(algorithm_name, distribution, size, repeat=3, warmup=1, seed=0, memory=True, backend="python"):
+    result = {"algorithm": algorithm_name, "backend": backend, "distribution": distribution, "size": size,
+              "repeat": repeat}
+    algorithm = get_algorithms(backend)[algorithm_name]
+    # The same cached input for every algorithm
+    data = datasets.get_dataset(distribution, size, seed)
+
+    try:
+        for _ in range(warmup):
+            run_once(algorithm, data, backend)
+
+        wall_times = []
+        cpu_times = []
+        for _ in range(repeat):
+            wall_time, cpu_time, stats = run_once(algorithm, data, backend)
+            wall_times.append(wall_time)
+            cpu_times.append(cpu_time)
+
+        result.update(summarize("wall", wall_times))
+        result.update(summarize("cpu", cpu_times))
+        # The algorithms are deterministic, so the counters of the last run are representative
+        result.update(stats.as_dict())
+        result["ops_per_second"] = stats.operations / result["wall_median"] if result["wall_median"] > 0 else 0.0
+        result["peak_memory"] = measure_peak_memory(algorithm, data, backend) if memory else None
+        result["status"] = "ok"
+    except (RecursionError, MemoryError, AssertionError, TypeError, ValueError) as e:
+        result["status"] = f"error: {type(e).__name__}: {e}"
+    return result
+
+
+def iter_benchmarks(algorithms, distributions, sizes, repeat, warmup, seed, memory, max_quadratic_size,
+                    backend="python"):
+    for size in sizes:
+        for distribution in distributions:
+            for algorithm_name in algorithms:
+                if algorithm_name in QUADRATIC_ALGORITHMS and size > max_quadratic_size:
+                    yield {"algorithm": algorithm_name, "backend": backend, "distribution": distribution,
+                           "size": size, "repeat": repeat, "status": "skipped"}
+                    continue
+                yield benchmark(algorithm_name, distribution, size, repeat, warmup, seed, memory, backend)
+
+
+def print_row(result, out=sys.stdout):
+    if result["status"] != "ok":
+        out.write(f"{result['algorithm']:<20} {result['distribution']:<16} {result['size']:>10}  {result['status']}\n")
+        return
+    memory = result["peak_memory"]
+    memory = f"{memory / 1024:.0f} KiB" if memory is not None else "-"
+    out.write(f"{result['algorithm']:<20} {result['distribution']:<16} {result['size']:>10} "
+              f"{result['wall_median'] * 1000:>12.3f} {result['cpu_median'] * 1000:>12.3f} "
+              f"{result['comparisons']:>14} {result['swaps']:>12} {result['writes']:>12} "
+              f"{result['ops_per_second']:>14.0f} {memory:>12}\n")
+    out.flush()
+
+
+def write_json(results, path):
+    f = sys.stdout if path == "-" else open(path, "w")
+    try:
+        json.dump(results, f, indent=2)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def write_csv(results, path):
+    f = sys.stdout if path == "-" else open(path, "w", newline="")
+    try:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS, restval="")
+        writer.writeheader()
+        writer.writerows(results)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def add_arguments(parser):
+    parser.add_argument("--algorithms", nargs="+", metavar="NAME",
+                        help="algorithms to run (default: all of the backend)")
+    parser.add_argument("--backend", default="python", choices=BACKENDS,
+                        help="lists of Python ints or NumPy arrays (default: python)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000, 10000], metavar="N",
+                        help="input sizes (default: 10 100 1000 10000)")
+    parser.add_argument("--distributions", nargs="+", default=DISTRIBUTIONS,
+                        choices=datasets.DISTRIBUTIONS + list(datasets.ALIASES), metavar="NAME",
+                        help=f"input distributions: {', '.join(datasets.DISTRIBUTIONS)} "
+                             f"(default: {' '.join(DISTRIBUTIONS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (default: 3)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per case (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the input data (default: 0)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurement")
+    parser.add_argument("--max-quadratic-size", type=int, default=10000,
+                        help="skip O(n^2) algorithms above this size (default: 10000)")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON ('-' for stdout)")
+    parser.add_argument("--csv", metavar="PATH", help="write the results as CSV ('-' for stdout)")
+
+
+def run(args):
+    try:
+        algorithms = get_algorithms(args.backend)
+    except ImportError as e:
+        raise SystemExit(f"The {args.backend} backend is not available: {e}")
+    args.algorithms = args.algorithms or list(algorithms)
+    for name in args.algorithms:
+        if name not in algorithms:
+            raise SystemExit(f"Unknown algorithm: {name} (choose from {', '.join(algorithms)})")
+    if args.repeat < 1:
+        raise SystemExit("--repeat must be at least 1")
+
+    # Keep the table out of stdout when a report is written there
+    out = sys.stderr if "-" in (args.json, args.csv) else sys.stdout
+    out.write(f"{'algorithm':<20} {'distribution':<16} {'size':>10} {'wall ms':>12} {'cpu ms':>12} "
+              f"{'comparisons':>14} {'swaps':>12} {'writes':>12} {'ops/s':>14} {'peak memory':>12}\n")
+
+    results = []
+    for result in iter_benchmarks(args.algorithms, args.distributions, args.sizes, args.repeat, args.warmup,
+                                  args.seed, not args.no_memory, args.max_quadratic_size, args.backend):
+        print_row(result, out)
+        results.append(result)
+
+    if args.json:
+        write_json(results, args.json)
+    if args.csv:
+        write_csv(results, args.csv)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sorting algorithms.")
+    add_arguments(parser)
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
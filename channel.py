@@ -0,0 +1,84 @@
+"""Single-producer/single-consumer channel for the frames of a running sort.
+
+A worker thread publishes the state of the numbers it is sorting and the GUI
+thread consumes the latest one. The channel owns three buffers of the same
+size: the producer copies into its back buffer and swaps it with the ready
+slot, the consumer swaps its front buffer with the ready slot. The lock is
+only held for those swaps, so neither side waits for the other to copy or to
+paint, and no side ever reads a buffer the other one is writing. A frame that
+is replaced before it was consumed is dropped, the consumer only ever sees the
+newest state:
+
+    channel = SnapshotChannel(numbers, on_publish=lambda: wx.CallAfter(show_latest))
+    # in the worker
+    channel.publish(numbers, [i, j], position)
+    # in the GUI thread
+    frame = channel.consume()
+"""
+import threading
+import time
+
+# Shortest time between two published frames, copies in between are skipped
+PUBLISH_INTERVAL = 1 / 60
+
+
+class Frame:
+    __slots__ = ("numbers", "highlighted", "position", "sequence")
+
+    def __init__(self, numbers):
+        self.numbers = numbers
+        self.highlighted = []
+        self.position = 0
+        self.sequence = 0
+
+
+class SnapshotChannel:
+    def __init__(self, numbers, on_publish=None, interval=PUBLISH_INTERVAL):
+        # numbers is a list or an array.array, the buffers are copies of the same type
+        self.back = Frame(numbers[:])
+        self.ready = Frame(numbers[:])
+        self.front = Frame(numbers[:])
+        self.fresh = False
+        self.lock = threading.Lock()
+        # on_publish() is called in the producer when a frame is ready and the consumer
+        # has taken the previous one, so at most one notification is pending
+        self.on_publish = on_publish
+        self.interval = interval
+        self.last_publish = None
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, numbers, highlighted=(), position=0, force=False):
+        # Producer side, returns whether a frame was published
+        now = time.monotonic()
+        if not force and self.last_publish is not None and now - self.last_publish < self.interval:
+            return False
+        self.last_publish = now
+
+        frame = self.back
+        frame.numbers[:] = numbers
+        frame.highlighted = list(highlighted)
+        frame.position = position
+        self.published += 1
+        frame.sequence = self.published
+
+        with self.lock:
+            self.back, self.ready = self.ready, frame
+            notify = not self.fresh
+            if self.fresh:
+                # The previous frame was never consumed
+                self.dropped += 1
+            self.fresh = True
+        if notify and self.on_publish is not None:
+            self.on_publish()
+        return True
+
+    def consume(self):
+        # Consumer side, the newest frame or None when nothing new was published.
+        # The frame stays valid until the next call.
+        with self.lock:
+            if not self.fresh:
+                return None
+            self.front, self.ready = self.ready, self.front
+            self.fresh = False
+            return self.front
@@ -0,0 +1,265 @@
+"""Measure the complexity of the sorting algorithms instead of quoting it.
+
+An algorithm is run over a geometric series of input sizes. The comparisons,
+the element writes and the time of every size are then fitted to each of the
+models n, n log n and n^2 by regression in log space; the model with the
+smallest residual wins, with a confidence that says how clearly it beat the
+runner-up. When the winner differs from the textbook average case, the result
+is flagged, e.g. quick sort going quadratic on sorted input:
+
+    python -m main complexity --algorithms "Quick Sort" "Merge Sort" --distribution sorted
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+
+from sorting_engine import ALGORITHMS, QUADRATIC_ALGORITHMS, SortStats
+
+# Candidate models, from the cheapest to the most expensive
+MODELS = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * math.log2(n),
+    "n^2": lambda n: n * n,
+}
+
+MODEL_NAMES = list(MODELS)
+
+# Average-case growth of the comparisons (the writes for the algorithms that do not compare)
+EXPECTED = {
+    "Bubble Sort": "n^2",
+    "Selection Sort": "n^2",
+    "Quick Sort": "n log n",
+    "Insertion Sort": "n^2",
+    "Merge Sort": "n log n",
+    "Bottom-Up Merge Sort": "n log n",
+    "Intro Sort": "n log n",
+    "Heap Sort": "n log n",
+    "Tim Sort": "n log n",
+    "Radix Sort": "n",
+    "Counting Sort": "n",
+    "Parallel Merge Sort": "n log n",
+    "Parallel Quick Sort": "n log n",
+}
+
+METRICS = ["comparisons", "writes", "time"]
+
+# Smallest size of a series, below it the constant terms dominate
+MIN_SIZE = 16
+
+# Fits below this confidence are reported but not flagged as a deviation
+MIN_CONFIDENCE = 0.5
+
+CSV_FIELDS = ["algorithm", "distribution", "metric", "model", "coefficient", "exponent", "confidence",
+              "expected", "deviation", "error"]
+
+
+def geometric_sizes(max_size, min_size=MIN_SIZE, factor=2):
+    # max_size, max_size / factor, ... down to min_size, smallest first
+    sizes = []
+    size = max_size
+    while size >= min_size:
+        if not sizes or size != sizes[-1]:
+            sizes.append(size)
+        size = int(size / factor)
+    return sizes[::-1]
+
+
+def dataset_source(distribution, seed=0):
+    # Inputs of any size from the seeded datasets
+    import datasets
+
+    return lambda size: datasets.get_dataset(distribution, size, seed)
+
+
+def prefix_source(numbers):
+    # Inputs that are prefixes of the given numbers
+    return lambda size: numbers[:size]
+
+
+def measure(algorithm, numbers, repeat=3):
+    # Counters of one sort and the fastest of repeat timings
+    best = None
+    for _ in range(repeat):
+        stats = SortStats()
+        stats.start()
+        algorithm(list(numbers), stats)
+        stats.stop()
+        best = stats.elapsed() if best is None else min(best, stats.elapsed())
+    # A swap writes two elements
+    return {"size": len(numbers), "comparisons": stats.comparisons, "writes": stats.writes + 2 * stats.swaps,
+            "time": best}
+
+
+def fit(sizes, values):
+    # Fit values ~ c * model(n) for every model, None when there is nothing to fit
+    if len(sizes) < 2 or min(values) <= 0:
+        return None
+
+    errors = {}
+    coefficients = {}
+    for name, model in MODELS.items():
+        ratios = [math.log(value / model(size)) for size, value in zip(sizes, values)]
+        mean = sum(ratios) / len(ratios)
+        coefficients[name] = math.exp(mean)
+        errors[name] = math.sqrt(sum((ratio - mean) ** 2 for ratio in ratios) / len(ratios))
+
+    # Least squares slope of log(value) over log(n), the measured exponent
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(value) for value in values]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    exponent = (sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+                / sum((x - x_mean) ** 2 for x in xs))
+
+    ranked = sorted(MODEL_NAMES, key=errors.get)
+    best, runner_up = ranked[0], ranked[1]
+    # 1 when the best model fits exactly, 0 when the runner-up fits as well
+    confidence = 1 - errors[best] / errors[runner_up] if errors[runner_up] > 0 else 0.0
+    if len(sizes) < 3:
+        # Two points fit any model with a matching coefficient
+        confidence = min(confidence, MIN_CONFIDENCE / 2)
+    return {"model": best, "coefficient": coefficients[best], "exponent": exponent, "confidence": confidence,
+            "errors": errors}
+
+
+def analyse(algorithm_name, source, sizes, repeat=3, on_size=None):
+    # Measure the algorithm on source(size) for every size and fit the models.
+    # on_size(measurement) is called after every size.
+    algorithm = ALGORITHMS[algorithm_name]
+    result = {"algorithm": algorithm_name, "expected": EXPECTED.get(algorithm_name), "measurements": [],
+              "fits": {}, "model": None, "confidence": 0.0, "deviation": None, "error": None}
+    for size in sizes:
+        try:
+            measurement = measure(algorithm, source(size), repeat)
+        except (RecursionError, MemoryError, TypeError, ValueError) as e:
+            # Fit what was measured before the failure
+            result["error"] = f"{type(e).__name__} at n = {size}: {e}"
+            break
+        result["measurements"].append(measurement)
+        if on_size is not None:
+            on_size(measurement)
+
+    measured_sizes = [measurement["size"] for measurement in result["measurements"]]
+    for metric in METRICS:
+        result["fits"][metric] = fit(measured_sizes, [measurement[metric] for measurement in result["measurements"]])
+
+    # The counters are exact, so they decide rather than the time
+    verdict = result["fits"]["comparisons"] or result["fits"]["writes"]
+    if verdict is not None:
+        result["model"] = verdict["model"]
+        result["confidence"] = verdict["confidence"]
+        expected = result["expected"]
+        if expected is not None and verdict["confidence"] >= MIN_CONFIDENCE and verdict["model"] != expected:
+            worse = MODEL_NAMES.index(verdict["model"]) > MODEL_NAMES.index(expected)
+            result["deviation"] = "worse" if worse else "better"
+    return result
+
+
+def summary(result):
+    # One line for the complexity field of the GUI
+    name = result["algorithm"]
+    if result["model"] is None:
+        return f"{name}: not enough measurements to estimate the complexity."
+    text = f"{name} measured O({result['model']}) ({result['confidence']:.0%} confidence)"
+    if result["deviation"] == "worse":
+        text += f", worse than the expected O({result['expected']})!"
+    elif result["deviation"] == "better":
+        text += f", better than the expected O({result['expected']}) on this input."
+    elif result["model"] != result["expected"] and result["expected"] is not None:
+        text += f", too uncertain to tell from the expected O({result['expected']})."
+    elif result["expected"] is not None:
+        text += ", as expected."
+    return text
+
+
+def details(result):
+    # The fit of every metric, as c * model with the measured exponent
+    sizes = [measurement["size"] for measurement in result["measurements"]]
+    parts = []
+    for metric in METRICS:
+        fitted = result["fits"][metric]
+        if fitted is None:
+            continue
+        coefficient = f"{fitted['coefficient']:.3g}" if metric != "time" else f"{fitted['coefficient'] * 1e9:.3g} ns"
+        parts.append(f"{metric} {coefficient}·{fitted['model']} (n^{fitted['exponent']:.2f})")
+    text = "; ".join(parts)
+    if sizes:
+        text = f"n = {sizes[0]}..{sizes[-1]}: {text}"
+    if result["error"] is not None:
+        text += f" [{result['error']}]"
+    return text
+
+
+def csv_rows(result):
+    for metric in METRICS:
+        fitted = result["fits"][metric]
+        row = {"algorithm": result["algorithm"], "distribution": result.get("distribution"), "metric": metric,
+               "expected": result["expected"], "deviation": result["deviation"], "error": result["error"]}
+        if fitted is not None:
+            row.update({key: fitted[key] for key in ("model", "coefficient", "exponent", "confidence")})
+        yield row
+
+
+def main(argv=None):
+    import datasets
+
+    parser = argparse.ArgumentParser(description="Estimate the complexity of the sorting algorithms.")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), metavar="NAME",
+                        help="algorithms to analyse (default: all)")
+    parser.add_argument("--distribution", default="uniform", choices=datasets.DISTRIBUTIONS + list(datasets.ALIASES),
+                        help="(default: uniform)")
+    parser.add_argument("--seed", type=int, default=0, help="(default: 0)")
+    parser.add_argument("--min-size", type=int, default=MIN_SIZE, help=f"smallest size (default: {MIN_SIZE})")
+    parser.add_argument("--max-size", type=int, default=16384, help="largest size (default: 16384)")
+    parser.add_argument("--max-quadratic-size", type=int, default=2048,
+                        help="largest size of the O(n^2) algorithms (default: 2048)")
+    parser.add_argument("--factor", type=float, default=2, help="ratio of consecutive sizes (default: 2)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size (default: 3)")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON ('-' for stdout)")
+    parser.add_argument("--csv", metavar="PATH", help="write the fits as CSV ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    for name in args.algorithms:
+        if name not in ALGORITHMS:
+            raise SystemExit(f"Unknown algorithm: {name} (choose from {', '.join(ALGORITHMS)})")
+    if args.factor <= 1 or args.repeat < 1:
+        raise SystemExit("--factor must be above 1 and --repeat at least 1")
+
+    # Keep the summary out of stdout when a report is written there
+    out = sys.stderr if "-" in (args.json, args.csv) else sys.stdout
+    source = dataset_source(args.distribution, args.seed)
+    results = []
+    for name in args.algorithms:
+        max_size = min(args.max_size, args.max_quadratic_size) if name in QUADRATIC_ALGORITHMS else args.max_size
+        started = time.perf_counter()
+        result = analyse(name, source, geometric_sizes(max_size, args.min_size, args.factor), args.repeat)
+        result["distribution"] = args.distribution
+        results.append(result)
+        out.write(f"{summary(result)}\n    {details(result)} ({time.perf_counter() - started:.1f} s)\n")
+        out.flush()
+
+    if args.json:
+        f = sys.stdout if args.json == "-" else open(args.json, "w")
+        try:
+            json.dump(results, f, indent=2)
+        finally:
+            if f is not sys.stdout:
+                f.close()
+    if args.csv:
+        f = sys.stdout if args.csv == "-" else open(args.csv, "w", newline="")
+        try:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, restval="")
+            writer.writeheader()
+            for result in results:
+                writer.writerows(csv_rows(result))
+        finally:
+            if f is not sys.stdout:
+                f.close()
+    return results
+
+
+if __name__ == "__main__":
+    main()
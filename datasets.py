@@ -0,0 +1,277 @@
+"""Seeded input datasets for the GUI, the benchmark and the command line.
+
+A dataset is fully determined by its distribution, size and seed, so every
+algorithm can be given exactly the same input. Datasets are typed ``array``
+buffers of integers. ``get_dataset`` keeps recently used datasets in memory
+and larger ones on disk as well, so they are generated only once:
+
+    numbers = list(get_dataset("zipf", 100000, seed=1))
+"""
+import argparse
+import bisect
+import math
+import os
+import random
+import tempfile
+from array import array
+from collections import OrderedDict
+
+# Bumped whenever a generator changes, so old cached files are not reused
+GENERATOR_VERSION = 1
+
+# Datasets with fewer values are regenerated instead of being read from disk
+DISK_CACHE_MIN_SIZE = 10000
+
+# Values kept in the in-memory cache
+MEMORY_CACHE_VALUES = 1 << 24
+
+# Exponent of the Zipf distribution
+ZIPF_EXPONENT = 1.2
+
+CACHE_DIR = os.environ.get("SORTING_DATASET_CACHE",
+                           os.path.join(os.path.expanduser("~"), ".cache", "sorting_algorithms", "datasets"))
+
+# Old names that still select a distribution
+ALIASES = {"random": "uniform"}
+
+
+def permutation(size, rng):
+    numbers = list(range(1, size + 1))
+    rng.shuffle(numbers)
+    return numbers
+
+
+def uniform(size, rng):
+    return [rng.randrange(size) for _ in range(size)]
+
+
+def gaussian(size, rng):
+    # Centered in 0..size-1 with most values within a third of the range
+    mean = (size - 1) / 2
+    deviation = max(size / 6, 1)
+    return [min(max(round(rng.gauss(mean, deviation)), 0), size - 1) for _ in range(size)]
+
+
+def zipf(size, rng):
+    # Value k is picked with a probability proportional to 1 / k^s, so small values dominate
+    cumulative = []
+    total = 0.0
+    for k in range(1, size + 1):
+        total += 1 / k ** ZIPF_EXPONENT
+        cumulative.append(total)
+    return [bisect.bisect_left(cumulative, rng.random() * total) + 1 for _ in range(size)]
+
+
+def ascending(size, rng):
+    return list(range(size))
+
+
+def descending(size, rng):
+    return list(range(size, 0, -1))
+
+
+def sorted_with_inversions(size, rng, inversions):
+    # Swapping distinct, non-touching neighbour pairs adds exactly one inversion each
+    numbers = list(range(size))
+    positions = rng.sample(range(0, size - 1, 2), min(inversions, size // 2))
+    for i in positions:
+        numbers[i], numbers[i + 1] = numbers[i + 1], numbers[i]
+    return numbers
+
+
+def nearly_sorted(size, rng):
+    return sorted_with_inversions(size, rng, max(size // 100, 1))
+
+
+def sawtooth(size, rng):
+    tooth = max(int(math.sqrt(size)), 1)
+    return [i % tooth for i in range(size)]
+
+
+def organ_pipe(size, rng):
+    half = size // 2
+    return list(range(half)) + list(range(size - half, 0, -1))
+
+
+def many_duplicates(size, rng):
+    distinct = max(int(math.sqrt(size)), 1)
+    return [rng.randrange(distinct) for _ in range(size)]
+
+
+def all_equal(size, rng):
+    return [1] * size
+
+
+class Adversary:
+    # McIlroy's "killer adversary for quicksort": values are decided only when they are
+    # compared, always so that the current pivot candidate ends up as small as possible
+    def __init__(self, size):
+        self.gas = size
+        self.values = [size] * size
+        self.solid = 0
+        self.candidate = 0
+
+    def freeze(self, index):
+        self.values[index] = self.solid
+        self.solid += 1
+
+    def compare(self, x, y):
+        values = self.values
+        if values[x] == self.gas and values[y] == self.gas:
+            self.freeze(x if x == self.candidate else y)
+        if values[x] == self.gas:
+            self.candidate = x
+        elif values[y] == self.gas:
+            self.candidate = y
+        return values[x] - values[y]
+
+
+class AdversaryItem:
+    def __init__(self, adversary, index):
+        self.adversary = adversary
+        self.index = index
+
+    def __lt__(self, other):
+        return self.adversary.compare(self.index, other.index) < 0
+
+    def __le__(self, other):
+        return self.adversary.compare(self.index, other.index) <= 0
+
+    def __gt__(self, other):
+        return self.adversary.compare(self.index, other.index) > 0
+
+    def __ge__(self, other):
+        return self.adversary.compare(self.index, other.index) >= 0
+
+
+def quicksort_killer(size, rng):
+    # Worst case input for the median-of-three partitioning of intro_sort, found by
+    # running it against the adversary; the plain quick_sort is already killed by sorted input
+    from sorting_engine import intro_sort
+
+    adversary = Adversary(size)
+    intro_sort([AdversaryItem(adversary, i) for i in range(size)])
+    # Values never compared are still gas, they are all larger than the frozen ones
+    return [value if value != adversary.gas else size for value in adversary.values]
+
+
+GENERATORS = {
+    "permutation": permutation,
+    "uniform": uniform,
+    "gaussian": gaussian,
+    "zipf": zipf,
+    "sorted": ascending,
+    "reversed": descending,
+    "nearly-sorted": nearly_sorted,
+    "sawtooth": sawtooth,
+    "organ-pipe": organ_pipe,
+    "many-duplicates": many_duplicates,
+    "all-equal": all_equal,
+    "quicksort-killer": quicksort_killer,
+}
+
+DISTRIBUTIONS = list(GENERATORS)
+
+memory_cache = OrderedDict()
+memory_cache_values = 0
+
+
+def resolve(distribution):
+    distribution = ALIASES.get(distribution, distribution)
+    if distribution not in GENERATORS:
+        raise ValueError(f"Unknown distribution: {distribution} (choose from {', '.join(DISTRIBUTIONS)})")
+    return distribution
+
+
+def generate(distribution, size, seed=0):
+    # A new dataset, the same one for the same arguments on every platform
+    distribution = resolve(distribution)
+    rng = random.Random(f"{distribution}/{size}/{seed}")
+    return array("q", GENERATORS[distribution](size, rng))
+
+
+def cache_path(distribution, size, seed, cache_dir):
+    return os.path.join(cache_dir, f"{distribution}-{size}-{seed}-v{GENERATOR_VERSION}.q")
+
+
+def read_cached(path, size):
+    numbers = array("q")
+    try:
+        with open(path, "rb") as f:
+            numbers.fromfile(f, size)
+    except (OSError, EOFError):
+        return None
+    return numbers
+
+
+def write_cached(path, numbers):
+    # Written to a temporary file first, so a concurrent reader never sees half a file
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False) as f:
+            numbers.tofile(f)
+        os.replace(f.name, path)
+    except OSError:
+        # The cache is only an optimization
+        pass
+
+
+def remember(key, numbers):
+    global memory_cache_values
+    memory_cache[key] = numbers
+    memory_cache_values += len(numbers)
+    while memory_cache_values > MEMORY_CACHE_VALUES and len(memory_cache) > 1:
+        _, old = memory_cache.popitem(last=False)
+        memory_cache_values -= len(old)
+
+
+def get_dataset(distribution, size, seed=0, cache_dir=CACHE_DIR):
+    # Like generate, but cached in memory and (for larger datasets) on disk.
+    # Returns a copy, so the caller may sort it in place. cache_dir None disables the disk cache.
+    distribution = resolve(distribution)
+    key = (distribution, size, seed)
+    numbers = memory_cache.get(key)
+    if numbers is not None:
+        memory_cache.move_to_end(key)
+        return array("q", numbers)
+
+    use_disk = cache_dir is not None and size >= DISK_CACHE_MIN_SIZE
+    path = cache_path(distribution, size, seed, cache_dir) if use_disk else None
+    numbers = read_cached(path, size) if use_disk else None
+    if numbers is None:
+        numbers = generate(distribution, size, seed)
+        if use_disk:
+            write_cached(path, numbers)
+
+    remember(key, numbers)
+    return array("q", numbers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a seeded dataset to a file.")
+    parser.add_argument("output", help="file to write, '-' for stdout")
+    parser.add_argument("--distribution", default="permutation", choices=DISTRIBUTIONS + list(ALIASES),
+                        help="(default: permutation)")
+    parser.add_argument("--size", type=int, default=1000, help="number of values (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="(default: 0)")
+    parser.add_argument("--format", default="text", choices=["text", "int64"],
+                        help="one value per line or raw int64 values (default: text)")
+    args = parser.parse_args(argv)
+
+    numbers = get_dataset(args.distribution, args.size, args.seed)
+    if args.output == "-":
+        import sys
+        if args.format == "text":
+            sys.stdout.write("".join(f"{value}\n" for value in numbers))
+        else:
+            sys.stdout.buffer.write(numbers.tobytes())
+    elif args.format == "text":
+        with open(args.output, "w") as f:
+            f.write("".join(f"{value}\n" for value in numbers))
+    else:
+        with open(args.output, "wb") as f:
+            numbers.tofile(f)
+
+
+if __name__ == "__main__":
+    main()
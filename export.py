@@ -0,0 +1,370 @@
+"""Render sort animations to GIF, PNG frames or MP4 without the window.
+
+The algorithm is recorded into a SortTrace at full speed and the frames are
+rendered from the trace by raster.RasterRenderer, in the styles of the
+window. Long sorts are decimated to fit the requested duration: every frame
+advances the trace by the same number of steps and highlights the last one.
+The frames are split into ranges that are rendered and encoded in parallel
+worker processes, so nothing waits for the animation speed of the window:
+
+    python -m main export merge.gif --algorithm "Merge Sort" --size 300 --graph column
+    python -m main export frames/ --format png --size 100000 --duration 20
+    python -m main export quick.mp4 --algorithm "Quick Sort" --fps 60
+
+GIF and PNG are written with the standard library alone, MP4 needs ffmpeg
+on the PATH. Rendering needs the optional ``numpy`` library.
+"""
+import argparse
+import math
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from sorting_engine import ALGORITHMS
+from sort_trace import SortTrace, TracePlayer
+
+FORMATS = ["gif", "png", "mp4"]
+
+GRAPH_TYPES = {"scatter": "Scatter Chart", "column": "Column (Bar) Graph", "stem": "Stem Graph"}
+
+# Colour levels of the gradient, so the levels plus the background, highlight and outline
+# colours fit into the 256 colour palette of a GIF
+COLOUR_LEVELS = 253
+
+# The colour of an empty wx panel
+BACKGROUND_RGB = (240, 240, 240)
+
+# Seconds the sorted numbers stay on screen at the end
+HOLD_SECONDS = 1.5
+
+# Frame ranges per worker, more ranges balance the load better
+RANGES_PER_WORKER = 4
+
+# Largest code of the GIF LZW compression
+MAX_LZW_CODE = 4096
+
+# Set up in every worker process by init_worker
+worker_state = None
+
+
+def frame_positions(steps, fps, duration=None, steps_per_frame=None):
+    # Trace positions of the frames, from the unsorted numbers to the sorted ones
+    if steps_per_frame is None:
+        frames = max(int(fps * duration), 1) if duration else steps
+        steps_per_frame = max(math.ceil(steps / frames), 1)
+    positions = list(range(0, steps, steps_per_frame))
+    positions.append(steps)
+    return positions
+
+
+def split_ranges(count, parts):
+    # Contiguous (start, end) ranges of about the same length
+    parts = max(min(parts, count), 1)
+    bounds = [count * k // parts for k in range(parts + 1)]
+    return [(bounds[k], bounds[k + 1]) for k in range(parts) if bounds[k] < bounds[k + 1]]
+
+
+def lzw_compress(pixels, min_code_size=8):
+    # Variable length LZW of the GIF format, pixels is a bytes object of palette indices
+    clear_code = 1 << min_code_size
+    end_code = clear_code + 1
+    out = bytearray()
+    state = {"buffer": 0, "bits": 0, "code_size": min_code_size + 1}
+    next_code = end_code + 1
+    table = {}
+
+    def emit(code):
+        buffer = state["buffer"] | code << state["bits"]
+        bits = state["bits"] + state["code_size"]
+        while bits >= 8:
+            out.append(buffer & 0xFF)
+            buffer >>= 8
+            bits -= 8
+        state["buffer"] = buffer
+        state["bits"] = bits
+
+    emit(clear_code)
+    if not pixels:
+        emit(end_code)
+        if state["bits"]:
+            out.append(state["buffer"] & 0xFF)
+        return bytes(out)
+
+    prefix = pixels[0]
+    for pixel in pixels[1:]:
+        key = prefix << 8 | pixel
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix)
+        if next_code < MAX_LZW_CODE:
+            # The decoder widens its codes once the table needs one more bit
+            if next_code == 1 << state["code_size"] and state["code_size"] < 12:
+                state["code_size"] += 1
+            table[key] = next_code
+            next_code += 1
+        else:
+            # The table is full, start over
+            emit(clear_code)
+            table = {}
+            next_code = end_code + 1
+            state["code_size"] = min_code_size + 1
+        prefix = pixel
+
+    emit(prefix)
+    # The end code is read with the width the decoder has reached after the last entry
+    if next_code == 1 << state["code_size"] and state["code_size"] < 12:
+        state["code_size"] += 1
+    emit(end_code)
+    if state["bits"]:
+        out.append(state["buffer"] & 0xFF)
+    return bytes(out)
+
+
+def gif_sub_blocks(data):
+    blocks = bytearray()
+    for start in range(0, len(data), 255):
+        chunk = data[start:start + 255]
+        blocks.append(len(chunk))
+        blocks += chunk
+    blocks.append(0)
+    return bytes(blocks)
+
+
+def gif_frame(canvas, previous):
+    # Image data of the part of the frame that changed since the previous one
+    if previous is not None:
+        changed = canvas != previous
+        rows = changed.any(axis=1).nonzero()[0]
+        if len(rows) == 0:
+            # Nothing changed, a single unchanged pixel keeps the frame and its delay
+            return 0, 0, 1, 1, lzw_compress(canvas[:1, :1].tobytes())
+        columns = changed.any(axis=0).nonzero()[0]
+        top, bottom, left, right = rows[0], rows[-1] + 1, columns[0], columns[-1] + 1
+    else:
+        top, left = 0, 0
+        bottom, right = canvas.shape
+    region = canvas[top:bottom, left:right]
+    return int(left), int(top), int(right - left), int(bottom - top), lzw_compress(region.tobytes())
+
+
+def write_gif(stream, width, height, palette, frames, delays):
+    # frames yields the (left, top, width, height, lzw data) of gif_frame
+    stream.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF7, 0, 0))
+    stream.write(palette.tobytes().ljust(256 * 3, b"\0"))
+    # Loop forever
+    stream.write(b"\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00")
+    for (left, top, frame_width, frame_height, data), delay in zip(frames, delays):
+        # Graphic control extension: keep the previous frame under the changed part
+        stream.write(b"\x21\xF9\x04" + struct.pack("<BHBB", 0x04, delay, 0, 0))
+        stream.write(b"\x2C" + struct.pack("<HHHHB", left, top, frame_width, frame_height, 0))
+        stream.write(b"\x08" + gif_sub_blocks(data))
+    stream.write(b"\x3B")
+
+
+def png_bytes(image):
+    # An RGB image as a PNG file, every row without a filter
+    height, width = image.shape[:2]
+    rows = bytearray()
+    raw = image.tobytes()
+    stride = width * 3
+    for y in range(height):
+        rows.append(0)
+        rows += raw[y * stride:(y + 1) * stride]
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(bytes(rows), 6)) + \
+        chunk(b"IEND", b"")
+
+
+def init_worker(trace, settings):
+    global worker_state
+    from raster import RasterRenderer, gradient_colours
+
+    renderer = RasterRenderer()
+    player = TracePlayer(trace)
+    renderer.set_numbers(player.numbers)
+    renderer.set_colours(gradient_colours(settings["graph_type"], COLOUR_LEVELS), BACKGROUND_RGB)
+    worker_state = {"player": player, "renderer": renderer, "settings": settings}
+
+
+def render_position(position):
+    # Palette indices of the frame at a position of the trace
+    import numpy as np
+
+    player = worker_state["player"]
+    renderer = worker_state["renderer"]
+    settings = worker_state["settings"]
+    player.seek(position)
+    highlighted = player.current_indices if position > 0 else []
+    return renderer.render_levels(settings["width"], settings["height"], settings["graph_type"],
+                                  settings["min_number"], settings["max_number"], settings["scale"], highlighted,
+                                  dtype=np.uint8)
+
+
+def render_range(positions, first_index):
+    # Render and encode a range of frames in a worker, first_index is the number of the first one
+    settings = worker_state["settings"]
+    renderer = worker_state["renderer"]
+    file_format = settings["format"]
+    results = []
+    previous = None
+    if file_format == "gif" and first_index > 0:
+        # The frame before the range, to encode only what changed
+        previous = render_position(settings["previous_position"][first_index])
+    for index, position in enumerate(positions, first_index):
+        canvas = render_position(position)
+        if file_format == "gif":
+            results.append(gif_frame(canvas, previous))
+            previous = canvas
+        elif file_format == "png":
+            path = os.path.join(settings["output"], f"frame_{index:06d}.png")
+            with open(path, "wb") as f:
+                f.write(png_bytes(renderer.palette[canvas]))
+        else:
+            results.append(renderer.palette[canvas].tobytes())
+    return results
+
+
+def export(numbers, algorithm_name, output, file_format=None, graph="column", width=640, height=360, fps=30,
+           duration=10.0, steps_per_frame=None, workers=None, progress=None):
+    # Record the sort and write its animation, returns the number of frames
+    if file_format is None:
+        extension = os.path.splitext(output)[1].lower().lstrip(".")
+        file_format = extension if extension in FORMATS else "png"
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format: {file_format} (choose from {', '.join(FORMATS)})")
+    if file_format == "mp4" and shutil.which("ffmpeg") is None:
+        raise ValueError("MP4 export needs ffmpeg on the PATH")
+    if not numbers:
+        raise ValueError("No numbers to sort")
+
+    trace = SortTrace(numbers)
+    ALGORITHMS[algorithm_name](list(numbers), None, trace.record)
+
+    positions = frame_positions(len(trace), fps, duration, steps_per_frame)
+    min_number = min(numbers)
+    max_number = max(numbers) or 1
+    # Each frame is encoded against the one before it, so a worker needs the position of that frame
+    settings = {"format": file_format, "output": output, "graph_type": GRAPH_TYPES.get(graph, graph),
+                "width": width, "height": height, "min_number": min_number, "max_number": max_number,
+                "scale": (COLOUR_LEVELS - 1) / ((max_number - min_number) or 1),
+                "previous_position": [None] + positions[:-1]}
+    if file_format == "png":
+        os.makedirs(output, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    ranges = split_ranges(len(positions), workers * RANGES_PER_WORKER)
+    hold_frames = max(int(HOLD_SECONDS * fps), 1)
+    done = 0
+    encoder = None
+    gif_frames = []
+    try:
+        if file_format == "mp4":
+            encoder = subprocess.Popen(
+                ["ffmpeg", "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24", "-s",
+                 f"{width}x{height}", "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p", output],
+                stdin=subprocess.PIPE)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(trace, settings)) as pool:
+            futures = [pool.submit(render_range, positions[start:end], start) for start, end in ranges]
+            # In order, so the frames can be written as they arrive
+            for future, (start, end) in zip(futures, ranges):
+                results = future.result()
+                if file_format == "gif":
+                    gif_frames.extend(results)
+                elif file_format == "mp4":
+                    for frame in results:
+                        encoder.stdin.write(frame)
+                    if end == len(positions):
+                        for _ in range(hold_frames):
+                            encoder.stdin.write(results[-1])
+                done += end - start
+                if progress is not None:
+                    progress(done, len(positions))
+
+        if file_format == "gif":
+            import numpy as np
+            from raster import RasterRenderer, gradient_colours
+
+            renderer = RasterRenderer()
+            renderer.set_colours(gradient_colours(settings["graph_type"], COLOUR_LEVELS), BACKGROUND_RGB)
+            delay = max(round(100 / fps), 2)
+            delays = [delay] * (len(gif_frames) - 1) + [max(int(HOLD_SECONDS * 100), delay)]
+            with open(output, "wb") as f:
+                write_gif(f, width, height, renderer.palette.astype(np.uint8), gif_frames, delays)
+    finally:
+        if encoder is not None:
+            encoder.stdin.close()
+            encoder.wait()
+    if encoder is not None and encoder.returncode != 0:
+        raise ValueError(f"ffmpeg failed with exit code {encoder.returncode}")
+    return len(positions)
+
+
+def main(argv=None):
+    import datasets
+    from input_loader import load
+
+    parser = argparse.ArgumentParser(description="Render the animation of a sort to GIF, PNG frames or MP4.")
+    parser.add_argument("output", help="file to write, or the directory of the PNG frames")
+    parser.add_argument("--format", choices=FORMATS, help="(default: from the extension, png for a directory)")
+    parser.add_argument("--algorithm", default="Merge Sort", metavar="NAME",
+                        help=f"one of: {', '.join(ALGORITHMS)} (default: Merge Sort)")
+    parser.add_argument("--graph", default="column", choices=list(GRAPH_TYPES), help="(default: column)")
+    parser.add_argument("--input", metavar="PATH", help="numbers to sort (default: a generated dataset)")
+    parser.add_argument("--size", type=int, default=200, help="number of generated values (default: 200)")
+    parser.add_argument("--distribution", default="permutation",
+                        choices=datasets.DISTRIBUTIONS + list(datasets.ALIASES), help="(default: permutation)")
+    parser.add_argument("--seed", type=int, default=0, help="(default: 0)")
+    parser.add_argument("--width", type=int, default=640, help="(default: 640)")
+    parser.add_argument("--height", type=int, default=360, help="(default: 360)")
+    parser.add_argument("--fps", type=int, default=30, help="frames per second (default: 30)")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="seconds the sort takes, long sorts skip steps between frames (default: 10)")
+    parser.add_argument("--steps-per-frame", type=int, help="steps between frames, instead of --duration")
+    parser.add_argument("--workers", type=int, help="rendering processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    if args.algorithm not in ALGORITHMS:
+        raise SystemExit(f"Unknown algorithm: {args.algorithm} (choose from {', '.join(ALGORITHMS)})")
+    if args.fps < 1 or args.width < 1 or args.height <= 20:
+        raise SystemExit("--fps and --width must be positive and --height above 20")
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        raise SystemExit("Rendering needs numpy: pip install numpy")
+
+    try:
+        numbers = list(load(args.input)) if args.input else list(datasets.get_dataset(args.distribution, args.size,
+                                                                                       args.seed))
+    except (OSError, ValueError) as e:
+        raise SystemExit(str(e))
+
+    def progress(done, total):
+        sys.stderr.write(f"\r{done}/{total} frames")
+        sys.stderr.flush()
+
+    started = time.perf_counter()
+    try:
+        frames = export(numbers, args.algorithm, args.output, args.format, args.graph, args.width, args.height,
+                        args.fps, args.duration, args.steps_per_frame, args.workers, progress)
+    except (TypeError, ValueError) as e:
+        raise SystemExit(str(e))
+    except (RecursionError, MemoryError) as e:
+        raise SystemExit(f"{args.algorithm} failed: {type(e).__name__}: {e}")
+    elapsed = time.perf_counter() - started
+    sys.stderr.write(f"\r{frames} frames ({frames / args.fps:.1f} s of animation) rendered in {elapsed:.1f} s\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Out-of-core merge sort for files that do not fit into memory.
+
+The input is read in chunks that fit into the memory budget, every chunk is
+sorted in memory with one of the engine algorithms (optionally in worker
+processes) and spilled to a temporary run file. The runs are then merged with
+a heap based k-way merge that reads them through memory maps and writes the
+output in blocks. When there are more runs than MAX_FAN_IN they are merged in
+several passes.
+
+Binary files hold native-endian int32, int64 or float64 values, text files
+any number of values per line separated by whitespace or commas. Example:
+
+    python external_sort.py keys.bin sorted.bin --dtype int64 --memory 512M --workers 4
+"""
+import argparse
+import heapq
+import math
+import mmap
+import os
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from input_loader import iter_chunks
+from sorting_engine import ALGORITHMS, SortStats, add_stats
+
+DTYPES = {"int32": "i", "int64": "q", "float64": "d"}
+
+FORMATS = ["binary", "text"]
+
+# Bytes one value takes while it is a Python int or float in a list
+VALUE_OVERHEAD = 8 + 32
+
+# Most runs merged at once, more runs are merged in several passes
+MAX_FAN_IN = 64
+
+# Fewest values read or written at once
+MIN_BLOCK = 1024
+
+DEFAULT_MEMORY = 256 << 20
+
+SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text):
+    # "512M" -> 536870912
+    text = text.strip().upper().rstrip("B")
+    factor = SIZE_UNITS.get(text[-1:], 1)
+    if text[-1:] in SIZE_UNITS:
+        text = text[:-1]
+    try:
+        return int(float(text) * factor)
+    except ValueError:
+        raise ValueError(f"Not a size: {text}")
+
+
+def read_binary_chunks(path, typecode, chunk_size):
+    itemsize = array(typecode).itemsize
+    size = os.path.getsize(path)
+    if size % itemsize:
+        raise ValueError(f"{path}: {size} bytes is not a whole number of {itemsize} byte values")
+    if size == 0:
+        return
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            for start in range(0, size, chunk_size * itemsize):
+                chunk = array(typecode)
+                chunk.frombytes(view[start:start + chunk_size * itemsize])
+                yield chunk
+        finally:
+            view.release()
+
+
+def read_text_chunks(path, typecode, chunk_size):
+    chunk = array(typecode)
+    for numbers in iter_chunks(path, "text", typecode):
+        chunk.extend(numbers)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = array(typecode)
+    if chunk:
+        yield chunk
+
+
+def sort_run(chunk, algorithm, path):
+    # Sort one chunk and spill it to a run file
+    numbers = chunk.tolist()
+    stats = SortStats()
+    algorithm(numbers, stats)
+    with open(path, "wb") as f:
+        array(chunk.typecode, numbers).tofile(f)
+    return stats.as_dict()
+
+
+def iter_run(path, typecode, block):
+    # Values of a run file, read block by block through a memory map
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped).cast(typecode)
+            try:
+                for start in range(0, len(view), block):
+                    yield from view[start:start + block].tolist()
+            finally:
+                view.release()
+
+
+def write_values(values, path, typecode, text, block):
+    count = 0
+    with open(path, "w" if text else "wb") as f:
+        while True:
+            buffer = array(typecode, islice(values, block))
+            if not buffer:
+                break
+            if text:
+                f.write("\n".join(map(str, buffer)) + "\n")
+            else:
+                buffer.tofile(f)
+            count += len(buffer)
+    return count
+
+
+def merge_runs(paths, out_path, typecode, block, stats, text=False):
+    runs = [iter_run(path, typecode, block) for path in paths]
+    count = write_values(heapq.merge(*runs), out_path, typecode, text, block)
+    # heapq does not report its comparisons, a tournament of k runs needs log2(k) per element
+    stats.add(count * math.ceil(math.log2(len(paths))) if len(paths) > 1 else 0, 0, count)
+    return count
+
+
+def external_sort(input_path, output_path, dtype="int64", input_format="binary", output_format=None,
+                  memory=DEFAULT_MEMORY, algorithm=ALGORITHMS["Merge Sort"], stats=None, workers=1,
+                  tmp_dir=None):
+    # Sort the values of input_path into output_path, return the number of values
+    if dtype not in DTYPES:
+        raise ValueError(f"Unknown dtype: {dtype} (choose from {', '.join(DTYPES)})")
+    for file_format in (input_format, output_format or input_format):
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown format: {file_format} (choose from {', '.join(FORMATS)})")
+    typecode = DTYPES[dtype]
+    stats = stats if stats is not None else SortStats()
+    workers = max(workers or 1, 1)
+
+    # Every worker holds one chunk, the merge one block per run plus the output block
+    chunk_size = max(memory // (workers * VALUE_OVERHEAD), MIN_BLOCK)
+    fan_in = max(min(memory // (MIN_BLOCK * VALUE_OVERHEAD) - 1, MAX_FAN_IN), 2)
+    block = max(memory // ((fan_in + 1) * VALUE_OVERHEAD), MIN_BLOCK)
+
+    if input_format == "text":
+        chunks = read_text_chunks(input_path, typecode, chunk_size)
+    else:
+        chunks = read_binary_chunks(input_path, typecode, chunk_size)
+
+    stats.start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="external_sort_", dir=tmp_dir) as tmp:
+            runs = []
+            run_count = 0
+
+            def next_run_path():
+                nonlocal run_count
+                runs.append(os.path.join(tmp, f"run{run_count}.bin"))
+                run_count += 1
+                return runs[-1]
+
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    # At most one chunk per worker is in flight, to stay within the budget
+                    pending = []
+                    for chunk in chunks:
+                        pending.append(executor.submit(sort_run, chunk, algorithm, next_run_path()))
+                        if len(pending) >= workers:
+                            add_stats(stats, pending.pop(0).result())
+                    for task in pending:
+                        add_stats(stats, task.result())
+            else:
+                for chunk in chunks:
+                    add_stats(stats, sort_run(chunk, algorithm, next_run_path()))
+
+            # Merge passes until the remaining runs can be merged at once
+            while len(runs) > fan_in:
+                groups = [runs[start:start + fan_in] for start in range(0, len(runs), fan_in)]
+                runs = []
+                for group in groups:
+                    if len(group) == 1:
+                        runs.append(group[0])
+                        continue
+                    merge_runs(group, next_run_path(), typecode, block, stats)
+                    for path in group:
+                        os.remove(path)
+
+            return merge_runs(runs, output_path, typecode, block, stats, (output_format or input_format) == "text")
+    finally:
+        stats.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sort a file of numbers that may not fit into memory.")
+    parser.add_argument("input", help="file to sort")
+    parser.add_argument("output", help="file for the sorted numbers")
+    parser.add_argument("--dtype", default="int64", choices=DTYPES, help="type of the values (default: int64)")
+    parser.add_argument("--input-format", default="binary", choices=FORMATS, help="(default: binary)")
+    parser.add_argument("--output-format", choices=FORMATS, help="(default: the input format)")
+    parser.add_argument("--memory", default="256M", help="memory budget, like 64M or 2G (default: 256M)")
+    parser.add_argument("--algorithm", default="Merge Sort", metavar="NAME",
+                        help=f"algorithm for the chunks: {', '.join(ALGORITHMS)} (default: Merge Sort)")
+    parser.add_argument("--workers", type=int, default=1, help="processes sorting chunks (default: 1)")
+    parser.add_argument("--tmp-dir", help="directory for the sorted runs (default: the system temp directory)")
+    parser.add_argument("--stats", action="store_true", help="print the counters of the sort")
+    args = parser.parse_args(argv)
+
+    if args.algorithm not in ALGORITHMS:
+        raise SystemExit(f"Unknown algorithm: {args.algorithm} (choose from {', '.join(ALGORITHMS)})")
+    stats = SortStats()
+    try:
+        count = external_sort(args.input, args.output, args.dtype, args.input_format, args.output_format,
+                              parse_size(args.memory), ALGORITHMS[args.algorithm], stats, args.workers,
+                              args.tmp_dir)
+    except (OSError, TypeError, ValueError) as e:
+        raise SystemExit(str(e))
+    except (RecursionError, MemoryError) as e:
+        raise SystemExit(f"{args.algorithm} failed on a chunk: {type(e).__name__}: {e}")
+
+    if args.stats:
+        print(f"values: {count}")
+        for key, value in stats.snapshot().items():
+            print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1218 @@
+"""The wxPython visualization of the sorting algorithms, started by ``python -m main gui``."""
+import argparse
+import wx
+import time
+import threading
+import math
+
+import profiling
+
+from sorting_engine import ALGORITHMS, QUADRATIC_ALGORITHMS, SortCancelled, SortStats
+from sort_trace import SortTrace, TracePlayer
+from input_loader import load, load_string
+from datasets import DISTRIBUTIONS, get_dataset
+from race import Race, leaderboard
+from scheduler import FINISHED, FAILED, PAUSED, RUNNING, SortScheduler
+from sort_steps import get_steps
+from pacing import StepPacer, rate_from_slider, rate_text
+from channel import SnapshotChannel
+from complexity import analyse, dataset_source, details, geometric_sizes, prefix_source, summary
+from sonification import MidiSonifier, NullOutput, open_output
+
+# Frames per second of the sort playback
+FRAME_RATE = 30
+
+# Samples per second of the metrics of a running sort
+METRICS_RATE = 30
+
+# Largest size measured by the complexity analysis of random numbers, at least the size shown
+ANALYSIS_SIZE = 4096
+
+# The same for the O(n^2) algorithms
+ANALYSIS_QUADRATIC_SIZE = 1024
+
+# Radius of the circles in the scatter chart
+SCATTER_RADIUS = 3
+
+# Graphs with at least this many elements are drawn as one raster image when NumPy is installed
+RASTER_MIN_SIZE = 2048
+
+# Number of entries in the gradient color lookup table
+COLOUR_LEVELS = 256
+
+# Whether the colour database has been loaded
+colour_db_loaded = False
+
+
+def load_colour_db():
+    # The colour database only has to be loaded once, and only when a graph is shown
+    global colour_db_loaded
+    if not colour_db_loaded:
+        import wx.lib.colourdb
+        wx.lib.colourdb.updateColourDB()
+        colour_db_loaded = True
+
+
+def new_raster_renderer():
+    # None without NumPy, the graph is then drawn element by element
+    try:
+        from raster import RasterRenderer
+    except ImportError:
+        return None
+    return RasterRenderer()
+
+
+class SortingFrame(wx.Frame):
+    def __init__(self, sonifier=None):
+        # sonifier plays the steps, None keeps the window silent
+        wx.Frame.__init__(self, None, wx.ID_ANY, "Sorting Algorithms Visualization")
+        self.SetSize((1000, 740))  # Set the initial window size
+        self.Center()  # Center the window on the screen
+
+        # The sort being recorded, a task of the scheduler
+        self.scheduler = SortScheduler(workers=1)
+        self.recording = None
+        # Latest state of the numbers while the sort is being recorded
+        self.preview = None
+        self.algorithm = None
+        self.algorithm_name = None
+        self.numbers = None
+        self.initial_numbers = None
+        self.completed = 0
+        self.print_result = ""
+        # Result of the last complexity analysis, and the number of the analysis that is running
+        self.complexity_result = None
+        self.analysis_id = 0
+        self.comparison_count = 0
+        self.stats = None
+        self.trace = None
+        # Numbers typed in or loaded from a file, used instead of random numbers when set
+        self.input_numbers = None
+
+        self.panel = wx.Panel(self)
+
+        # State of the program
+        self.state = 0
+
+        # Sorting algorithms
+        self.algorithms = dict(ALGORITHMS)
+
+        # Graph panel
+        self.sonifier = sonifier
+        self.graph_panel = GraphPanel(self.panel, sonifier)
+
+        # Size options
+        self.size_label = wx.StaticText(self.panel, label="Size:")
+        self.random_size_slider = wx.Slider(self.panel, value=100, minValue=10, maxValue=500, style=wx.SL_HORIZONTAL)
+
+        # Distribution and seed of the generated numbers
+        self.distribution_label = wx.StaticText(self.panel, label="Data:")
+        self.distribution_choice = wx.Choice(self.panel, choices=DISTRIBUTIONS)
+        self.distribution_choice.SetStringSelection("permutation")
+        self.seed_label = wx.StaticText(self.panel, label="Seed:")
+        self.seed_spin = wx.SpinCtrl(self.panel, min=0, max=1000000, initial=0)
+
+        # Speed option in steps per second, it can be changed while the sort is played
+        self.speed_slider = wx.Slider(self.panel, value=50, minValue=1, maxValue=100, style=wx.SL_HORIZONTAL)
+        self.speed_label = wx.StaticText(self.panel, label=f"Speed: {rate_text(self.steps_per_second())}")
+
+        # Sorting algorithms list box
+        self.algorithms_radiobox = wx.RadioBox(self.panel, choices=list(self.algorithms.keys()),
+                                               style=wx.RA_SPECIFY_ROWS)
+
+        # Graph types radio buttons
+        self.graph_type_label = wx.StaticText(self.panel, label="Graph Type:")
+        self.graph_type_radiobox = wx.RadioBox(self.panel,
+                                               choices=["Scatter Chart", "Column (Bar) Graph", "Stem Graph"],
+                                               style=wx.RA_SPECIFY_ROWS)
+
+        # Create, Start, Stop, Reset buttons
+        self.button_create = wx.Button(self.panel, wx.ID_ANY, "Create")
+        self.button_start = wx.Button(self.panel, wx.ID_ANY, "Start")
+        self.button_stop = wx.Button(self.panel, wx.ID_ANY, "Stop")
+        self.button_reset = wx.Button(self.panel, wx.ID_ANY, "Reset")
+        self.button_step = wx.Button(self.panel, wx.ID_ANY, "Step")
+        self.button_race = wx.Button(self.panel, wx.ID_ANY, "Race...")
+
+        # Playback position of the recorded sort
+        self.position_label = wx.StaticText(self.panel, label="Step:")
+        self.position_slider = wx.Slider(self.panel, value=0, minValue=0, maxValue=1, style=wx.SL_HORIZONTAL)
+
+        # Frame time, draw calls and drawn elements over the graph
+        self.overlay_checkbox = wx.CheckBox(self.panel, label="Show frame stats")
+
+        # Box for array inputs
+        self.array_label = wx.StaticText(self.panel, label="Enter your numbers with , or spaces in between and press Enter:")
+        self.array_text = wx.TextCtrl(self.panel, style=wx.TE_PROCESS_ENTER)
+        self.button_load = wx.Button(self.panel, wx.ID_ANY, "Load File...")
+
+        # Bind event handlers
+        self.Bind(wx.EVT_BUTTON, self.on_create, self.button_create)
+        self.Bind(wx.EVT_BUTTON, self.on_start, self.button_start)
+        self.Bind(wx.EVT_BUTTON, self.on_stop, self.button_stop)
+        self.Bind(wx.EVT_BUTTON, self.on_reset, self.button_reset)
+        self.Bind(wx.EVT_BUTTON, self.on_step_once, self.button_step)
+        self.Bind(wx.EVT_BUTTON, self.on_race, self.button_race)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.Bind(wx.EVT_SLIDER, self.on_seek, self.position_slider)
+        self.Bind(wx.EVT_SLIDER, self.on_speed, self.speed_slider)
+        self.Bind(wx.EVT_CHECKBOX, self.on_overlay, self.overlay_checkbox)
+        self.Bind(wx.EVT_TEXT_ENTER, self.on_input_enter, self.array_text)
+        self.Bind(wx.EVT_BUTTON, self.on_load_file, self.button_load)
+
+        # Samples the metrics of the sorting thread while a sort is being recorded
+        self.metrics_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_metrics_timer, self.metrics_timer)
+
+        # Box for the result of comparisons and complexity analysis
+        self.comparison_label = wx.StaticText(self.panel, label="Comparisons Count:")
+        self.comparison_text = wx.TextCtrl(self.panel, style=wx.TE_READONLY)
+        self.complexity_type = wx.TextCtrl(self.panel, style=wx.TE_READONLY)
+        self.complexity_label = wx.StaticText(self.panel, label="Complexity:")
+        self.complexity_text = wx.TextCtrl(self.panel, style=wx.TE_READONLY)
+        self.comparison_text.SetMinSize(wx.Size(560, -1))
+        self.complexity_type.SetMinSize(wx.Size(673, -1))
+        self.complexity_text.SetMinSize(wx.Size(606, -1))
+
+        # Sizer for left side elements
+        left_sizer = wx.BoxSizer(wx.VERTICAL)
+        left_sizer.Add(self.size_label, 0, wx.ALL, 5)
+        left_sizer.Add(self.random_size_slider, 0, wx.EXPAND | wx.ALL, 5)
+        data_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        data_sizer.Add(self.distribution_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+        data_sizer.Add(self.distribution_choice, 1, wx.ALL, 5)
+        data_sizer.Add(self.seed_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+        data_sizer.Add(self.seed_spin, 0, wx.ALL, 5)
+        left_sizer.Add(data_sizer, 0, wx.EXPAND)
+        left_sizer.Add(self.speed_label, 0, wx.ALL, 5)
+        left_sizer.Add(self.speed_slider, 0, wx.EXPAND | wx.ALL, 5)
+        left_sizer.Add(self.algorithms_radiobox, 1, wx.EXPAND | wx.ALL, 5)
+        left_sizer.Add(self.graph_type_label, 0, wx.ALL, 5)
+        left_sizer.Add(self.graph_type_radiobox, 0, wx.ALL, 5)
+        left_sizer.Add(self.button_create, 0, wx.EXPAND | wx.ALL, 5)
+        left_sizer.Add(self.button_start, 0, wx.EXPAND | wx.ALL, 5)
+        left_sizer.Add(self.button_stop, 0, wx.EXPAND | wx.ALL, 5)
+        left_sizer.Add(self.button_reset, 0, wx.EXPAND | wx.ALL, 5)
+        left_sizer.Add(self.button_step, 0, wx.EXPAND | wx.ALL, 5)
+        left_sizer.Add(self.button_race, 0, wx.EXPAND | wx.ALL, 5)
+        left_sizer.Add(self.position_label, 0, wx.ALL, 5)
+        left_sizer.Add(self.position_slider, 0, wx.EXPAND | wx.ALL, 5)
+        left_sizer.Add(self.overlay_checkbox, 0, wx.ALL, 5)
+
+        # Sizer for the graph
+        graph_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        graph_sizer.Add(left_sizer, 0, wx.EXPAND | wx.ALL, 10)
+        graph_sizer.Add(self.graph_panel, 1, wx.EXPAND | wx.ALL, 10)
+
+        # Sizer for user given array
+        array_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        array_sizer.Add(self.array_label, 0, wx.ALL, 5)
+        array_sizer.Add(self.array_text, 1, wx.EXPAND | wx.ALL, 5)
+        array_sizer.Add(self.button_load, 0, wx.ALL, 5)
+
+        # Sizer for the comparison
+        results_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        results_sizer.Add(self.comparison_label, 0, wx.EXPAND | wx.ALL, 2)
+        results_sizer.Add(self.comparison_text, 0, wx.EXPAND | wx.ALL, 2)
+
+        # Sizer for the complexity type
+        complexity_type_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        complexity_type_sizer.Add(self.complexity_type, 0, wx.EXPAND | wx.ALL, 2)
+
+        # Sizer for the complexity
+        complexity_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        complexity_sizer.Add(self.complexity_label, 0, wx.EXPAND | wx.ALL, 2)
+        complexity_sizer.Add(self.complexity_text, 0, wx.EXPAND | wx.ALL, 2)
+
+        # Main sizer for the frame
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+        main_sizer.Add(array_sizer, 0, wx.EXPAND | wx.ALL, 10)
+        main_sizer.Add(graph_sizer, 0, wx.EXPAND | wx.ALL, 10)
+        main_sizer.Add(results_sizer, 0, wx.EXPAND | wx.ALL, 2)
+        main_sizer.Add(complexity_type_sizer, 0, wx.EXPAND | wx.ALL, 2)
+        main_sizer.Add(complexity_sizer, 0, wx.EXPAND | wx.ALL, 2)
+
+        # Activate or Disable buttons accordingly
+        self.button_create.Enable()
+        self.button_start.Disable()
+        self.button_stop.Disable()
+        self.button_reset.Disable()
+        self.button_step.Disable()
+        self.position_slider.Disable()
+
+        self.panel.SetSizer(main_sizer)
+        self.Layout()
+
+    def perform_complexity_analysis(self):
+        # Measured over a series of sizes in the background, the fields are filled in when it is done
+        self.analysis_id += 1
+        self.complexity_result = None
+        # The series stops at the same size for any input, so it stays short next to the sort itself
+        limit = ANALYSIS_QUADRATIC_SIZE if self.algorithm_name in QUADRATIC_ALGORITHMS else ANALYSIS_SIZE
+        if self.input_numbers is not None:
+            max_size = min(len(self.input_numbers), limit)
+            source = prefix_source(list(self.input_numbers[:max_size]))
+            input_name = "the given numbers"
+        else:
+            distribution = self.distribution_choice.GetStringSelection()
+            source = dataset_source(distribution, self.seed_spin.GetValue())
+            max_size = limit
+            input_name = f"{distribution} numbers"
+
+        self.complexity_type.SetValue(f"Measuring the complexity of {self.algorithm_name} on {input_name}...")
+        self.complexity_text.SetValue("")
+        threading.Thread(target=self.run_complexity_analysis,
+                         args=(self.analysis_id, self.algorithm_name, source, geometric_sizes(max_size)),
+                         daemon=True).start()
+
+    def run_complexity_analysis(self, analysis_id, algorithm_name, source, sizes):
+        def on_size(measurement):
+            if analysis_id != self.analysis_id:
+                # Another algorithm or input was chosen, stop before the next size
+                raise SortCancelled()
+            wx.CallAfter(self.on_complexity_progress, analysis_id, measurement)
+
+        try:
+            result = analyse(algorithm_name, source, sizes, on_size=on_size)
+        except SortCancelled:
+            return
+        wx.CallAfter(self.on_complexity_analysis, analysis_id, result)
+
+    def update_comparison_text(self, count):
+        self.comparison_count = count
+        self.comparison_text.SetValue(f"{self.comparison_count}")
+
+    def on_complexity_progress(self, analysis_id, measurement):
+        if analysis_id == self.analysis_id:
+            self.complexity_text.SetValue(f"n = {measurement['size']}: {measurement['comparisons']} comparisons, "
+                                          f"{measurement['writes']} writes")
+
+    def on_complexity_analysis(self, analysis_id, result):
+        if analysis_id != self.analysis_id:
+            # Another algorithm or input was chosen in the meantime
+            return
+        self.complexity_result = result
+        self.complexity_type.SetValue(summary(result))
+        self.complexity_text.SetValue(details(result))
+
+    def load_numbers(self, load_function):
+        # Run load_function(progress) with a progress dialog, None when loading failed
+        dialog = wx.ProgressDialog("Loading", "Reading the numbers...", maximum=100, parent=self,
+                                   style=wx.PD_APP_MODAL | wx.PD_AUTO_HIDE | wx.PD_ELAPSED_TIME)
+
+        def progress(done, total):
+            if total:
+                dialog.Update(min(int(done * 100 / total), 99))
+            else:
+                dialog.Pulse()
+
+        try:
+            numbers = load_function(progress)
+        except (OSError, ValueError) as e:
+            wx.MessageBox(str(e), "Error", wx.OK | wx.ICON_ERROR)
+            return None
+        finally:
+            dialog.Destroy()
+
+        if not numbers:
+            wx.MessageBox("No data to sort!", "Error", wx.OK | wx.ICON_ERROR)
+            return None
+        return numbers
+
+    def use_input_numbers(self, numbers):
+        # Show the numbers, Create sorts them instead of random numbers
+        self.input_numbers = numbers
+        self.graph_panel.set_numbers(numbers)
+
+    def on_input_enter(self, event):
+        text = self.array_text.GetValue()
+        if not text.strip():
+            # An empty box goes back to random numbers
+            self.input_numbers = None
+            return
+
+        numbers = self.load_numbers(lambda progress: load_string(text, progress=progress))
+        if numbers is not None:
+            self.use_input_numbers(numbers)
+
+    def on_load_file(self, event):
+        with wx.FileDialog(self, "Load numbers", style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
+                           wildcard="All files (*.*)|*.*|Text files (*.txt;*.csv)|*.txt;*.csv|"
+                                    "NumPy arrays (*.npy)|*.npy|Raw int64 (*.bin;*.i64)|*.bin;*.i64|"
+                                    "Raw int32 (*.i32)|*.i32") as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            path = dialog.GetPath()
+
+        numbers = self.load_numbers(lambda progress: load(path, progress=progress))
+        if numbers is not None:
+            self.use_input_numbers(numbers)
+
+    def make_numbers(self):
+        if self.input_numbers is not None:
+            return list(self.input_numbers)
+        # Seeded, so every algorithm can be given the same numbers
+        size = self.random_size_slider.GetValue()
+        distribution = self.distribution_choice.GetStringSelection()
+        return list(get_dataset(distribution, size, self.seed_spin.GetValue()))
+
+    def on_race(self, event):
+        with wx.MultiChoiceDialog(self, "Algorithms to race on the same numbers:", "Race",
+                                  list(self.algorithms)) as dialog:
+            dialog.SetSelections(list(range(min(4, len(self.algorithms)))))
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            names = [list(self.algorithms)[index] for index in dialog.GetSelections()]
+        if len(names) < 2:
+            wx.MessageBox("Choose at least two algorithms!", "Error", wx.OK | wx.ICON_ERROR)
+            return
+
+        numbers = self.make_numbers()
+        if not numbers:
+            wx.MessageBox("No data to sort!", "Error", wx.OK | wx.ICON_ERROR)
+            return
+        race_frame = RaceFrame(self, numbers, names, self.graph_type_radiobox.GetStringSelection(),
+                               self.speed_slider.GetValue(), self.sonifier)
+        race_frame.Show()
+
+    def on_create(self, event):
+        graph_type = self.graph_type_radiobox.GetStringSelection()
+
+        self.numbers = self.make_numbers()
+
+        self.graph_panel.set_numbers(self.numbers)
+        self.graph_panel.set_graph_type(graph_type)
+
+        if not self.numbers:
+            wx.MessageBox("No data to sort!", "Error", wx.OK | wx.ICON_ERROR)
+            return
+
+        algorithm_index = self.algorithms_radiobox.GetSelection()
+
+        if algorithm_index == wx.NOT_FOUND:
+            wx.MessageBox("No algorithm chosen!", "Error", wx.OK | wx.ICON_ERROR)
+            return
+
+        self.algorithm_name = self.algorithms_radiobox.GetString(algorithm_index)
+        self.algorithm = self.algorithms[self.algorithm_name]
+
+        # Activate or Disable buttons accordingly
+        self.button_create.Disable()
+        self.button_start.Enable()
+        self.button_stop.Disable()
+        self.button_reset.Enable()
+
+        # Activate or Disable selections accordingly
+        self.graph_type_radiobox.Disable()
+        self.algorithms_radiobox.Disable()
+        self.random_size_slider.Disable()
+        self.distribution_choice.Disable()
+        self.seed_spin.Disable()
+        self.array_text.Disable()
+        self.button_load.Disable()
+
+        self.perform_complexity_analysis()
+
+        self.initial_numbers = self.numbers
+        self.cancel_recording()
+        self.graph_panel.stop_playback()
+        self.trace = None
+        self.position_slider.SetValue(0)
+        self.position_slider.Disable()
+        self.comparison_count = 0
+        self.completed = 0
+        self.state = 1
+
+    def on_start(self, event):
+        if self.recording is not None and self.recording.state == RUNNING:
+            # The sort is already being recorded, do nothing
+            return
+
+        # Activate or Disable buttons accordingly
+        self.button_create.Disable()
+        self.button_start.Disable()
+        self.button_stop.Enable()
+        self.button_reset.Disable()
+        self.button_step.Disable()
+
+        # Activate or Disable selections accordingly
+        self.graph_type_radiobox.Disable()
+        self.algorithms_radiobox.Disable()
+        self.random_size_slider.Disable()
+        self.distribution_choice.Disable()
+        self.seed_spin.Disable()
+        self.array_text.Disable()
+        self.button_load.Disable()
+
+        self.state = 2
+
+        if self.recording is not None and self.recording.state == PAUSED:
+            # Continue the recording exactly where it was stopped
+            self.recording.resume()
+            self.metrics_timer.Start(int(1000 / METRICS_RATE))
+        elif self.graph_panel.player is not None:
+            # Playback was stopped, continue exactly where it was
+            self.graph_panel.resume_playback()
+        elif self.trace is not None:
+            # The sort is already recorded, replay it from the start
+            self.graph_panel.play_trace(self.trace, self.steps_per_second(), self.on_playback_frame)
+        else:
+            # Record the sort at full speed, playback starts once it is done
+            self.stats = SortStats()
+            trace = SortTrace(self.numbers)
+            steps = get_steps(self.algorithm_name)(list(self.numbers), self.stats)
+            # The sorting thread publishes its progress, the window shows the newest state
+            preview = SnapshotChannel(trace.final, lambda: wx.CallAfter(self.on_preview, preview))
+            self.preview = preview
+            self.stats.start()
+            self.recording = self.scheduler.submit(
+                steps, self.stats, trace.record, lambda task: wx.CallAfter(self.on_recording_done, task, trace),
+                on_slice=lambda task: self.publish_preview(task, trace, preview))
+            self.metrics_timer.Start(int(1000 / METRICS_RATE))
+
+    def on_stop(self, event):
+        self.graph_panel.pause_playback()
+        if self.recording is not None and self.recording.state == RUNNING:
+            self.recording.pause()
+            self.metrics_timer.Stop()
+
+        # Activate or Disable buttons accordingly
+        self.button_create.Disable()
+        self.button_start.Enable()
+        self.button_stop.Disable()
+        self.button_reset.Enable()
+        self.button_step.Enable()
+
+        # Activate or Disable selections accordingly
+        self.graph_type_radiobox.Disable()
+        self.algorithms_radiobox.Disable()
+        self.random_size_slider.Disable()
+        self.distribution_choice.Disable()
+        self.seed_spin.Disable()
+        self.array_text.Disable()
+        self.button_load.Disable()
+
+        self.state = 3
+
+    def on_reset(self, event):
+
+        self.state = 0
+        if self.recording is not None and not self.recording.finished:
+            # A partly recorded sort is dropped, Start records it again
+            self.cancel_recording()
+            self.trace = None
+        self.button_step.Disable()
+        self.graph_panel.stop_playback()
+        self.position_slider.SetValue(0)
+        self.numbers = self.initial_numbers
+        self.graph_panel.set_numbers(self.numbers)
+        self.graph_panel.set_highlighted_indices([])
+
+        # Activate or Disable buttons accordingly
+        self.button_create.Enable()
+        self.button_start.Enable()
+        self.button_stop.Disable()
+        self.button_reset.Disable()
+
+        # Activate or Disable selections accordingly
+        self.graph_type_radiobox.Enable()
+        self.algorithms_radiobox.Enable()
+        self.random_size_slider.Enable()
+        self.distribution_choice.Enable()
+        self.seed_spin.Enable()
+        self.array_text.Enable()
+        self.button_load.Enable()
+
+        # Reset the count
+        self.update_comparison_text(0)
+
+    def on_complete(self, numbers):
+        self.state = 0
+
+        # Set the final sorted numbers and reset the highlighted indices
+        self.graph_panel.set_numbers(numbers)
+        self.graph_panel.set_highlighted_indices([])
+        self.completed = 1
+
+        # Activate or Disable buttons accordingly
+        self.button_create.Enable()
+        self.button_start.Disable()
+        self.button_stop.Disable()
+        self.button_reset.Enable()
+
+        # Activate or Disable selections accordingly
+        self.graph_type_radiobox.Enable()
+        self.algorithms_radiobox.Enable()
+        self.random_size_slider.Enable()
+        self.distribution_choice.Enable()
+        self.seed_spin.Enable()
+        self.array_text.Enable()
+        self.button_load.Enable()
+
+    def cancel_recording(self):
+        if self.recording is not None:
+            self.recording.cancel()
+            self.recording = None
+        self.preview = None
+        self.metrics_timer.Stop()
+
+    def publish_preview(self, task, trace, preview):
+        # Runs in the sorting thread after every slice, a single step while paused is always shown
+        preview.publish(trace.final, trace.last_indices(), task.position, force=task.state == PAUSED)
+
+    def on_preview(self, preview):
+        if preview is not self.preview:
+            # A frame of a recording that was cancelled or has finished
+            return
+        frame = preview.consume()
+        if frame is not None:
+            self.graph_panel.show_snapshot(frame.numbers, frame.highlighted)
+
+    def on_recording_done(self, task, trace):
+        if task is not self.recording:
+            # Cancelled or replaced in the meantime
+            return
+        self.stats.stop()
+        if task.state == FINISHED:
+            self.on_recorded(trace)
+        elif task.state == FAILED:
+            self.cancel_recording()
+            wx.MessageBox(f"{self.algorithm_name} failed: {task.error}", "Error", wx.OK | wx.ICON_ERROR)
+            self.on_reset(None)
+
+    def on_step_once(self, event):
+        # Single step while stopped: the playback when the sort is recorded, else the recording
+        if self.trace is not None:
+            if self.graph_panel.player is None:
+                self.graph_panel.play_trace(self.trace, self.steps_per_second(), self.on_playback_frame, paused=True)
+            if not self.graph_panel.player.finished:
+                self.graph_panel.advance_playback(1)
+        elif self.recording is not None and self.recording.state == PAUSED:
+            self.recording.step()
+            self.on_metrics_timer(None)
+
+    def on_close(self, event):
+        # Also stops a running complexity analysis
+        self.analysis_id += 1
+        self.metrics_timer.Stop()
+        self.graph_panel.stop_playback()
+        self.scheduler.shutdown(wait=False)
+        event.Skip()
+
+    def steps_per_second(self):
+        return rate_from_slider(self.speed_slider.GetValue(), self.speed_slider.GetMin(), self.speed_slider.GetMax())
+
+    def on_speed(self, event):
+        rate = self.steps_per_second()
+        self.speed_label.SetLabel(f"Speed: {rate_text(rate)}")
+        self.graph_panel.set_playback_rate(rate)
+
+    def on_overlay(self, event):
+        self.graph_panel.show_overlay = self.overlay_checkbox.GetValue()
+        self.graph_panel.Refresh(eraseBackground=False)
+
+    def on_metrics_timer(self, event):
+        stats = self.stats
+        if stats is None:
+            return
+        profiling.counter(self.algorithm_name, comparisons=stats.comparisons, swaps=stats.swaps, writes=stats.writes)
+        self.comparison_text.SetValue(f"{stats.comparisons} (sorting, {stats.swaps} swaps, {stats.writes} writes, "
+                                      f"{stats.ops_per_second():,.0f} ops/s)")
+
+    def on_recorded(self, trace):
+        self.metrics_timer.Stop()
+        self.preview = None
+        self.trace = trace
+        self.position_slider.SetMax(max(len(trace), 1))
+        self.position_slider.Enable()
+
+        if self.state == 2:
+            self.graph_panel.play_trace(trace, self.steps_per_second(), self.on_playback_frame)
+
+    def on_playback_frame(self, player):
+        self.update_comparison_text(player.comparisons)
+        self.position_slider.SetValue(player.position)
+
+        if player.finished:
+            self.on_complete(list(player.numbers))
+
+    def on_seek(self, event):
+        if self.trace is None:
+            return
+
+        if self.graph_panel.player is None:
+            # Start a paused playback so the recorded steps can be scrubbed through
+            self.graph_panel.play_trace(self.trace, self.steps_per_second(), self.on_playback_frame, paused=True)
+
+        player = self.graph_panel.seek_playback(self.position_slider.GetValue())
+        self.update_comparison_text(player.comparisons)
+
+        if not player.finished and self.state != 2:
+            # Allow playing on from the new position
+            self.completed = 0
+            self.button_start.Enable()
+
+
+class RaceFrame(wx.Frame):
+    # Every algorithm sorts the same numbers in its own process, the recorded sorts
+    # are then played side by side on one shared clock
+    def __init__(self, parent, numbers, names, graph_type, speed, sonifier=None):
+        # speed is a position of the speed slider, the race has its own slider
+        wx.Frame.__init__(self, parent, wx.ID_ANY, "Race")
+        self.SetSize((1200, 800))
+        self.names = names
+        self.results = {}
+        self.panels = {}
+        self.closed = False
+
+        panel = wx.Panel(self)
+        self.speed_slider = wx.Slider(panel, value=speed, minValue=1, maxValue=100, style=wx.SL_HORIZONTAL)
+        self.speed_label = wx.StaticText(panel, label=f"Speed: {rate_text(self.steps_per_second())}")
+        self.Bind(wx.EVT_SLIDER, self.on_speed, self.speed_slider)
+
+        # The same number of steps is applied to every sort per frame
+        self.pacer = StepPacer(self.steps_per_second(), frame_rate=FRAME_RATE)
+        grid = wx.GridSizer(math.ceil(math.sqrt(len(names))))
+        for name in names:
+            graph_panel = GraphPanel(panel, sonifier)
+            graph_panel.set_numbers(list(numbers))
+            graph_panel.set_graph_type(graph_type)
+            self.panels[name] = graph_panel
+
+            cell_sizer = wx.BoxSizer(wx.VERTICAL)
+            cell_sizer.Add(wx.StaticText(panel, label=name), 0, wx.ALL, 2)
+            cell_sizer.Add(graph_panel, 1, wx.EXPAND | wx.ALL, 2)
+            grid.Add(cell_sizer, 1, wx.EXPAND)
+
+        # Leaderboard, one row per algorithm in the order of names
+        self.leaderboard = wx.ListCtrl(panel, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        for column, title in enumerate(["Place", "Algorithm", "Elapsed ms", "Comparisons", "Swaps", "Writes", "Progress"]):
+            self.leaderboard.InsertColumn(column, title, width=60 if column == 0 else 160)
+        for row, name in enumerate(names):
+            self.leaderboard.InsertItem(row, "")
+            self.leaderboard.SetItem(row, 1, name)
+            self.leaderboard.SetItem(row, 6, "sorting")
+        self.leaderboard.SetMinSize(wx.Size(-1, 40 + 22 * len(names)))
+
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+        main_sizer.Add(grid, 1, wx.EXPAND | wx.ALL, 5)
+        speed_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        speed_sizer.Add(self.speed_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
+        speed_sizer.Add(self.speed_slider, 1, wx.EXPAND | wx.ALL, 5)
+        main_sizer.Add(speed_sizer, 0, wx.EXPAND)
+        main_sizer.Add(self.leaderboard, 0, wx.EXPAND | wx.ALL, 5)
+        panel.SetSizer(main_sizer)
+
+        self.timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_timer, self.timer)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+        self.race = Race(numbers, names)
+        self.race.start()
+        threading.Thread(target=self.wait_for_results, daemon=True).start()
+
+    def wait_for_results(self):
+        # Runs in a helper thread, the results are handed to the GUI thread
+        for result in self.race.iter_results():
+            wx.CallAfter(self.on_result, result)
+
+    def on_result(self, result):
+        if self.closed:
+            return
+        name = result["algorithm"]
+        self.results[name] = result
+        row = self.names.index(name)
+        if result["error"] is not None:
+            self.leaderboard.SetItem(row, 6, result["error"])
+        else:
+            self.leaderboard.SetItem(row, 2, f"{result['elapsed'] * 1000:.3f}")
+            self.leaderboard.SetItem(row, 6, "ready")
+
+        if len(self.results) < len(self.names):
+            return
+
+        # Places by the elapsed time of the sorts without step events
+        for place, ranked in enumerate(leaderboard(self.results.values()), 1):
+            if ranked["error"] is None:
+                self.leaderboard.SetItem(self.names.index(ranked["algorithm"]), 0, str(place))
+
+        # Start all playbacks together on the shared timer
+        for name, graph_panel in self.panels.items():
+            trace = self.results[name]["trace"]
+            if trace is not None:
+                graph_panel.play_trace(trace, None, paused=True)
+        self.pacer.start()
+        self.timer.Start(int(1000 / FRAME_RATE))
+
+    def steps_per_second(self):
+        return rate_from_slider(self.speed_slider.GetValue(), self.speed_slider.GetMin(), self.speed_slider.GetMax())
+
+    def on_speed(self, event):
+        rate = self.steps_per_second()
+        self.speed_label.SetLabel(f"Speed: {rate_text(rate)}")
+        self.pacer.set_rate(rate)
+
+    def on_timer(self, event):
+        steps = self.pacer.due()
+        if steps == 0:
+            return
+        started = time.perf_counter()
+
+        running = False
+        for row, name in enumerate(self.names):
+            player = self.panels[name].player
+            if player is None:
+                continue
+            if not player.finished:
+                self.panels[name].advance_playback(steps)
+                running = running or not player.finished
+            self.leaderboard.SetItem(row, 3, str(player.comparisons))
+            # Swaps and writes apart, like the race command
+            self.leaderboard.SetItem(row, 4, str(player.swaps))
+            self.leaderboard.SetItem(row, 5, str(player.writes))
+            self.leaderboard.SetItem(row, 6, f"{player.position * 100 // max(len(player), 1)}%")
+        self.pacer.record(steps, time.perf_counter() - started)
+
+        if not running:
+            self.timer.Stop()
+
+    def on_close(self, event):
+        self.closed = True
+        self.timer.Stop()
+        self.race.cancel()
+        for graph_panel in self.panels.values():
+            graph_panel.stop_playback()
+        event.Skip()
+
+
+class GraphPanel(wx.Panel):
+    def __init__(self, parent, sonifier=None):
+        wx.Panel.__init__(self, parent)
+        # Plays the highlighted steps, None for a silent graph
+        self.sonifier = sonifier
+        self.numbers = []
+        self.highlighted_indices = []
+        self.graph_type = "Scatter Chart"
+
+        # Value indexed gradient colors, see update_colour_table
+        self.gradient_colors = []
+        self.gradient_brushes = []
+        self.gradient_pens = []
+        self.gradient_rgb = []
+        self.colour_table_key = None
+        self.colour_scale = 1.0
+        self.min_number = 0
+
+        # Replay of a recorded sort
+        self.player = None
+        self.on_frame = None
+        self.pacer = StepPacer(frame_rate=FRAME_RATE)
+        self.playback_timer = wx.Timer(self)
+
+        # Cached rendering state, only dirty indices are redrawn into the backing bitmap
+        self.backing = None
+        self.full_redraw = True
+        self.dirty_indices = set()
+        self.max_number = 1
+        self.pen_cache = {}
+        self.brush_cache = {}
+        # Renderer of large graphs, created with the first large graph
+        self.raster = None
+        self.use_raster = False
+        self.frame_stats = profiling.FrameStats()
+        self.show_overlay = False
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_TIMER, self.on_playback_timer, self.playback_timer)
+
+        load_colour_db()
+
+    def update_colour_table(self):
+        # Colors only depend on the value, so they are looked up by value instead
+        # of being computed per element. The table is only rebuilt when the range
+        # of values or the graph type changes.
+        if not self.numbers:  # Check if the numbers list is empty
+            return
+
+        min_number = min(self.numbers)
+        max_number = max(self.numbers)
+        self.min_number = min_number
+        self.max_number = max_number or 1
+        if self.sonifier is not None:
+            self.sonifier.set_range(min_number, max_number)
+
+        key = (min_number, max_number, self.graph_type == "Stem Graph")
+        if key == self.colour_table_key:
+            return
+        self.colour_table_key = key
+
+        if self.graph_type == "Stem Graph":  # To see the graph better swap the colors
+            min_color = wx.Colour(0, 255, 255)  # Cyan
+            max_color = wx.Colour(0, 0, 128)  # Dark Blue
+        else:
+            min_color = wx.Colour(0, 0, 128)  # Dark Blue
+            max_color = wx.Colour(0, 255, 255)  # Cyan
+
+        # Get the RGB values for the minimum and maximum colors
+        min_r, min_g, min_b = min_color.Red(), min_color.Green(), min_color.Blue()
+        max_r, max_g, max_b = max_color.Red(), max_color.Green(), max_color.Blue()
+
+        # Map a value to its row in the table
+        self.colour_scale = (COLOUR_LEVELS - 1) / ((max_number - min_number) or 1)
+
+        # Generate the gradient colors with their brushes and pens
+        self.gradient_colors = []
+        self.gradient_brushes = []
+        self.gradient_pens = []
+        self.gradient_rgb = []
+        with profiling.span("colour table", levels=COLOUR_LEVELS):
+            for level in range(COLOUR_LEVELS):
+                fraction = level / (COLOUR_LEVELS - 1)
+                r = max_r - int(fraction * (max_r - min_r))
+                g = max_g - int(fraction * (max_g - min_g))
+                b = max_b - int(fraction * (max_b - min_b))
+
+                colour = wx.Colour(r, g, b)
+                self.gradient_colors.append(colour)
+                self.gradient_brushes.append(wx.Brush(colour))
+                self.gradient_pens.append(wx.Pen(colour, width=2))
+                self.gradient_rgb.append((r, g, b))
+
+    def set_numbers(self, numbers):
+        self.numbers = numbers
+        if len(numbers) >= RASTER_MIN_SIZE and self.raster is None:
+            self.raster = new_raster_renderer()
+        self.use_raster = self.raster is not None and len(numbers) >= RASTER_MIN_SIZE
+        self.update_colour_table()
+        self.full_redraw = True
+        self.Refresh(eraseBackground=False)
+
+    def show_snapshot(self, numbers, highlighted):
+        # A frame of a sort that is still being recorded, the numbers stay valid until the next frame
+        self.numbers = numbers
+        self.highlighted_indices = highlighted
+        self.full_redraw = True
+        self.Refresh(eraseBackground=False)
+
+    def play_trace(self, trace, rate, on_frame=None, paused=False):
+        # rate is in steps per second, None plays as fast as the frames allow
+        self.player = TracePlayer(trace)
+        self.on_frame = on_frame
+        self.set_numbers(self.player.numbers)
+        self.pacer.pause()
+        self.pacer.set_rate(rate)
+
+        if not paused:
+            self.resume_playback()
+
+    def set_playback_rate(self, rate):
+        self.pacer.set_rate(rate)
+
+    def pause_playback(self):
+        self.playback_timer.Stop()
+        self.pacer.pause()
+
+    def resume_playback(self):
+        if self.player is None:
+            return
+        if self.numbers is not self.player.numbers:
+            self.set_numbers(self.player.numbers)
+        self.pacer.start()
+        self.playback_timer.Start(int(1000 / FRAME_RATE))
+
+    def stop_playback(self):
+        self.playback_timer.Stop()
+        self.pacer.pause()
+        self.player = None
+        self.on_frame = None
+
+    def seek_playback(self, position):
+        touched = self.player.seek(position)
+        if self.numbers is not self.player.numbers:
+            self.set_numbers(self.player.numbers)
+        self.mark_dirty(touched)
+        self.set_highlighted_indices(self.player.current_indices)
+        return self.player
+
+    def on_playback_timer(self, event):
+        player = self.player
+        if player is None:
+            self.playback_timer.Stop()
+            return
+
+        # Steps due by the clock, many of them are batched into one repaint at high speeds
+        steps = self.pacer.due()
+        if steps == 0:
+            return
+        started = time.perf_counter()
+        self.advance_playback(steps)
+        self.pacer.record(steps, time.perf_counter() - started)
+
+    def advance_playback(self, steps):
+        # Apply the next steps of the playback and redraw what they changed
+        player = self.player
+        with profiling.span("playback step", steps=steps):
+            touched = player.step(steps)
+            self.mark_dirty(touched)
+            self.set_highlighted_indices(player.current_indices)
+
+        if player.finished:
+            self.playback_timer.Stop()
+            self.pacer.pause()
+
+        if self.on_frame is not None:
+            self.on_frame(player)
+
+    def set_highlighted_indices(self, indices):
+        # Both the old and the new highlighted elements change color
+        self.mark_dirty(self.highlighted_indices)
+        self.mark_dirty(indices)
+        self.highlighted_indices = indices
+        # The notes are played by the sonification thread, this never waits for the MIDI device
+        if self.sonifier is not None:
+            with profiling.span("midi queue"):
+                self.sonifier.play([self.numbers[index] for index in indices if index < len(self.numbers)])
+        self.Refresh(eraseBackground=False)
+
+    def set_graph_type(self, graph_type):
+        self.graph_type = graph_type
+        self.update_colour_table()
+        self.full_redraw = True
+        self.Refresh(eraseBackground=False)
+
+    def mark_dirty(self, indices):
+        # Indices to redraw on the next frame
+        self.dirty_indices.update(indices)
+
+    def get_pen(self, colour, width=1):
+        key = (colour.Get(), width)
+        pen = self.pen_cache.get(key)
+        if pen is None:
+            pen = self.pen_cache[key] = wx.Pen(colour, width=width)
+        return pen
+
+    def get_brush(self, colour):
+        key = colour.Get()
+        brush = self.brush_cache.get(key)
+        if brush is None:
+            brush = self.brush_cache[key] = wx.Brush(colour)
+        return brush
+
+    def on_paint(self, event):
+        width, height = self.GetClientSize()
+        if width <= 0 or height <= 0:
+            return
+
+        started = time.perf_counter()
+        with profiling.span("paint", graph=self.graph_type, elements=len(self.numbers)):
+            dc = wx.PaintDC(self)
+            if self.use_raster:
+                draw_calls, elements = self.paint_raster(dc, width, height)
+            else:
+                draw_calls, elements = self.paint_backing(width, height)
+                # The backing bitmap holds the whole graph, only the changed parts were drawn again
+                dc.DrawBitmap(self.backing, 0, 0)
+                draw_calls += 1
+            if self.show_overlay:
+                self.draw_overlay(dc)
+        self.frame_stats.add(time.perf_counter() - started, draw_calls, elements)
+
+    def paint_backing(self, width, height):
+        # Returns the number of draw calls and of elements drawn
+        if self.backing is None or self.backing.GetSize() != (width, height):
+            self.backing = wx.Bitmap(width, height)
+            self.full_redraw = True
+
+        dirty = self.dirty_indices
+        self.dirty_indices = set()
+
+        # A value outside the cached range changes the scale and colors of the whole graph
+        n = len(self.numbers)
+        if not self.full_redraw and any(not self.min_number <= self.numbers[i] <= self.max_number
+                                        for i in dirty if i < n):
+            self.update_colour_table()
+            self.full_redraw = True
+
+        dc = wx.MemoryDC(self.backing)
+        try:
+            if self.full_redraw or not self.numbers:
+                self.full_redraw = False
+                dc.SetBackground(self.get_brush(self.GetBackgroundColour()))
+                dc.Clear()
+
+                if not self.numbers:  # Check if the numbers list is empty
+                    return 1, 0
+
+                self.draw_elements(dc, range(n), width, height)
+                return n + 1, n
+
+            # Only clear and redraw the pixel spans of the elements that changed
+            draw_calls = elements = 0
+            dc.SetPen(wx.TRANSPARENT_PEN)
+            dc.SetBrush(self.get_brush(self.GetBackgroundColour()))
+            half = self.element_half_width(width, n)
+            for x0, x1 in self.dirty_spans(dirty, width, n, half):
+                dc.SetClippingRegion(x0, 0, x1 - x0, height)
+                dc.DrawRectangle(x0, 0, x1 - x0, height)
+
+                # Neighbours overlapping the span are drawn again inside the clipping region
+                first = max(int((x0 - half) * n / width - 1), 0)
+                last = min(int((x1 + half) * n / width + 1), n - 1)
+                self.draw_elements(dc, range(first, last + 1), width, height)
+                draw_calls += last - first + 2
+                elements += last - first + 1
+
+                dc.DestroyClippingRegion()
+                dc.SetPen(wx.TRANSPARENT_PEN)
+                dc.SetBrush(self.get_brush(self.GetBackgroundColour()))
+            return draw_calls, elements
+        finally:
+            dc.SelectObject(wx.NullBitmap)
+
+    def paint_raster(self, dc, width, height):
+        # The whole frame is rendered into one RGB buffer, which costs about the same for any number of elements
+        dirty = self.dirty_indices
+        self.dirty_indices = set()
+        numbers = self.numbers
+        if self.full_redraw:
+            self.full_redraw = False
+            self.raster.set_numbers(numbers)
+        else:
+            self.raster.update(numbers, dirty)
+            n = len(numbers)
+            if any(not self.min_number <= numbers[i] <= self.max_number for i in dirty if i < n):
+                self.update_colour_table()
+
+        background = self.GetBackgroundColour()
+        self.raster.set_colours(self.gradient_rgb, (background.Red(), background.Green(), background.Blue()))
+        image = self.raster.render(width, height, self.graph_type, self.min_number, self.max_number,
+                                   self.colour_scale, self.highlighted_indices)
+        dc.DrawBitmap(wx.Bitmap.FromBuffer(width, height, image), 0, 0)
+        return 1, len(numbers)
+
+    def draw_overlay(self, dc):
+        # Frame statistics in the top left corner, drawn over the graph on every paint
+        dc.SetFont(wx.Font(8, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
+        dc.SetBackgroundMode(wx.SOLID)
+        dc.SetTextBackground(wx.WHITE)
+        dc.SetTextForeground(wx.BLACK)
+        dc.DrawText(self.frame_stats.text(), 4, 2)
+
+    def element_half_width(self, width, n):
+        # Half of the horizontal space one element occupies in pixels
+        if self.graph_type == "Scatter Chart":
+            return SCATTER_RADIUS + 1
+        if self.graph_type == "Column (Bar) Graph":
+            return width / n / 2 + 1
+        return 2
+
+    def dirty_spans(self, dirty, width, n, half):
+        # Merge the pixel spans of the dirty indices into non-overlapping ranges
+        spans = []
+        for i in sorted(index for index in dirty if 0 <= index < n):
+            x = (i + 0.5) * width / n
+            x0 = max(int(x - half), 0)
+            x1 = min(int(x + half) + 1, width)
+            if spans and x0 <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], x1)
+            else:
+                spans.append([x0, x1])
+        return spans
+
+    def draw_elements(self, dc, indices, width, height):
+        if self.graph_type == "Scatter Chart":
+            self.draw_scatter_chart(dc, width, height, indices)
+        elif self.graph_type == "Column (Bar) Graph":
+            self.draw_column_graph(dc, width, height, indices)
+        elif self.graph_type == "Stem Graph":
+            self.draw_stem_graph(dc, width, height, indices)
+
+    def draw_scatter_chart(self, dc, width, height, indices):
+        numbers = self.numbers
+        n = len(numbers)
+        max_number = self.max_number
+        min_number = self.min_number
+        scale = self.colour_scale
+        brushes = self.gradient_brushes
+        highlighted = set(self.highlighted_indices)
+        outline_pen = self.get_pen(wx.BLACK)
+        highlight_brush = self.get_brush(wx.RED)
+
+        dc.SetPen(outline_pen)  # Set the outline color
+        for i in indices:
+            x = int((i + 0.5) * width / n)
+            y = int((1 - numbers[i] / max_number) * (height - 20))
+            if i in highlighted:
+                dc.SetBrush(highlight_brush)  # Set the fill color to red for highlighted indices
+            else:
+                dc.SetBrush(brushes[int((numbers[i] - min_number) * scale)])  # Use gradient colors
+            dc.DrawCircle(x, y, SCATTER_RADIUS)
+
+    def draw_column_graph(self, dc, width, height, indices):
+        numbers = self.numbers
+        n = len(numbers)
+        max_number = self.max_number
+        min_number = self.min_number
+        scale = self.colour_scale
+        brushes = self.gradient_brushes
+        highlighted = set(self.highlighted_indices)
+        outline_pen = self.get_pen(wx.BLACK)
+        highlight_brush = self.get_brush(wx.RED)
+
+        dc.SetPen(outline_pen)  # Set the outline color
+        for i in indices:
+            x = int(i * width / n)
+            column_width = max(int((i + 1) * width / n) - x, 1)
+            column_height = int((numbers[i] / max_number) * (height - 20))
+            if i in highlighted:
+                dc.SetBrush(highlight_brush)  # Set the fill color to red for highlighted indices
+            else:
+                dc.SetBrush(brushes[int((numbers[i] - min_number) * scale)])  # Use gradient colors
+            dc.DrawRectangle(x, height - column_height, column_width, column_height)
+
+    def draw_stem_graph(self, dc, width, height, indices):
+        numbers = self.numbers
+        n = len(numbers)
+        max_number = self.max_number
+        min_number = self.min_number
+        scale = self.colour_scale
+        pens = self.gradient_pens
+        highlighted = set(self.highlighted_indices)
+        highlight_pen = self.get_pen(wx.RED, 2)
+
+        for i in indices:
+            x = int((i + 0.5) * width / n)
+            stem_height = int((1 - numbers[i] / max_number) * (height - 20))
+            if i in highlighted:
+                dc.SetPen(highlight_pen)  # Set the line color to red for highlighted indices
+            else:
+                dc.SetPen(pens[int((numbers[i] - min_number) * scale)])  # Use gradient colors
+            dc.DrawLine(x, height, x, height - stem_height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m main gui", description="Visualize the sorting algorithms.")
+    parser.add_argument("--no-audio", action="store_true", help="do not play the sorting steps as MIDI notes")
+    parser.add_argument("--midi-port", type=int, help="MIDI output port (default: the system default)")
+    parser.add_argument("--profile", metavar="PATH", help="record the hot paths and write a Chrome trace on exit")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profiling.enable()
+    output = NullOutput() if args.no_audio else open_output(args.midi_port)
+    sonifier = MidiSonifier(output)
+    try:
+        app = wx.App()
+        frame = SortingFrame(sonifier)
+        frame.Show()
+        app.MainLoop()
+    finally:
+        sonifier.close()
+        output.close()
+        if args.profile:
+            profiling.write_chrome_trace(args.profile)
+
+
+if __name__ == "__main__":
+    main()
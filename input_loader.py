@@ -0,0 +1,239 @@
+"""Streaming loader for the numbers to sort.
+
+Numbers can come from a string (the text box of the GUI), a text file, stdin,
+a raw binary file of int32/int64/float64 values or a NumPy ``.npy`` file. The
+input is read in chunks that are parsed straight into typed ``array`` buffers,
+so only one chunk of text is ever split into tokens, and a value that cannot
+be parsed is reported with its position. An optional ``progress(done, total)``
+callback is called after every chunk; total is None when it is unknown.
+
+Text values are integers unless a float shows up, then the numbers loaded so
+far are promoted to floats.
+"""
+import ast
+import io
+import math
+import os
+import re
+import sys
+from array import array
+
+FORMATS = ["text", "int32", "int64", "float64", "npy"]
+
+BINARY_TYPECODES = {"int32": "i", "int64": "q", "float64": "d"}
+
+# dtypes of .npy files that map onto an array typecode
+NPY_TYPECODES = {"i1": "b", "u1": "B", "i2": "h", "u2": "H", "i4": "i", "u4": "I", "i8": "q", "u8": "Q",
+                 "f4": "f", "f8": "d"}
+
+NPY_MAGIC = b"\x93NUMPY"
+
+# Characters or bytes read at once
+CHUNK_SIZE = 1 << 20
+
+SEPARATORS = " \t\r\n,"
+
+# A comma with nothing but whitespace after it up to the next comma
+EMPTY_FIELD = re.compile(r",\s*(?=,)")
+
+
+class ValueRangeError(ValueError):
+    # A number that does not fit into the type of the array
+    pass
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return "npy"
+    if extension in (".i32", ".int32"):
+        return "int32"
+    if extension in (".bin", ".i64", ".int64"):
+        return "int64"
+    if extension in (".f64", ".float64"):
+        return "float64"
+    return "text"
+
+
+def parse_tokens(tokens, typecode, position):
+    # Parse the tokens into an array, position is the number of values before them
+    numbers = array(typecode)
+    parse = float if typecode in "fd" else int
+    try:
+        numbers.extend(map(parse, tokens))
+    except (ValueError, OverflowError):
+        pass
+    else:
+        if parse is int or all(map(math.isfinite, numbers)):
+            return numbers
+        # nan and inf cannot be sorted
+        bad = next(i for i, value in enumerate(numbers) if not math.isfinite(value))
+        raise ValueError(f"Value {position + bad + 1}: '{tokens[bad]}' is not a finite number")
+
+    # Find the value that failed for the error message
+    bad = len(numbers)
+    token = tokens[bad]
+    try:
+        parse(token)
+    except ValueError:
+        raise ValueError(f"Value {position + bad + 1}: '{token}' is not a number") from None
+    raise ValueRangeError(f"Value {position + bad + 1}: {token} does not fit into the '{typecode}' type") from None
+
+
+def check_fields(text, position, after_comma):
+    # Reject empty fields like the one in '1,,3', after_comma tells whether the text before ended in a comma
+    start = text.lstrip()
+    if after_comma and start.startswith(","):
+        raise ValueError(f"Value {position + 1}: '' is not a number")
+    empty = EMPTY_FIELD.search(text)
+    if empty is not None:
+        before = len(text[:empty.start()].replace(",", " ").split())
+        raise ValueError(f"Value {position + before + 1}: '' is not a number")
+    return start.rstrip().endswith(",") if start else after_comma
+
+
+def iter_text_chunks(stream, typecode=None, progress=None, total=None, chunk_size=CHUNK_SIZE):
+    # typecode None starts with integers and switches to floats at the first float
+    current = typecode or "q"
+    position = 0
+    done = 0
+    rest = ""
+    # A comma at the very start is an empty field too
+    after_comma = True
+    while True:
+        text = stream.read(chunk_size)
+        done += len(text)
+        if text:
+            # A token cut at the end of the chunk is completed by the next one
+            text = rest + text
+            cut = max(text.rfind(separator) for separator in SEPARATORS) + 1
+            rest = text[cut:]
+            text = text[:cut]
+        else:
+            text, rest = rest, ""
+
+        if "," in text or after_comma:
+            after_comma = check_fields(text, position, after_comma)
+        tokens = text.replace(",", " ").split()
+        if tokens:
+            try:
+                numbers = parse_tokens(tokens, current, position)
+            except ValueRangeError:
+                raise
+            except ValueError:
+                if typecode is not None or current == "d":
+                    raise
+                current = "d"
+                numbers = parse_tokens(tokens, current, position)
+            position += len(numbers)
+            yield numbers
+
+        if progress is not None:
+            progress(done, total)
+        if not text and not rest:
+            if after_comma and position:
+                # A comma after the last value
+                raise ValueError(f"Value {position + 1}: '' is not a number")
+            return
+
+
+def iter_binary_chunks(stream, typecode, progress=None, total=None, chunk_size=CHUNK_SIZE, swap=False):
+    itemsize = array(typecode).itemsize
+    # Whole values per read, at least one
+    chunk_size = max(chunk_size - chunk_size % itemsize, itemsize)
+    done = 0
+    rest = b""
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        done += len(data)
+        if rest:
+            data = rest + data
+        usable = len(data) - len(data) % itemsize
+        numbers = array(typecode)
+        numbers.frombytes(memoryview(data)[:usable])
+        rest = data[usable:]
+        if swap:
+            numbers.byteswap()
+        yield numbers
+        if progress is not None:
+            progress(done, total)
+
+    if rest:
+        raise ValueError(f"The input ends in the middle of a {itemsize} byte value")
+
+
+def read_npy_header(stream):
+    # Returns the typecode, whether the bytes have to be swapped and the number of values
+    if stream.read(len(NPY_MAGIC)) != NPY_MAGIC:
+        raise ValueError("Not a .npy file")
+    major = stream.read(2)[0]
+    header_length = int.from_bytes(stream.read(2 if major == 1 else 4), "little")
+    try:
+        header = ast.literal_eval(stream.read(header_length).decode("latin1"))
+        descr = header["descr"]
+        shape = header["shape"]
+    except (SyntaxError, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid .npy header") from None
+
+    if not isinstance(descr, str) or descr[1:] not in NPY_TYPECODES:
+        raise ValueError(f"Unsupported .npy dtype: {descr}")
+    typecode = NPY_TYPECODES[descr[1:]]
+    if array(typecode).itemsize != int(descr[2:]):
+        raise ValueError(f"Unsupported .npy dtype on this platform: {descr}")
+    swap = descr[0] == (">" if sys.byteorder == "little" else "<")
+    # Fortran order only changes the order of the values, which does not matter for sorting
+    return typecode, swap, math.prod(shape)
+
+
+def iter_npy_chunks(stream, progress=None, total=None, chunk_size=CHUNK_SIZE):
+    typecode, swap, count = read_npy_header(stream)
+    loaded = 0
+    for numbers in iter_binary_chunks(stream, typecode, progress, total, chunk_size, swap):
+        loaded += len(numbers)
+        yield numbers
+    if loaded != count:
+        raise ValueError(f"The .npy file holds {loaded} of its {count} values")
+
+
+def iter_chunks(source, file_format=None, typecode=None, progress=None, total=None, chunk_size=CHUNK_SIZE):
+    # source is a path, "-" for stdin or an open file, typecode only applies to text
+    if isinstance(source, str) and source != "-":
+        file_format = file_format or detect_format(source)
+        if total is None:
+            total = os.path.getsize(source)
+        with open(source, "r" if file_format == "text" else "rb") as stream:
+            yield from iter_chunks(stream, file_format, typecode, progress, total, chunk_size)
+        return
+
+    file_format = file_format or "text"
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format: {file_format} (choose from {', '.join(FORMATS)})")
+    if source == "-":
+        source = sys.stdin if file_format == "text" else sys.stdin.buffer
+
+    if file_format == "text":
+        yield from iter_text_chunks(source, typecode, progress, total, chunk_size)
+    elif file_format == "npy":
+        yield from iter_npy_chunks(source, progress, total, chunk_size)
+    else:
+        yield from iter_binary_chunks(source, BINARY_TYPECODES[file_format], progress, total, chunk_size)
+
+
+def load(source, file_format=None, typecode=None, progress=None, total=None, chunk_size=CHUNK_SIZE):
+    # All values of the source in one typed array
+    numbers = None
+    for chunk in iter_chunks(source, file_format, typecode, progress, total, chunk_size):
+        if numbers is None:
+            numbers = chunk
+            continue
+        if chunk.typecode != numbers.typecode:
+            # Integers followed by floats
+            numbers = array(chunk.typecode, numbers)
+        numbers.extend(chunk)
+    return numbers if numbers is not None else array(typecode or "q")
+
+
+def load_string(text, typecode=None, progress=None):
+    return load(io.StringIO(text), "text", typecode, progress, len(text))
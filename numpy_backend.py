@@ -0,0 +1,281 @@
+"""NumPy backend for the sorting algorithms.
+
+The numbers live in a contiguous int64/float64 array and the inner loops of
+the algorithms are vectorized. Counters are computed in bulk per pass or per
+merge instead of per element. Bubble sort and merge sort make the same passes
+and merges as the engine, so their counters are the engine's. The functions
+take the same arguments as the ones in sorting_engine and accept a NumPy
+array (sorted in place) or a list (converted, sorted and written back). When step events are requested the
+list based algorithm of the engine is used, since a vectorized pass has no
+individual steps to report.
+"""
+import numpy as np
+
+import sorting_engine
+from sorting_engine import SortStats, value_typecode
+
+# Runs of at most this width are merged all at once with a comparison matrix,
+# wider runs are merged pair by pair with searchsorted
+MATRIX_MERGE_WIDTH = 32
+
+# Upper bound for the number of cells of one batch of comparison matrices
+MATRIX_MERGE_CELLS = 1 << 16
+
+# Every byte with its bits in reverse order
+REVERSED_BYTES = np.array([int(f"{byte:08b}"[::-1], 2) for byte in range(256)], dtype=np.int64)
+
+# Segments of quick sort up to this size are finished with insertion sort
+QUICK_SORT_CUTOFF = 16
+
+
+def as_array(numbers):
+    if isinstance(numbers, np.ndarray):
+        return numbers
+    return np.array(numbers, dtype=np.int64 if value_typecode(numbers) == "q" else np.float64)
+
+
+def run(kernel, fallback, numbers, stats, on_step):
+    stats = stats if stats is not None else SortStats()
+    if on_step is not None:
+        if isinstance(numbers, np.ndarray):
+            result = fallback(numbers.tolist(), stats, on_step)
+            numbers[:] = result
+            return numbers
+        return fallback(numbers, stats, on_step)
+
+    arr = as_array(numbers)
+    kernel(arr, stats)
+    if arr is not numbers:
+        numbers[:] = arr.tolist()
+    return numbers
+
+
+def bubble_kernel(arr, stats):
+    # One bubble pass at a time: it carries the running maximum to the end, so
+    # every position gets the smaller of that maximum and its right neighbour
+    n = len(arr)
+    for i in range(n):
+        end = n - i
+        carried = np.maximum.accumulate(arr[:end])
+        swaps = int(np.count_nonzero(carried[:-1] > arr[1:end]))
+        arr[:end - 1] = np.minimum(carried[:-1], arr[1:end])
+        arr[end - 1] = carried[-1]
+        stats.add(end - 1, swaps)
+        if not swaps:
+            break
+
+
+def selection_kernel(arr, stats):
+    n = len(arr)
+    swaps = 0
+    for i in range(n - 1):
+        min_idx = i + int(np.argmin(arr[i:]))
+        if min_idx != i:
+            arr[i], arr[min_idx] = arr[min_idx], arr[i]
+            swaps += 1
+    stats.add(n * (n - 1) // 2, swaps)
+
+
+def insertion_kernel(arr, stats):
+    n = len(arr)
+    comparisons = writes = 0
+    for i in range(1, n):
+        key = arr[i]
+        # Where the linear scan of insertion sort would stop
+        j = int(np.searchsorted(arr[:i], key, side="right"))
+        shifts = i - j
+        comparisons += shifts + (1 if j > 0 else 0)
+        if shifts:
+            arr[j + 1:i + 1] = arr[j:i]
+            arr[j] = key
+            writes += shifts + 1
+    stats.add(comparisons, 0, writes)
+
+
+def merge_comparisons(left_last, right_last, left_count, right_count, left_below, right_below):
+    # Comparisons a sequential merge makes: it stops when the first run is used up.
+    # left_below is how many right elements are < the last left element,
+    # right_below how many left elements are <= the last right element.
+    return np.where(left_last <= right_last, left_count + left_below, right_count + right_below)
+
+
+def segment_sizes(n, depth, first, last):
+    # Sizes of the segments first..last-1 at this depth of the recursion of the engine's
+    # top-down merge sort. The left half of a segment gets the extra element, so a segment
+    # holds (n + 2^depth - 1 - path) >> depth elements, where path has the bit of its first
+    # split lowest. A segment of one element splits into itself and an empty one.
+    k = np.arange(first, last, dtype=np.int64)
+    path = np.zeros_like(k)
+    for shift in range(0, depth, 8):
+        path = (path << 8) | REVERSED_BYTES[(k >> shift) & 255]
+    path >>= -depth % 8
+    return (n + (1 << depth) - 1 - path) >> depth
+
+
+def matrix_merge(src, dst, starts, mids, ends, low, high):
+    # Merge the pairs of short runs src[start:mid] and src[mid:end] at once, return the comparisons.
+    # low and high are the smallest and the largest number, the runs are padded with them.
+    left_count = mids - starts
+    right_count = ends - mids
+    width = int(left_count.max())
+    index = np.arange(width)
+    left_valid = index < left_count[:, None]
+    right_valid = index < right_count[:, None]
+    last = len(src) - 1
+    left = np.where(left_valid, src[np.minimum(starts[:, None] + index, last)], low)
+    right = np.where(right_valid, src[np.minimum(mids[:, None] + index, last)], high)
+
+    # Output position inside the pair, ties keep the left element first. No padding is
+    # counted: nothing is < high on the right, and nothing is > low on the left.
+    left_pos = index + (right[:, None, :] < left[:, :, None]).sum(axis=2)
+    right_pos = index + left_count[:, None] - (left[:, None, :] > right[:, :, None]).sum(axis=2)
+    dst[(starts[:, None] + left_pos)[left_valid]] = left[left_valid]
+    dst[(starts[:, None] + right_pos)[right_valid]] = right[right_valid]
+
+    rows = np.arange(len(starts))
+    left_last = left_count - 1
+    right_last = right_count - 1
+    return int(merge_comparisons(left[rows, left_last], right[rows, right_last], left_count, right_count,
+                                 left_pos[rows, left_last] - left_last, right_pos[rows, right_last] - right_last).sum())
+
+
+def merge_runs(src, dst, start, mid, end):
+    left = src[start:mid]
+    right = src[mid:end]
+    left_below = np.searchsorted(right, left, side="left")
+    right_below = np.searchsorted(left, right, side="right")
+    dst[start + np.arange(len(left)) + left_below] = left
+    dst[start + np.arange(len(right)) + right_below] = right
+    if left[-1] <= right[-1]:
+        return len(left) + int(left_below[-1])
+    return len(right) + int(right_below[-1])
+
+
+def merge_kernel(arr, stats):
+    # Bottom-up merge sort, the runs move between arr and one scratch buffer. The runs of
+    # every level are the segments of the engine's top-down recursion, so the merges and
+    # their counters are the engine's, without recursing or sorting anything else.
+    n = len(arr)
+    if n < 2:
+        return
+    src = arr
+    dst = np.empty_like(arr)
+    depth = (n - 1).bit_length()
+    stats.enter(depth)
+    low = src.min()
+    high = src.max()
+    comparisons = writes = 0
+
+    for level in range(depth - 1, -1, -1):
+        # The runs at level + 1 are merged pairwise into the segments at level
+        width = (n + (2 << level) - 1) >> (level + 1)
+        if width <= MATRIX_MERGE_WIDTH:
+            batch = max(MATRIX_MERGE_CELLS // (2 * width * width), 1)
+        else:
+            batch = max(MATRIX_MERGE_CELLS // width, 1)
+        offset = 0
+        for first in range(0, 1 << level, batch):
+            last = min(first + batch, 1 << level)
+            bounds = np.zeros(2 * (last - first) + 1, dtype=np.int64)
+            np.cumsum(segment_sizes(n, level + 1, 2 * first, 2 * last), out=bounds[1:])
+            bounds += offset
+            offset = int(bounds[-1])
+            starts, mids, ends = bounds[:-1:2], bounds[1::2], bounds[2::2]
+
+            # A segment of one element is only carried over
+            single = starts[(mids > starts) & (ends == mids)]
+            dst[single] = src[single]
+            merged = ends - mids > 0
+            starts, mids, ends = starts[merged], mids[merged], ends[merged]
+            if not len(starts):
+                continue
+            writes += int((ends - starts).sum())
+            if width <= MATRIX_MERGE_WIDTH:
+                comparisons += matrix_merge(src, dst, starts, mids, ends, low, high)
+            else:
+                for start, mid, end in zip(starts.tolist(), mids.tolist(), ends.tolist()):
+                    comparisons += merge_runs(src, dst, start, mid, end)
+        src, dst = dst, src
+
+    if src is not arr:
+        arr[:] = src
+    stats.add(comparisons, 0, writes)
+
+
+def small_insertion_sort(segment):
+    # Insertion sort of a short segment, its counters come from the inversions
+    greater = segment[:, None] > segment[None, :]
+    shifts = np.triu(greater, 1).sum(axis=0)
+    # An element that is smaller than everything before it scans to the front
+    prefix_min = np.minimum.accumulate(segment)
+    stops = int(np.count_nonzero(segment[1:] >= prefix_min[:-1]))
+    moved = int(np.count_nonzero(shifts))
+    segment.sort(kind="stable")
+    inversions = int(shifts.sum())
+    return inversions + stops, inversions + moved
+
+
+def quick_kernel(arr, stats):
+    # Quick sort with the last element as pivot like the engine, but with a
+    # vectorized partition and an explicit stack instead of recursion
+    comparisons = writes = 0
+    stack = [(0, len(arr) - 1)]
+    while stack:
+        low, high = stack.pop()
+        if high - low < QUICK_SORT_CUTOFF:
+            if low < high:
+                segment_comparisons, segment_writes = small_insertion_sort(arr[low:high + 1])
+                comparisons += segment_comparisons
+                writes += segment_writes
+            continue
+
+        pivot = arr[high]
+        segment = arr[low:high]
+        mask = segment <= pivot
+        left = segment[mask]
+        right = segment[~mask]
+        pi = low + len(left)
+        arr[low:pi] = left
+        arr[pi + 1:high + 1] = right
+        arr[pi] = pivot
+        comparisons += high - low
+        writes += high - low + 1
+
+        # Handle the smaller side first so the stack stays short
+        if pi - low < high - pi:
+            stack.append((pi + 1, high))
+            stack.append((low, pi - 1))
+        else:
+            stack.append((low, pi - 1))
+            stack.append((pi + 1, high))
+    stats.add(comparisons, 0, writes)
+
+
+def bubble_sort(numbers, stats=None, on_step=None):
+    return run(bubble_kernel, sorting_engine.bubble_sort, numbers, stats, on_step)
+
+
+def selection_sort(numbers, stats=None, on_step=None):
+    return run(selection_kernel, sorting_engine.selection_sort, numbers, stats, on_step)
+
+
+def insertion_sort(numbers, stats=None, on_step=None):
+    return run(insertion_kernel, sorting_engine.insertion_sort, numbers, stats, on_step)
+
+
+def merge_sort(numbers, stats=None, on_step=None):
+    return run(merge_kernel, sorting_engine.merge_sort, numbers, stats, on_step)
+
+
+def quick_sort(numbers, stats=None, on_step=None):
+    return run(quick_kernel, sorting_engine.quick_sort, numbers, stats, on_step)
+
+
+# Same names as the registry of the engine
+ALGORITHMS = {
+    "Bubble Sort": bubble_sort,
+    "Selection Sort": selection_sort,
+    "Quick Sort": quick_sort,
+    "Insertion Sort": insertion_sort,
+    "Merge Sort": merge_sort
+}
@@ -0,0 +1,257 @@
+"""Multiprocess merge sort and quick sort for large arrays.
+
+The numbers are copied once into a shared memory block, worker processes
+read and write their part of it directly so the array is never pickled.
+
+* Merge sort: every worker sorts one chunk in place, then the sorted runs are
+  cut at common splitter values and every worker k-way merges one value range
+  of all runs into the output block. The values equal to a splitter are cut
+  into even shares for all ranges next to it, so heavy duplicates do not end
+  up in a single range.
+* Quick sort: splitters are sampled from the input, every worker groups its
+  chunk into the splitter buckets in place, then every worker gathers one
+  bucket from all chunks and sorts it into its place in the output block.
+  Values equal to a splitter are spread over all buckets that may hold them,
+  so heavy duplicates do not end up in a single bucket.
+"""
+import bisect
+import heapq
+import math
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from sorting_engine import SortStats, add_stats, merge_sort, value_typecode
+
+# Below this size starting the worker processes costs more than it saves
+PARALLEL_THRESHOLD = 50000
+
+# Samples taken per worker to choose the splitters
+SAMPLES_PER_WORKER = 32
+
+
+def attach(name):
+    # Workers share the resource tracker of the parent, which unlinks the block when done
+    return shared_memory.SharedMemory(name=name)
+
+
+def sort_chunk(name, typecode, start, end, algorithm):
+    shm = attach(name)
+    view = shm.buf.cast(typecode)
+    try:
+        numbers = view[start:end].tolist()
+        stats = SortStats()
+        algorithm(numbers, stats)
+        view[start:end] = array(typecode, numbers)
+        return stats.as_dict()
+    finally:
+        view.release()
+        shm.close()
+
+
+def cut_run(run, start, end, splitters):
+    # Where every value range starts and ends inside the sorted run[start:end]. The values
+    # equal to a group of equal splitters are shared out evenly over the ranges around them.
+    cuts = [start]
+    p = 0
+    while p < len(splitters):
+        value = splitters[p]
+        group = p
+        while group < len(splitters) and splitters[group] == value:
+            group += 1
+        low = bisect.bisect_left(run, value, start, end)
+        high = bisect.bisect_right(run, value, start, end)
+        shares = group - p + 1
+        cuts.extend(low + (high - low) * share // shares for share in range(1, shares))
+        p = group
+    cuts.append(end)
+    return cuts
+
+
+def merge_ranges(name, out_name, typecode, ranges, out_start):
+    shm = attach(name)
+    out_shm = attach(out_name)
+    view = shm.buf.cast(typecode)
+    out_view = out_shm.buf.cast(typecode)
+    try:
+        runs = [view[start:end].tolist() for start, end in ranges if start < end]
+        merged = array(typecode, heapq.merge(*runs))
+        out_view[out_start:out_start + len(merged)] = merged
+        # heapq does not report its comparisons, a tournament of k runs needs log2(k) per element
+        comparisons = len(merged) * math.ceil(math.log2(len(runs))) if len(runs) > 1 else 0
+        return {"comparisons": comparisons, "swaps": 0, "writes": len(merged)}
+    finally:
+        view.release()
+        out_view.release()
+        shm.close()
+        out_shm.close()
+
+
+def group_chunk(name, typecode, start, end, splitters):
+    # Reorder the chunk in place so its elements are grouped by splitter bucket
+    shm = attach(name)
+    view = shm.buf.cast(typecode)
+    try:
+        buckets = [[] for _ in range(len(splitters) + 1)]
+        # First bucket that may hold a value equal to a splitter
+        first = {}
+        for bucket, splitter in enumerate(splitters):
+            first.setdefault(splitter, bucket)
+        turn = 0
+        for value in view[start:end].tolist():
+            bucket = bisect.bisect_right(splitters, value)
+            if bucket and splitters[bucket - 1] == value:
+                # Values equal to a splitter are dealt round robin over all buckets that may hold
+                # them, so a run of equal splitters does not send most of the input to one bucket
+                low = first[value]
+                bucket = low + turn % (bucket - low + 1)
+                turn += 1
+            buckets[bucket].append(value)
+
+        position = start
+        for bucket in buckets:
+            view[position:position + len(bucket)] = array(typecode, bucket)
+            position += len(bucket)
+
+        comparisons = (end - start) * math.ceil(math.log2(len(buckets))) if len(buckets) > 1 else 0
+        return [len(bucket) for bucket in buckets], {"comparisons": comparisons, "swaps": 0, "writes": end - start}
+    finally:
+        view.release()
+        shm.close()
+
+
+def sort_bucket(name, out_name, typecode, ranges, out_start, algorithm):
+    shm = attach(name)
+    out_shm = attach(out_name)
+    view = shm.buf.cast(typecode)
+    out_view = out_shm.buf.cast(typecode)
+    try:
+        numbers = []
+        for start, end in ranges:
+            numbers.extend(view[start:end].tolist())
+        stats = SortStats()
+        algorithm(numbers, stats)
+        out_view[out_start:out_start + len(numbers)] = array(typecode, numbers)
+        return stats.as_dict()
+    finally:
+        view.release()
+        out_view.release()
+        shm.close()
+        out_shm.close()
+
+
+def chunk_bounds(n, parts):
+    return [(n * p // parts, n * (p + 1) // parts) for p in range(parts)]
+
+
+def run_merge_sort(executor, name, out_name, typecode, n, workers, algorithm, stats):
+    chunks = chunk_bounds(n, workers)
+    for result in executor.map(sort_chunk, [name] * workers, [typecode] * workers,
+                               [start for start, _ in chunks], [end for _, end in chunks], [algorithm] * workers):
+        add_stats(stats, result)
+
+    # Choose splitters from evenly spaced samples of the sorted runs
+    shm = attach(name)
+    view = shm.buf.cast(typecode)
+    try:
+        samples = sorted(view[start + (end - start) * s // SAMPLES_PER_WORKER]
+                         for start, end in chunks if end > start for s in range(SAMPLES_PER_WORKER))
+        splitters = [samples[len(samples) * p // workers] for p in range(1, workers)]
+
+        # cuts[r] holds where every value range starts and ends inside run r
+        cuts = [cut_run(view, start, end, splitters) for start, end in chunks]
+    finally:
+        view.release()
+        shm.close()
+
+    tasks = []
+    out_start = 0
+    for p in range(workers):
+        ranges = [(run_cuts[p], run_cuts[p + 1]) for run_cuts in cuts]
+        tasks.append(executor.submit(merge_ranges, name, out_name, typecode, ranges, out_start))
+        out_start += sum(end - start for start, end in ranges)
+    for task in tasks:
+        add_stats(stats, task.result())
+
+
+def run_quick_sort(executor, name, out_name, typecode, numbers, workers, algorithm, stats):
+    n = len(numbers)
+    chunks = chunk_bounds(n, workers)
+
+    # Splitters are quantiles of a random sample, like the pivot of quick sort
+    samples = sorted(random.sample(numbers, min(n, workers * SAMPLES_PER_WORKER)))
+    splitters = [samples[len(samples) * p // workers] for p in range(1, workers)]
+
+    bucket_counts = []
+    for counts, result in executor.map(group_chunk, [name] * workers, [typecode] * workers,
+                                       [start for start, _ in chunks], [end for _, end in chunks],
+                                       [splitters] * workers):
+        bucket_counts.append(counts)
+        add_stats(stats, result)
+
+    # Where every bucket lives inside every chunk
+    bucket_ranges = [[] for _ in range(workers)]
+    for (start, _), counts in zip(chunks, bucket_counts):
+        position = start
+        for bucket, count in enumerate(counts):
+            bucket_ranges[bucket].append((position, position + count))
+            position += count
+
+    tasks = []
+    out_start = 0
+    for ranges in bucket_ranges:
+        tasks.append(executor.submit(sort_bucket, name, out_name, typecode, ranges, out_start, algorithm))
+        out_start += sum(end - start for start, end in ranges)
+    for task in tasks:
+        add_stats(stats, task.result())
+
+
+def parallel_sort(numbers, algorithm, stats=None, on_step=None, workers=None, executor=None):
+    # algorithm is the sequential engine function used for the chunks, merge_sort selects
+    # the merge based variant and any other algorithm the partition (sample sort) based one
+    stats = stats if stats is not None else SortStats()
+    workers = workers or os.cpu_count() or 1
+    n = len(numbers)
+
+    # Step events can only come from this process, so a watched sort runs sequentially
+    if on_step is not None or workers < 2 or n < PARALLEL_THRESHOLD:
+        return algorithm(numbers, stats, on_step)
+
+    typecode = value_typecode(numbers)
+    try:
+        data = array(typecode, numbers)
+    except OverflowError:
+        # Integers beyond 64 bits cannot be shared, sort them sequentially
+        return algorithm(numbers, stats)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(len(data) * data.itemsize, 1))
+    out_shm = shared_memory.SharedMemory(create=True, size=max(len(data) * data.itemsize, 1))
+    try:
+        view = shm.buf.cast(typecode)
+        view[:n] = data
+        view.release()
+        del data
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            if algorithm is merge_sort:
+                run_merge_sort(executor, shm.name, out_shm.name, typecode, n, workers, algorithm, stats)
+            else:
+                run_quick_sort(executor, shm.name, out_shm.name, typecode, numbers, workers, algorithm, stats)
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+        out_view = out_shm.buf.cast(typecode)
+        numbers[:] = out_view[:n].tolist()
+        out_view.release()
+    finally:
+        shm.close()
+        shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+    return numbers
@@ -0,0 +1,149 @@
+"""Instrumentation of the hot paths: named spans, counters and frame statistics.
+
+Spans mark where the time goes (sorting, the playback steps, the colour
+table, painting, MIDI) and are only recorded while profiling is enabled;
+otherwise ``span`` returns a shared object whose enter and exit do nothing,
+so the instrumented code pays one flag check. The recorded events are
+written as Chrome trace event JSON, which chrome://tracing and
+https://ui.perfetto.dev open directly:
+
+    profiling.enable()
+    with profiling.span("sort", algorithm="Merge Sort"):
+        merge_sort(numbers, stats)
+    profiling.counter("Merge Sort", comparisons=stats.comparisons)
+    profiling.write_chrome_trace("trace.json")
+
+``FrameStats`` keeps the time, draw calls and drawn elements of the last
+frames of a graph; it is cheap enough to stay on without profiling.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Events kept while profiling, the oldest ones are dropped first
+MAX_EVENTS = 1 << 20
+
+# Frames averaged by FrameStats
+FRAME_WINDOW = 60
+
+enabled = False
+
+# (phase, name, start ns, duration ns, thread id, args)
+events = deque(maxlen=MAX_EVENTS)
+
+start_ns = time.perf_counter_ns()
+
+
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        events.append(("X", self.name, self.start, end - self.start, threading.get_ident(), self.args))
+        return False
+
+
+def span(name, **args):
+    # Context manager that records how long its body took
+    if not enabled:
+        return NULL_SPAN
+    return Span(name, args)
+
+
+def counter(name, **values):
+    # Values of a counter track at this moment, e.g. the operations of a sort
+    if enabled:
+        events.append(("C", name, time.perf_counter_ns(), 0, threading.get_ident(), values))
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    events.clear()
+
+
+def chrome_trace():
+    # The events in the Chrome trace event format, times in microseconds
+    pid = os.getpid()
+    trace_events = []
+    thread_ids = set()
+    for phase, name, start, duration, thread_id, args in list(events):
+        event = {"name": name, "ph": phase, "ts": (start - start_ns) / 1000, "pid": pid, "tid": thread_id,
+                 "args": args}
+        if phase == "X":
+            event["dur"] = duration / 1000
+        trace_events.append(event)
+        thread_ids.add(thread_id)
+
+    # Name the threads that are still running, the others keep their number
+    for thread in threading.enumerate():
+        if thread.ident in thread_ids:
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread.ident,
+                                 "args": {"name": thread.name}})
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(path):
+    with open(path, "w") as f:
+        json.dump(chrome_trace(), f)
+
+
+class FrameStats:
+    # Rolling statistics of the last frames of a graph
+    def __init__(self, name="frame", window=FRAME_WINDOW):
+        self.name = name
+        # (end time, frame time, draw calls, elements drawn) per frame
+        self.frames = deque(maxlen=window)
+
+    def add(self, frame_time, draw_calls, elements):
+        self.frames.append((time.perf_counter(), frame_time, draw_calls, elements))
+        counter(self.name, frame_ms=frame_time * 1000, draw_calls=draw_calls, elements=elements)
+
+    def summary(self):
+        frames = self.frames
+        if not frames:
+            return {"fps": 0.0, "frame_ms": 0.0, "max_frame_ms": 0.0, "draw_calls": 0, "elements": 0}
+        count = len(frames)
+        span_time = frames[-1][0] - frames[0][0]
+        return {
+            "fps": (count - 1) / span_time if span_time > 0 else 0.0,
+            "frame_ms": sum(frame[1] for frame in frames) / count * 1000,
+            "max_frame_ms": max(frame[1] for frame in frames) * 1000,
+            "draw_calls": frames[-1][2],
+            "elements": frames[-1][3],
+        }
+
+    def text(self):
+        summary = self.summary()
+        return (f"{summary['fps']:.0f} fps, frame {summary['frame_ms']:.1f} ms (max {summary['max_frame_ms']:.1f}), "
+                f"{summary['draw_calls']} draw calls, {summary['elements']} elements")
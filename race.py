@@ -0,0 +1,174 @@
+"""Race several algorithms on the same input, each in its own process.
+
+Every algorithm sorts an identical copy of the numbers in a separate worker
+process, so no algorithm waits for the GIL of another. The workers start
+together at a shared barrier and time a sort without step events, then record
+a SortTrace of the same sort for the animation. Results arrive as the workers
+finish:
+
+    python -m main race --size 2000 --distribution nearly-sorted
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import threading
+from multiprocessing.connection import wait
+
+from sorting_engine import ALGORITHMS, SortStats
+from sort_trace import SortTrace
+
+# Seconds the workers wait for each other at the start
+START_TIMEOUT = 30
+
+# Seconds between checks for a cancelled race while waiting for results
+POLL_INTERVAL = 0.1
+
+
+def own_process_group():
+    # Make the calling worker the leader of a new process group, so stop_worker also
+    # reaches the processes it starts, like the pools of the parallel algorithms
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+
+def stop_worker(process):
+    # Terminate a worker together with its process group where there is one
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            return
+        except ProcessLookupError:
+            # The worker has not made its group yet, so it has not started any processes either
+            pass
+    process.terminate()
+
+
+def race_worker(name, numbers, start_barrier, connection, record):
+    own_process_group()
+    algorithm = ALGORITHMS[name]
+    result = {"algorithm": name, "error": None, "trace": None}
+    try:
+        start_barrier.wait(START_TIMEOUT)
+    except threading.BrokenBarrierError:
+        # Another worker did not come up, run anyway
+        pass
+
+    stats = SortStats()
+    stats.start()
+    try:
+        algorithm(list(numbers), stats)
+    except (RecursionError, MemoryError, TypeError, ValueError) as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    stats.stop()
+    result.update(stats.snapshot())
+
+    if record and result["error"] is None:
+        trace = SortTrace(numbers)
+        algorithm(list(numbers), None, trace.record)
+        result["trace"] = trace
+    connection.send(result)
+    connection.close()
+
+
+def failed_result(name, error):
+    result = {"algorithm": name, "error": error, "trace": None}
+    result.update(SortStats().snapshot())
+    return result
+
+
+class Race:
+    def __init__(self, numbers, names, record=True):
+        for name in names:
+            if name not in ALGORITHMS:
+                raise ValueError(f"Unknown algorithm: {name} (choose from {', '.join(ALGORITHMS)})")
+        self.names = list(names)
+        self.cancelled = False
+        # Spawned, so the workers do not inherit the threads of a running GUI
+        context = multiprocessing.get_context("spawn")
+        # Kept here, the processes drop their arguments once they are started
+        self.start_barrier = context.Barrier(len(self.names))
+        numbers = list(numbers)
+
+        # One pipe per worker: a worker that is killed while sending only breaks its own pipe
+        self.readers = []
+        self.writers = []
+        self.processes = []
+        for name in self.names:
+            reader, writer = context.Pipe(duplex=False)
+            self.readers.append(reader)
+            self.writers.append(writer)
+            # Not daemonic, the parallel algorithms start processes of their own
+            self.processes.append(context.Process(target=race_worker, name=f"race: {name}",
+                                                  args=(name, numbers, self.start_barrier, writer, record)))
+
+    def start(self):
+        for process in self.processes:
+            process.start()
+        # Only the workers write, so a reader sees EOF when its worker dies
+        for writer in self.writers:
+            writer.close()
+
+    def iter_results(self):
+        # Results in the order the workers finish
+        pending = dict(zip(self.readers, self.names))
+        while pending and not self.cancelled:
+            for reader in wait(list(pending), POLL_INTERVAL):
+                name = pending.pop(reader)
+                try:
+                    result = reader.recv()
+                except EOFError:
+                    result = failed_result(name, "the worker process exited without a result")
+                reader.close()
+                yield result
+        if not self.cancelled:
+            for process in self.processes:
+                process.join()
+
+    def cancel(self):
+        self.cancelled = True
+        for process in self.processes:
+            if process.is_alive():
+                stop_worker(process)
+
+
+def leaderboard(results):
+    # Finished algorithms by elapsed time, failed ones last
+    return sorted(results, key=lambda result: (result["error"] is not None, result["elapsed"]))
+
+
+def run_race(numbers, names, record=False):
+    race = Race(numbers, names, record)
+    race.start()
+    return leaderboard(race.iter_results())
+
+
+def main(argv=None):
+    import datasets
+
+    parser = argparse.ArgumentParser(description="Race sorting algorithms on the same input.")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), metavar="NAME",
+                        help="algorithms to race (default: all)")
+    parser.add_argument("--size", type=int, default=1000, help="number of values (default: 1000)")
+    parser.add_argument("--distribution", default="permutation",
+                        choices=datasets.DISTRIBUTIONS + list(datasets.ALIASES), help="(default: permutation)")
+    parser.add_argument("--seed", type=int, default=0, help="(default: 0)")
+    args = parser.parse_args(argv)
+
+    numbers = datasets.get_dataset(args.distribution, args.size, args.seed)
+    try:
+        results = run_race(numbers, args.algorithms)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    print(f"{'place':>5} {'algorithm':<20} {'elapsed ms':>12} {'comparisons':>14} {'swaps':>12} {'writes':>12}")
+    for place, result in enumerate(results, 1):
+        if result["error"] is not None:
+            print(f"{'-':>5} {result['algorithm']:<20} {result['error']}")
+            continue
+        print(f"{place:>5} {result['algorithm']:<20} {result['elapsed'] * 1000:>12.3f} {result['comparisons']:>14} "
+              f"{result['swaps']:>12} {result['writes']:>12}")
+
+
+if __name__ == "__main__":
+    main()
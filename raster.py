@@ -0,0 +1,193 @@
+"""Raster rendering of the graphs into NumPy RGB buffers.
+
+Drawing every element with its own wx call stops being interactive beyond a
+few thousand elements, and above one element per pixel column most of those
+calls paint over each other. ``RasterRenderer`` builds the whole frame as a
+``(height, width, 3)`` uint8 array instead: when there are more elements than
+columns, the elements of every pixel column are reduced to their minimum and
+maximum and the column is drawn from those two values. The frame is first
+drawn as colour levels into a 16 bit canvas and turned into RGB with a single
+palette lookup at the end. The GUI hands the buffer to ``wx.Bitmap.FromBuffer``
+and draws it in one call. Needs the optional ``numpy`` library, like
+numpy_backend.
+"""
+from array import array
+
+import numpy as np
+
+# Radius of the circles in the scatter chart
+SCATTER_RADIUS = 3
+
+# Pixels kept free above the largest value
+TOP_MARGIN = 20
+
+HIGHLIGHT_RGB = (255, 0, 0)
+OUTLINE_RGB = (0, 0, 0)
+
+# Ends of the value gradient of GraphPanel, swapped for the stem graph
+LOW_VALUE_RGB = (0, 255, 255)
+HIGH_VALUE_RGB = (0, 0, 128)
+
+
+def gradient_colours(graph_type, levels=256):
+    # The colour levels of GraphPanel without wx, from the smallest value to the largest
+    low, high = (HIGH_VALUE_RGB, LOW_VALUE_RGB) if graph_type == "Stem Graph" else (LOW_VALUE_RGB, HIGH_VALUE_RGB)
+    colours = []
+    for level in range(levels):
+        fraction = level / (levels - 1)
+        colours.append(tuple(a - int(fraction * (a - b)) for a, b in zip(low, high)))
+    return colours
+
+
+def disk_offsets(radius):
+    # Pixel offsets (dy, dx) of a filled circle
+    offsets = np.array([(dy, dx) for dy in range(-radius, radius + 1) for dx in range(-radius, radius + 1)
+                        if dy * dy + dx * dx <= radius * radius + radius])
+    return offsets[:, 0], offsets[:, 1]
+
+
+class RasterRenderer:
+    def __init__(self):
+        self.values = np.zeros(0)
+        # A view of an array.array shares its memory and never has to be updated
+        self.is_view = False
+        self.lut_source = None
+        self.levels_count = 0
+        # The colour levels followed by the background, highlight and outline colours
+        self.palette = None
+        self.background = None
+        self.outline = disk_offsets(SCATTER_RADIUS)
+        self.fill = disk_offsets(SCATTER_RADIUS - 1)
+
+    def set_numbers(self, numbers):
+        if isinstance(numbers, array) and numbers.typecode in "bBhHiIlLqQfd":
+            self.values = np.frombuffer(numbers, dtype=numbers.typecode)
+            self.is_view = True
+        else:
+            self.values = np.array(numbers, dtype=np.float64)
+            self.is_view = False
+
+    def update(self, numbers, indices):
+        # Copy the changed elements of a list into the buffer
+        if self.is_view or not indices:
+            return
+        indices = np.fromiter(indices, dtype=np.intp, count=len(indices))
+        indices = indices[indices < len(self.values)]
+        self.values[indices] = [numbers[i] for i in indices.tolist()]
+
+    def set_colours(self, colours, background):
+        # colours is a sequence of (r, g, b) tuples indexed by colour level
+        if colours is self.lut_source and background == self.background:
+            return
+        self.lut_source = colours
+        self.background = background
+        self.levels_count = len(colours)
+        self.palette = np.array(list(colours) + [background, HIGHLIGHT_RGB, OUTLINE_RGB],
+                                dtype=np.uint8).reshape(-1, 3)
+
+    def levels(self, values, min_number, scale):
+        levels = ((values - min_number) * scale).astype(np.intp)
+        return np.clip(levels, 0, self.levels_count - 1).astype(np.uint16)
+
+    def render(self, width, height, graph_type, min_number, max_number, scale, highlighted=()):
+        canvas = self.render_levels(width, height, graph_type, min_number, max_number, scale, highlighted)
+        return np.take(self.palette, canvas, axis=0)
+
+    def render_levels(self, width, height, graph_type, min_number, max_number, scale, highlighted=(),
+                      dtype=np.uint16):
+        # The frame as indices into the palette
+        canvas = np.full((height, width), self.levels_count, dtype=dtype)
+        n = len(self.values)
+        if n and width > 0 and height > 0:
+            self.draw(canvas, graph_type, min_number, max_number, scale)
+            if len(highlighted):
+                self.draw_highlighted(canvas, np.array(highlighted, dtype=np.intp), graph_type, max_number)
+        return canvas
+
+    def draw(self, canvas, graph_type, min_number, max_number, scale):
+        height, width = canvas.shape
+        n = len(self.values)
+        usable = height - TOP_MARGIN
+        if n >= width or graph_type == "Column (Bar) Graph":
+            # Reduce the elements of every pixel column to their extremes, a column
+            # narrower than one element repeats the element
+            starts = np.arange(width) * n // width
+            low = np.minimum.reduceat(self.values, starts).astype(np.float64)
+            high = np.maximum.reduceat(self.values, starts).astype(np.float64)
+            if graph_type == "Scatter Chart":
+                self.draw_scatter_columns(canvas, low, high, usable, min_number, max_number, scale)
+            elif graph_type == "Column (Bar) Graph":
+                # The lower element fills the column up to its height, the higher one tops it off
+                self.draw_columns(canvas, self.levels(low, min_number, scale), self.levels(high, min_number, scale),
+                                  (low / max_number * usable).astype(np.intp),
+                                  (high / max_number * usable).astype(np.intp))
+            elif graph_type == "Stem Graph":
+                # Stems grow as the values shrink
+                self.draw_columns(canvas, self.levels(high, min_number, scale), self.levels(low, min_number, scale),
+                                  ((1 - high / max_number) * usable).astype(np.intp),
+                                  ((1 - low / max_number) * usable).astype(np.intp))
+        else:
+            indices = np.arange(n)
+            levels = self.levels(self.values, min_number, scale)
+            if graph_type == "Scatter Chart":
+                self.draw_points(canvas, indices, levels, max_number, usable)
+            elif graph_type == "Stem Graph":
+                self.draw_stems(canvas, indices, levels, max_number, usable)
+
+    def draw_columns(self, canvas, short_levels, long_levels, short_heights, long_heights):
+        # Every column is filled from the bottom: up to short_heights in the colour of
+        # short_levels and from there up to long_heights in the colour of long_levels
+        height = canvas.shape[0]
+        rows = np.arange(height)[:, None]
+        long_heights = np.maximum(long_heights, short_heights)
+        canvas[:] = np.where(rows >= height - short_heights, short_levels,
+                             np.where(rows >= height - long_heights, long_levels, canvas))
+
+    def draw_scatter_columns(self, canvas, low, high, usable, min_number, max_number, scale):
+        # The points of a column lie between the rows of its extremes, and the colour of a
+        # point only depends on its row
+        height = canvas.shape[0]
+        rows = np.arange(height)
+        row_levels = self.levels((1 - rows / usable) * max_number, min_number, scale)
+        top = ((1 - high / max_number) * usable).astype(np.intp) - (SCATTER_RADIUS - 1)
+        bottom = ((1 - low / max_number) * usable).astype(np.intp) + (SCATTER_RADIUS - 1)
+        rows = rows[:, None]
+        canvas[:] = np.where((rows >= top) & (rows <= bottom), row_levels[:, None], canvas)
+
+    def element_x(self, indices, width):
+        return ((indices + 0.5) * width / len(self.values)).astype(np.intp)
+
+    def draw_points(self, canvas, indices, levels, max_number, usable):
+        height, width = canvas.shape
+        xs = self.element_x(indices, width)
+        ys = ((1 - self.values[indices] / max_number) * usable).astype(np.intp)
+        outline = self.levels_count + 2
+        for (dys, dxs), fill in ((self.outline, outline), (self.fill, levels)):
+            for dy, dx in zip(dys, dxs):
+                canvas[np.clip(ys + dy, 0, height - 1), np.clip(xs + dx, 0, width - 1)] = fill
+
+    def draw_stems(self, canvas, indices, levels, max_number, usable):
+        height, width = canvas.shape
+        xs = self.element_x(indices, width)
+        stem_heights = ((1 - self.values[indices] / max_number) * usable).astype(np.intp)
+        mask = np.arange(height)[:, None] >= height - stem_heights
+        # Stems are two pixels wide
+        for x in (xs, np.minimum(xs + 1, width - 1)):
+            canvas[:, x] = np.where(mask, levels, canvas[:, x])
+
+    def draw_highlighted(self, canvas, indices, graph_type, max_number):
+        height, width = canvas.shape
+        n = len(self.values)
+        usable = height - TOP_MARGIN
+        indices = indices[(indices >= 0) & (indices < n)]
+        highlight = self.levels_count + 1
+        if graph_type == "Scatter Chart":
+            self.draw_points(canvas, indices, highlight, max_number, usable)
+        elif graph_type == "Stem Graph":
+            self.draw_stems(canvas, indices, highlight, max_number, usable)
+        elif graph_type == "Column (Bar) Graph":
+            for i in indices.tolist():
+                x0 = i * width // n
+                x1 = max((i + 1) * width // n, x0 + 1)
+                column_height = int(self.values[i] / max_number * usable)
+                canvas[height - column_height:, x0:x1] = highlight
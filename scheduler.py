@@ -0,0 +1,185 @@
+"""Cooperative scheduler for sorts written as step generators.
+
+A ``SortTask`` wraps a step generator from sort_steps. The scheduler advances
+the running tasks in slices of at most ``quantum`` steps on a small thread
+pool; a task that used up its slice goes to the back of the pool's queue, so
+many sorts share the threads fairly. Tasks can be paused, resumed, advanced a
+given number of steps while paused and cancelled at any time. A paused task
+holds no thread of the pool: its state lives in the suspended generator (and
+the sort behind it waits for the generator), and resuming continues from
+exactly the step where it stopped.
+
+    scheduler = SortScheduler()
+    task = scheduler.submit(get_steps("Merge Sort")(numbers, stats), on_step=trace.record)
+    task.pause()
+    task.step(10)
+    task.resume()
+    task.wait()
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import profiling
+from sorting_engine import SortCancelled
+
+# Task states
+RUNNING = "running"
+PAUSED = "paused"
+FINISHED = "finished"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+# Steps a task runs before the next task gets the thread
+QUANTUM = 1000
+
+
+class SortTask:
+    def __init__(self, scheduler, steps, stats=None, on_step=None, on_done=None, on_slice=None):
+        self.scheduler = scheduler
+        self.steps = steps
+        self.stats = stats
+        self.on_step = on_step
+        self.on_done = on_done
+        self.on_slice = on_slice
+        self.state = RUNNING
+        self.error = None
+        # Steps taken so far
+        self.position = 0
+        # Steps requested with step() while paused
+        self.requested = 0
+        # Whether a slice of this task is queued or running, at most one at a time
+        self.scheduled = False
+        self.done = threading.Event()
+
+    @property
+    def finished(self):
+        return self.done.is_set()
+
+    def pause(self):
+        with self.scheduler.lock:
+            if self.state == RUNNING:
+                self.state = PAUSED
+
+    def resume(self):
+        with self.scheduler.lock:
+            if self.state == PAUSED:
+                self.state = RUNNING
+                self.scheduler.schedule(self)
+
+    def step(self, count=1):
+        # Advance a paused task by count steps
+        with self.scheduler.lock:
+            if self.state == PAUSED:
+                self.requested += count
+                self.scheduler.schedule(self)
+
+    def cancel(self):
+        with self.scheduler.lock:
+            if self.state not in (RUNNING, PAUSED):
+                return
+            self.state = CANCELLED
+            if self.scheduled:
+                # The running slice closes the generator when it sees the new state
+                return
+        self.steps.close()
+        self.finish()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def finish(self):
+        self.done.set()
+        if self.on_done is not None:
+            self.on_done(self)
+
+
+class SortScheduler:
+    def __init__(self, workers=2, quantum=QUANTUM):
+        self.quantum = quantum
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sort")
+        self.tasks = []
+
+    def submit(self, steps, stats=None, on_step=None, on_done=None, paused=False, on_slice=None):
+        # on_step(event, i, j), on_slice(task) after every slice and on_done(task) are
+        # called in the worker threads
+        task = SortTask(self, steps, stats, on_step, on_done, on_slice)
+        with self.lock:
+            self.tasks = [t for t in self.tasks if not t.finished]
+            self.tasks.append(task)
+            if paused:
+                task.state = PAUSED
+            else:
+                self.schedule(task)
+        return task
+
+    def schedule(self, task):
+        # Called with the lock held
+        if not task.scheduled:
+            task.scheduled = True
+            self.executor.submit(self.run_slice, task)
+
+    def run_slice(self, task):
+        with self.lock:
+            if task.state == RUNNING:
+                budget = self.quantum
+                single_steps = False
+            elif task.state == PAUSED and task.requested:
+                budget = task.requested
+                task.requested = 0
+                single_steps = True
+            else:
+                budget = 0
+                single_steps = False
+
+        done = False
+        steps = task.steps
+        on_step = task.on_step
+        try:
+            with profiling.span("sort slice", position=task.position, budget=budget):
+                for _ in range(budget):
+                    # A pause or cancel takes effect before the next step
+                    if task.state != RUNNING and not (single_steps and task.state == PAUSED):
+                        break
+                    try:
+                        event, i, j = next(steps)
+                    except StopIteration:
+                        done = True
+                        break
+                    task.position += 1
+                    if on_step is not None:
+                        on_step(event, i, j)
+        except SortCancelled:
+            with self.lock:
+                task.state = CANCELLED
+        except Exception as e:
+            task.error = e
+            with self.lock:
+                task.state = FAILED
+
+        # Before the task is scheduled again, so slices and on_slice never overlap
+        if task.on_slice is not None and budget:
+            task.on_slice(task)
+
+        with self.lock:
+            if done:
+                task.state = FINISHED
+            task.scheduled = False
+            ended = task.state in (FINISHED, CANCELLED, FAILED)
+            if task.state == RUNNING or (task.state == PAUSED and task.requested):
+                # Back to the end of the queue, behind the other tasks
+                self.schedule(task)
+
+        if ended:
+            steps.close()
+            task.finish()
+
+    def cancel_all(self):
+        with self.lock:
+            tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+
+    def shutdown(self, wait=True):
+        self.cancel_all()
+        self.executor.shutdown(wait=wait)
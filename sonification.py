@@ -0,0 +1,178 @@
+"""Asynchronous MIDI sonification of the highlighted values.
+
+The GUI thread hands the values of a frame to ``MidiSonifier.play``, which
+maps them to notes of a scale and puts them on a small bounded queue without
+ever blocking. A worker thread plays the notes, limited to a maximum number
+of notes per second. Frames that do not fit into the queue or the rate limit
+are dropped, so a slow MIDI device can not slow down sorting or drawing.
+
+``open_output`` imports pygame only when it is called and falls back to a
+``NullOutput`` when pygame or a MIDI output port is not available.
+"""
+import queue
+import threading
+import time
+
+import profiling
+
+# Semitone offsets of the notes of one octave
+SCALES = {
+    "chromatic": [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
+    "major": [0, 2, 4, 5, 7, 9, 11],
+    "minor": [0, 2, 3, 5, 7, 8, 10],
+    "pentatonic": [0, 2, 4, 7, 9],
+}
+
+
+class NullOutput:
+    # Stands in for a MIDI output when there is none, the notes are discarded
+    def note_on(self, note, velocity=127):
+        pass
+
+    def note_off(self, note, velocity=0):
+        pass
+
+    def close(self):
+        pass
+
+
+class PygameOutput:
+    def __init__(self, midi, port):
+        self.midi = midi
+        self.output = midi.Output(port)
+
+    def note_on(self, note, velocity=127):
+        self.output.note_on(note, velocity)
+
+    def note_off(self, note, velocity=0):
+        self.output.note_off(note, velocity)
+
+    def close(self):
+        self.output.close()
+        self.midi.quit()
+
+
+def open_output(port=None):
+    # The default MIDI output of pygame, or a NullOutput when there is none
+    try:
+        import pygame.midi as midi
+    except ImportError:
+        return NullOutput()
+
+    midi.init()
+    if port is None:
+        port = midi.get_default_output_id()
+    if port < 0:
+        midi.quit()
+        return NullOutput()
+    try:
+        return PygameOutput(midi, port)
+    except midi.MidiException:
+        midi.quit()
+        return NullOutput()
+
+
+class NoteScale:
+    # Maps the range of values onto the notes of a scale over some octaves
+    def __init__(self, scale="pentatonic", base_note=48, octaves=3):
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale: {scale} (choose from {', '.join(SCALES)})")
+        self.intervals = SCALES[scale]
+        self.base_note = base_note
+        self.octaves = octaves
+        self.minimum = 0
+        self.maximum = 1
+
+    def set_range(self, minimum, maximum):
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def note(self, value):
+        steps = len(self.intervals) * self.octaves
+        span = (self.maximum - self.minimum) or 1
+        degree = int((value - self.minimum) / span * (steps - 1))
+        degree = max(0, min(degree, steps - 1))
+        octave, index = divmod(degree, len(self.intervals))
+        return max(0, min(self.base_note + 12 * octave + self.intervals[index], 127))
+
+
+class MidiSonifier:
+    def __init__(self, output=None, scale=None, max_notes_per_second=60, max_notes_per_frame=4, queue_size=8,
+                 velocity=100):
+        # Without an output the notes are discarded
+        self.output = output if output is not None else NullOutput()
+        self.scale = scale if scale is not None else NoteScale()
+        self.max_notes_per_second = max_notes_per_second
+        self.max_notes_per_frame = max_notes_per_frame
+        self.velocity = velocity
+
+        # Frames that were dropped because the queue was full or the rate limit was reached
+        self.dropped = 0
+        self.played = 0
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.closed = threading.Event()
+        self.worker = threading.Thread(target=self.run, name="sonification", daemon=True)
+        self.worker.start()
+
+    def set_range(self, minimum, maximum):
+        self.scale.set_range(minimum, maximum)
+
+    def play(self, values):
+        # Called for every frame, never blocks
+        if self.closed.is_set():
+            return
+
+        notes = []
+        for value in values:
+            note = self.scale.note(value)
+            if note not in notes:
+                notes.append(note)
+                if len(notes) == self.max_notes_per_frame:
+                    break
+        if not notes:
+            return
+
+        try:
+            self.queue.put_nowait(notes)
+        except queue.Full:
+            self.dropped += 1
+
+    def run(self):
+        # Token bucket: one token per note, refilled at max_notes_per_second
+        tokens = float(self.max_notes_per_second)
+        last_refill = time.monotonic()
+        sounding = []
+
+        while not self.closed.is_set():
+            try:
+                notes = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            now = time.monotonic()
+            tokens = min(tokens + (now - last_refill) * self.max_notes_per_second, self.max_notes_per_second)
+            last_refill = now
+
+            allowed = notes[:int(tokens)]
+            if not allowed:
+                self.dropped += 1
+                continue
+            tokens -= len(allowed)
+
+            # The notes of a frame sound until the next frame is played
+            with profiling.span("midi send", notes=len(allowed)):
+                for note in sounding:
+                    self.output.note_off(note)
+                for note in allowed:
+                    self.output.note_on(note, self.velocity)
+            sounding = allowed
+            self.played += len(allowed)
+
+        for note in sounding:
+            self.output.note_off(note)
+
+    def close(self):
+        self.closed.set()
+        if self.worker is not threading.current_thread():
+            self.worker.join(timeout=1)
@@ -0,0 +1,111 @@
+"""Sorting algorithms as resumable step generators.
+
+A step generator sorts ``numbers`` in place and yields ``(event, i, j)`` for
+each step. It is built from the algorithm of sorting_engine itself: the
+sort runs in a thread of its own and its ``on_step`` callback hands the
+steps over in batches of ``STEP_BATCH``. Once a batch has been handed over
+and the next one is full, the thread waits until the generator asks for
+more, so the sort never runs further ahead than that. A sort can thus be
+paused by simply not advancing its generator, resumed exactly where it
+stopped, advanced one step at a time or cancelled with ``close()``, which
+raises SortCancelled in the waiting sort. This is what
+scheduler.SortScheduler builds on.
+
+The events and counters are those of the engine by construction. The
+counters in ``stats`` are published by the sort as it goes, so they can be
+up to two batches ahead of the steps taken.
+"""
+import threading
+
+from sorting_engine import ALGORITHMS, SortCancelled, SortStats
+
+# Steps the sort hands over at once
+STEP_BATCH = 1024
+
+
+class StepProducer:
+    # Runs a sort in its own thread and collects its steps in batches
+    def __init__(self, algorithm, numbers, stats, batch_size=STEP_BATCH):
+        self.algorithm = algorithm
+        self.numbers = numbers
+        self.stats = stats
+        self.batch_size = batch_size
+        self.pending = []
+        self.condition = threading.Condition()
+        # The batch handed over and not taken yet
+        self.ready = None
+        self.finished = False
+        self.closed = False
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name="sort steps", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def run(self):
+        try:
+            self.algorithm(self.numbers, self.stats, self.on_step)
+            self.hand_over()
+        except SortCancelled:
+            pass
+        except BaseException as e:
+            self.error = e
+        with self.condition:
+            self.finished = True
+            self.condition.notify_all()
+
+    def on_step(self, event, i, j):
+        if self.closed:
+            raise SortCancelled()
+        self.pending.append((event, i, j))
+        if len(self.pending) >= self.batch_size:
+            self.hand_over()
+
+    def hand_over(self):
+        with self.condition:
+            while self.ready is not None and not self.closed:
+                self.condition.wait()
+            if self.closed:
+                raise SortCancelled()
+            self.ready = self.pending
+            self.condition.notify_all()
+        self.pending = []
+
+    def take(self):
+        # The next batch of steps, None once the sort is done
+        with self.condition:
+            while self.ready is None and not self.finished:
+                self.condition.wait()
+            batch = self.ready
+            self.ready = None
+            self.condition.notify_all()
+        if batch is None and self.error is not None:
+            raise self.error
+        return batch
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+def engine_steps(algorithm):
+    # Step generator function for an algorithm with the on_step interface of the engine
+    def steps(numbers, stats=None):
+        stats = stats if stats is not None else SortStats()
+        producer = StepProducer(algorithm, numbers, stats)
+        producer.start()
+        try:
+            while True:
+                batch = producer.take()
+                if batch is None:
+                    return
+                yield from batch
+        finally:
+            producer.close()
+    return steps
+
+
+def get_steps(algorithm_name):
+    # Step generator function for any algorithm of the registry
+    return engine_steps(ALGORITHMS[algorithm_name])
@@ -0,0 +1,154 @@
+"""Compact recording and replay of sorting steps.
+
+A ``SortTrace`` is passed to an algorithm as its ``on_step`` callback and
+stores every step in typed ``array`` buffers, so an algorithm can be recorded
+at full speed and animated afterwards. A ``TracePlayer`` applies the recorded
+steps to its own copy of the numbers, forwards or backwards.
+"""
+from array import array
+
+from sorting_engine import COMPARE, SWAP, WRITE, value_typecode
+
+
+class SortTrace:
+    def __init__(self, numbers, record_comparisons=True):
+        self.typecode = value_typecode(numbers)
+        self.initial = array(self.typecode, numbers)
+        # State of the numbers after the last recorded step
+        self.final = array(self.typecode, self.initial)
+        self.record_comparisons = record_comparisons
+
+        # One entry per step
+        self.events = array("B")
+        self.first = array("q")
+        # Second index for compares and swaps, position in the write tables for writes
+        self.second = array("q")
+
+        # One entry per write, so writes can be undone while seeking backwards
+        self.values = array(self.typecode)
+        self.old_values = array(self.typecode)
+
+    def __len__(self):
+        return len(self.events)
+
+    def record(self, event, i, j):
+        if event == COMPARE:
+            if not self.record_comparisons:
+                return
+            self.second.append(j)
+        elif event == SWAP:
+            final = self.final
+            final[i], final[j] = final[j], final[i]
+            self.second.append(j)
+        else:
+            self.second.append(len(self.values))
+            self.values.append(j)
+            self.old_values.append(self.final[i])
+            self.final[i] = j
+        self.events.append(event)
+        self.first.append(i)
+
+    def comparisons(self):
+        return self.events.count(COMPARE)
+
+    def last_indices(self):
+        # Indices of the most recently recorded step
+        if not self.events:
+            return []
+        if self.events[-1] == WRITE:
+            return [self.first[-1]]
+        return [self.first[-1], self.second[-1]]
+
+    def nbytes(self):
+        buffers = (self.initial, self.final, self.events, self.first, self.second, self.values, self.old_values)
+        return sum(len(buf) * buf.itemsize for buf in buffers)
+
+
+class TracePlayer:
+    def __init__(self, trace):
+        self.trace = trace
+        self.numbers = array(trace.typecode, trace.initial)
+        self.position = 0
+        # Counters of the steps applied so far
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+        # Indices of the most recently applied step
+        self.current_indices = []
+
+    def __len__(self):
+        return len(self.trace)
+
+    @property
+    def finished(self):
+        return self.position >= len(self.trace)
+
+    def step_indices(self, position):
+        trace = self.trace
+        event = trace.events[position]
+        if event == WRITE:
+            return [trace.first[position]]
+        return [trace.first[position], trace.second[position]]
+
+    def step(self, count=1):
+        # Apply the next count steps, return the set of indices whose value changed
+        trace = self.trace
+        events, first, second, values = trace.events, trace.first, trace.second, trace.values
+        numbers = self.numbers
+        end = min(self.position + count, len(trace))
+        touched = set()
+
+        for position in range(self.position, end):
+            event = events[position]
+            i = first[position]
+            if event == COMPARE:
+                self.comparisons += 1
+            elif event == SWAP:
+                j = second[position]
+                numbers[i], numbers[j] = numbers[j], numbers[i]
+                self.swaps += 1
+                touched.add(i)
+                touched.add(j)
+            else:
+                numbers[i] = values[second[position]]
+                self.writes += 1
+                touched.add(i)
+
+        if end > self.position:
+            self.current_indices = self.step_indices(end - 1)
+        self.position = end
+        return touched
+
+    def step_back(self, count=1):
+        # Undo the previous count steps, return the set of indices whose value changed
+        trace = self.trace
+        events, first, second, old_values = trace.events, trace.first, trace.second, trace.old_values
+        numbers = self.numbers
+        end = max(self.position - count, 0)
+        touched = set()
+
+        for position in range(self.position - 1, end - 1, -1):
+            event = events[position]
+            i = first[position]
+            if event == COMPARE:
+                self.comparisons -= 1
+            elif event == SWAP:
+                j = second[position]
+                numbers[i], numbers[j] = numbers[j], numbers[i]
+                self.swaps -= 1
+                touched.add(i)
+                touched.add(j)
+            else:
+                numbers[i] = old_values[second[position]]
+                self.writes -= 1
+                touched.add(i)
+
+        self.current_indices = self.step_indices(end - 1) if end > 0 else []
+        self.position = end
+        return touched
+
+    def seek(self, position):
+        position = max(0, min(position, len(self.trace)))
+        if position >= self.position:
+            return self.step(position - self.position)
+        return self.step_back(self.position - position)
@@ -0,0 +1,958 @@
+"""Headless sorting engine.
+
+The algorithms sort a list in place and have no dependency on wx. A consumer
+that wants to follow the sort (the GUI, a trace recorder, ...) passes an
+``on_step`` callback which is called as ``on_step(event, i, j)``:
+
+* ``COMPARE`` -- ``numbers[i]`` was compared with ``numbers[j]``
+* ``SWAP``    -- ``numbers[i]`` and ``numbers[j]`` were swapped
+* ``WRITE``   -- value ``j`` was written to ``numbers[i]``
+
+When no callback is given the algorithms only update plain counters.
+"""
+
+import math
+import random
+import time
+
+# Step event types
+COMPARE = 0
+SWAP = 1
+WRITE = 2
+
+
+def value_typecode(numbers):
+    # array typecode for the numbers: integers as 64-bit ints, anything else as doubles
+    if all(isinstance(num, int) for num in numbers):
+        return "q"
+    return "d"
+
+
+class SortCancelled(Exception):
+    # Raised by an on_step callback to abort a running sort
+    pass
+
+
+class SortStats:
+    # Metrics of one sort. The algorithms count in local variables and add them
+    # here in batches (per pass, merge or partition), and only the sorting thread
+    # writes to it, so other threads can sample it at any time without locking.
+    def __init__(self):
+        self.reset()
+
+    def add(self, comparisons=0, swaps=0, writes=0):
+        self.comparisons += comparisons
+        self.swaps += swaps
+        self.writes += writes
+
+    def enter(self, depth):
+        # Record the recursion (or explicit stack) depth reached
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def reset(self):
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+        self.max_depth = 0
+        self.start_time = None
+        self.end_time = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.end_time = None
+
+    def stop(self):
+        self.end_time = time.perf_counter()
+
+    @property
+    def operations(self):
+        return self.comparisons + self.swaps + self.writes
+
+    def elapsed(self):
+        if self.start_time is None:
+            return 0.0
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        return end_time - self.start_time
+
+    def ops_per_second(self):
+        elapsed = self.elapsed()
+        return self.operations / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self):
+        return {"comparisons": self.comparisons, "swaps": self.swaps, "writes": self.writes,
+                "max_depth": self.max_depth}
+
+    def snapshot(self):
+        # Counters plus timing, for display or reports
+        snapshot = self.as_dict()
+        snapshot["elapsed"] = self.elapsed()
+        snapshot["ops_per_second"] = self.ops_per_second()
+        return snapshot
+
+
+def add_stats(stats, result):
+    # Add the counters of an as_dict() result, from a worker process, to stats
+    stats.add(result["comparisons"], result["swaps"], result["writes"])
+    stats.enter(result.get("max_depth", 0))
+
+
+def bubble_sort(numbers, stats=None, on_step=None):
+    stats = stats if stats is not None else SortStats()
+    n = len(numbers)
+    comparisons = swaps = 0
+    try:
+        for i in range(n):
+            # Flag to check if any swaps were made in this pass
+            swapped = False
+
+            for j in range(n - i - 1):
+                comparisons += 1
+                if on_step is not None:
+                    on_step(COMPARE, j, j + 1)
+                if numbers[j] > numbers[j + 1]:
+                    numbers[j], numbers[j + 1] = numbers[j + 1], numbers[j]
+                    swaps += 1
+                    swapped = True
+                    if on_step is not None:
+                        on_step(SWAP, j, j + 1)
+
+            # Publish the counters once per pass
+            stats.add(comparisons, swaps)
+            comparisons = swaps = 0
+
+            # If no swaps were made in this pass, the list is already sorted
+            if not swapped:
+                break
+    finally:
+        stats.add(comparisons, swaps)
+    return numbers
+
+
+def selection_sort(numbers, stats=None, on_step=None):
+    stats = stats if stats is not None else SortStats()
+    n = len(numbers)
+    comparisons = swaps = 0
+    try:
+        for i in range(n - 1):
+            min_idx = i
+
+            for j in range(i + 1, n):
+                comparisons += 1
+                if on_step is not None:
+                    on_step(COMPARE, j, min_idx)
+                if numbers[j] < numbers[min_idx]:
+                    min_idx = j
+
+            if min_idx != i:
+                numbers[i], numbers[min_idx] = numbers[min_idx], numbers[i]
+                swaps += 1
+                if on_step is not None:
+                    on_step(SWAP, i, min_idx)
+
+            # Publish the counters once per pass
+            stats.add(comparisons, swaps)
+            comparisons = swaps = 0
+    finally:
+        stats.add(comparisons, swaps)
+    return numbers
+
+
+def insertion_sort_range(arr, low, high, stats, on_step=None):
+    # Insertion sort of arr[low..high], the counters are added to stats per inserted element
+    comparisons = writes = 0
+    try:
+        for i in range(low + 1, high + 1):
+            key = arr[i]
+            j = i - 1
+
+            while j >= low:
+                comparisons += 1
+                if on_step is not None:
+                    on_step(COMPARE, j, j + 1)
+                if arr[j] <= key:
+                    break
+                # Shift the bigger element one position to the right
+                arr[j + 1] = arr[j]
+                writes += 1
+                if on_step is not None:
+                    on_step(WRITE, j + 1, arr[j])
+                j -= 1
+
+            if j + 1 != i:
+                arr[j + 1] = key
+                writes += 1
+                if on_step is not None:
+                    on_step(WRITE, j + 1, key)
+
+            # Publish the counters once per inserted element
+            stats.add(comparisons, 0, writes)
+            comparisons = writes = 0
+    finally:
+        stats.add(comparisons, 0, writes)
+
+
+def insertion_sort(numbers, stats=None, on_step=None):
+    stats = stats if stats is not None else SortStats()
+    insertion_sort_range(numbers, 0, len(numbers) - 1, stats, on_step)
+    return numbers
+
+
+# Runs up to this length are sorted by insertion sort in the bottom-up merge sort
+MERGE_SORT_CUTOFF = 16
+
+
+def merge_sort(numbers, stats=None, on_step=None, bottom_up=False, cutoff=0, skip_ordered=False):
+    # Merges copy only the left run out, into one scratch list allocated per sort, and merge it
+    # with the right run where it is. bottom_up merges runs of doubling width without recursion,
+    # cutoff sorts runs up to that length by insertion sort first and skip_ordered does not merge
+    # two runs whose last and first elements are already in order.
+    stats = stats if stats is not None else SortStats()
+    n = len(numbers)
+    arr = numbers
+    # The plain top-down merge also writes the rest of the right run, which is already in place,
+    # so its counters and steps stay those of the textbook merge (and of sort_steps)
+    write_rest = not (bottom_up or cutoff or skip_ordered)
+
+    if bottom_up:
+        # The widest left run is the largest run width below n
+        width = max(cutoff, 1)
+        while width * 2 < n:
+            width *= 2
+        scratch = [None] * min(width, n)
+    else:
+        scratch = [None] * ((n + 1) // 2)
+
+    def merge(l, m, r):
+        if skip_ordered:
+            stats.add(1)
+            if on_step is not None:
+                on_step(COMPARE, m, m + 1)
+            if arr[m] <= arr[m + 1]:
+                return
+
+        n1 = m - l + 1
+        for t in range(n1):
+            scratch[t] = arr[l + t]
+        comparisons = writes = 0
+
+        i = 0
+        j = m + 1
+        k = l
+        try:
+            while i < n1 and j <= r:
+                comparisons += 1
+                if on_step is not None:
+                    on_step(COMPARE, l + i, j)
+                if scratch[i] <= arr[j]:
+                    arr[k] = scratch[i]
+                    i += 1
+                else:
+                    arr[k] = arr[j]
+                    j += 1
+                writes += 1
+                if on_step is not None:
+                    on_step(WRITE, k, arr[k])
+                k += 1
+
+            # Copy whatever is left of the left run
+            while i < n1:
+                arr[k] = scratch[i]
+                writes += 1
+                if on_step is not None:
+                    on_step(WRITE, k, arr[k])
+                i += 1
+                k += 1
+
+            if write_rest:
+                while j <= r:
+                    writes += 1
+                    if on_step is not None:
+                        on_step(WRITE, k, arr[k])
+                    j += 1
+                    k += 1
+        finally:
+            stats.add(comparisons, 0, writes)
+
+    def merge_sort_helper(l, r, depth):
+        if r - l < cutoff:
+            insertion_sort_range(arr, l, r, stats, on_step)
+        elif l < r:
+            stats.enter(depth)
+            m = (l + r) // 2
+            merge_sort_helper(l, m, depth + 1)
+            merge_sort_helper(m + 1, r, depth + 1)
+            merge(l, m, r)
+
+    if not bottom_up:
+        merge_sort_helper(0, n - 1, 1)
+        return numbers
+
+    width = 1
+    if cutoff > 1:
+        width = cutoff
+        for low in range(0, n, cutoff):
+            insertion_sort_range(arr, low, min(low + cutoff, n) - 1, stats, on_step)
+    while width < n:
+        for l in range(0, n - width, 2 * width):
+            merge(l, l + width - 1, min(l + 2 * width, n) - 1)
+        width *= 2
+    return numbers
+
+
+def bottom_up_merge_sort(numbers, stats=None, on_step=None):
+    return merge_sort(numbers, stats, on_step, bottom_up=True, cutoff=MERGE_SORT_CUTOFF, skip_ordered=True)
+
+
+def quick_sort(numbers, stats=None, on_step=None):
+    stats = stats if stats is not None else SortStats()
+
+    def partition(arr, low, high):
+        i = low - 1
+        pivot = arr[high]
+        comparisons = swaps = 0
+
+        try:
+            for j in range(low, high):
+                comparisons += 1
+                if on_step is not None:
+                    on_step(COMPARE, j, high)
+                if arr[j] <= pivot:
+                    i = i + 1
+                    if i != j:
+                        arr[i], arr[j] = arr[j], arr[i]
+                        swaps += 1
+                        if on_step is not None:
+                            on_step(SWAP, i, j)
+
+            if i + 1 != high:
+                arr[i + 1], arr[high] = arr[high], arr[i + 1]
+                swaps += 1
+                if on_step is not None:
+                    on_step(SWAP, i + 1, high)
+        finally:
+            stats.add(comparisons, swaps)
+        return i + 1
+
+    def quick_sort_helper(arr, low, high, depth):
+        if low < high:
+            stats.enter(depth)
+            pi = partition(arr, low, high)
+            quick_sort_helper(arr, low, pi - 1, depth + 1)
+            quick_sort_helper(arr, pi + 1, high, depth + 1)
+
+    quick_sort_helper(numbers, 0, len(numbers) - 1, 1)
+    return numbers
+
+
+# Pivot strategies of intro_sort
+PIVOT_STRATEGIES = ["median-of-three", "ninther", "random", "last"]
+
+
+def median_of_three(arr, i, j, k, on_step=None):
+    # Index of the median of arr[i], arr[j] and arr[k], and the comparisons it took
+    if on_step is not None:
+        on_step(COMPARE, i, j)
+    if arr[i] > arr[j]:
+        i, j = j, i
+    # Now arr[i] <= arr[j]
+    if on_step is not None:
+        on_step(COMPARE, j, k)
+    if arr[j] <= arr[k]:
+        return j, 2
+    if on_step is not None:
+        on_step(COMPARE, i, k)
+    if arr[i] <= arr[k]:
+        return k, 3
+    return i, 3
+
+
+def sort_three(arr, i, j, k, on_step=None):
+    # Order arr[i] <= arr[j] <= arr[k] in place, returns the comparisons and swaps it took
+    comparisons = swaps = 0
+    for a, b in ((i, j), (j, k), (i, j)):
+        comparisons += 1
+        if on_step is not None:
+            on_step(COMPARE, a, b)
+        if arr[b] < arr[a]:
+            arr[a], arr[b] = arr[b], arr[a]
+            swaps += 1
+            if on_step is not None:
+                on_step(SWAP, a, b)
+    return comparisons, swaps
+
+
+def choose_pivot(arr, low, high, strategy, rng, on_step=None):
+    # Index of the pivot for arr[low..high], and the comparisons and swaps it took
+    if strategy == "last":
+        return high, 0, 0
+    if strategy == "random":
+        return rng.randint(low, high), 0, 0
+
+    mid = (low + high) // 2
+    if high - low < 2:
+        return median_of_three(arr, low, mid, high, on_step) + (0,)
+    # The samples are put in order in place, which turns reversed runs around and keeps
+    # the pivots of sorted and reversed input in the middle
+    comparisons, swaps = sort_three(arr, low, mid, high, on_step)
+    if strategy == "ninther" and high - low >= 40:
+        # Tukey's ninther: the median of the medians of three spread out triples
+        step = (high - low) // 8
+        a, c1 = median_of_three(arr, low, low + step, low + 2 * step, on_step)
+        b, c2 = median_of_three(arr, mid - step, mid, mid + step, on_step)
+        c, c3 = median_of_three(arr, high - 2 * step, high - step, high, on_step)
+        pivot, c4 = median_of_three(arr, a, b, c, on_step)
+        return pivot, comparisons + c1 + c2 + c3 + c4, swaps
+    return mid, comparisons, swaps
+
+
+def sift_down(arr, base, root, size, on_step=None):
+    # Restore the max-heap below root for the heap stored in arr[base:base + size],
+    # return the comparisons and swaps it took
+    comparisons = swaps = 0
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            break
+        if child + 1 < size:
+            comparisons += 1
+            if on_step is not None:
+                on_step(COMPARE, base + child, base + child + 1)
+            if arr[base + child] < arr[base + child + 1]:
+                child += 1
+
+        comparisons += 1
+        if on_step is not None:
+            on_step(COMPARE, base + root, base + child)
+        if arr[base + root] >= arr[base + child]:
+            break
+
+        arr[base + root], arr[base + child] = arr[base + child], arr[base + root]
+        swaps += 1
+        if on_step is not None:
+            on_step(SWAP, base + root, base + child)
+        root = child
+    return comparisons, swaps
+
+
+def heap_sort_range(arr, low, high, stats, on_step=None):
+    # Heap sort arr[low..high], the counters are added to stats per sift
+    size = high - low + 1
+
+    for root in range(size // 2 - 1, -1, -1):
+        stats.add(*sift_down(arr, low, root, size, on_step))
+
+    for end in range(size - 1, 0, -1):
+        # Move the biggest element behind the heap
+        arr[low], arr[low + end] = arr[low + end], arr[low]
+        if on_step is not None:
+            on_step(SWAP, low, low + end)
+        comparisons, swaps = sift_down(arr, low, 0, end, on_step)
+        stats.add(comparisons, swaps + 1)
+
+
+def intro_sort(numbers, stats=None, on_step=None, pivot="median-of-three", rng=None):
+    # Quick sort without recursion: three-way Bentley-McIlroy partitions around the chosen pivot, an
+    # explicit stack that always continues with the smaller side, and heap sort for
+    # ranges that are still unsorted after 2*log2(n) partitions
+    if pivot not in PIVOT_STRATEGIES:
+        raise ValueError(f"Unknown pivot strategy: {pivot}")
+    stats = stats if stats is not None else SortStats()
+    rng = rng if rng is not None else random.Random()
+    n = len(numbers)
+    if n < 2:
+        return numbers
+
+    arr = numbers
+    comparisons = swaps = 0
+
+    def swap(a, b):
+        nonlocal swaps
+        if a != b:
+            arr[a], arr[b] = arr[b], arr[a]
+            swaps += 1
+            if on_step is not None:
+                on_step(SWAP, a, b)
+
+    stack = [(0, n - 1, 2 * int(math.log2(n)))]
+    try:
+        while stack:
+            low, high, depth = stack.pop()
+
+            while low < high:
+                if depth == 0:
+                    heap_sort_range(arr, low, high, stats, on_step)
+                    break
+                depth -= 1
+                stats.enter(len(stack) + 1)
+
+                p, c, s = choose_pivot(arr, low, high, pivot, rng, on_step)
+                comparisons += c
+                swaps += s
+                if p != low:
+                    arr[low], arr[p] = arr[p], arr[low]
+                    swaps += 1
+                    if on_step is not None:
+                        on_step(SWAP, low, p)
+                pivot_value = arr[low]
+
+                # Bentley-McIlroy partition: scan from both ends like Hoare and park the keys
+                # equal to the pivot at the ends. Runs that are already in order stay in order,
+                # so median-of-three keeps finding good pivots on sorted and reversed input.
+                i, j = low, high + 1
+                p, q = low, high + 1
+                while True:
+                    while True:
+                        i += 1
+                        comparisons += 1
+                        if on_step is not None:
+                            on_step(COMPARE, i, low)
+                        if not arr[i] < pivot_value or i == high:
+                            break
+                    while True:
+                        j -= 1
+                        comparisons += 1
+                        if on_step is not None:
+                            on_step(COMPARE, low, j)
+                        # arr[low] is the pivot and stops the scan
+                        if not pivot_value < arr[j]:
+                            break
+                    if i == j:
+                        comparisons += 1
+                        if on_step is not None:
+                            on_step(COMPARE, i, low)
+                        if arr[i] == pivot_value:
+                            p += 1
+                            swap(p, i)
+                    if i >= j:
+                        break
+                    swap(i, j)
+                    comparisons += 2
+                    if on_step is not None:
+                        on_step(COMPARE, i, low)
+                    if arr[i] == pivot_value:
+                        p += 1
+                        swap(p, i)
+                    if on_step is not None:
+                        on_step(COMPARE, j, low)
+                    if arr[j] == pivot_value:
+                        q -= 1
+                        swap(q, j)
+
+                # Move the parked keys equal to the pivot from the ends into the middle
+                i = j + 1
+                for k in range(low, p + 1):
+                    swap(k, j)
+                    j -= 1
+                for k in range(high, q - 1, -1):
+                    swap(k, i)
+                    i += 1
+                # arr[low..lt-1] < pivot, arr[lt..gt] == pivot, arr[gt+1..high] > pivot
+                lt, gt = j + 1, i - 1
+
+                # Publish the counters once per partition
+                stats.add(comparisons, swaps)
+                comparisons = swaps = 0
+
+                # Keep the bigger side for later and continue with the smaller one
+                if lt - low < high - gt:
+                    stack.append((gt + 1, high, depth))
+                    high = lt - 1
+                else:
+                    stack.append((low, lt - 1, depth))
+                    low = gt + 1
+    finally:
+        stats.add(comparisons, swaps)
+    return numbers
+
+
+def heap_sort(numbers, stats=None, on_step=None):
+    stats = stats if stats is not None else SortStats()
+    if len(numbers) > 1:
+        heap_sort_range(numbers, 0, len(numbers) - 1, stats, on_step)
+    return numbers
+
+
+# Consecutive wins of one run after which tim_sort starts galloping
+MIN_GALLOP = 7
+
+
+def min_run_length(n):
+    # Between 32 and 64 so that n / min_run is a power of two or slightly less
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def gallop(key, seq, start, end, right, on_step=None, key_index=0, index_base=0):
+    # How many leading elements of seq[start:end] are < key (<= key when right),
+    # found by exponential and then binary search. Returns the count and the comparisons.
+    # Step events report seq[start + x] as index_base + x and the key as key_index.
+    n = end - start
+    comparisons = 0
+    last = 0
+    offset = 1
+    while offset <= n:
+        comparisons += 1
+        if on_step is not None:
+            on_step(COMPARE, key_index, index_base + offset - 1)
+        value = seq[start + offset - 1]
+        if value <= key if right else value < key:
+            last = offset
+            offset *= 2
+        else:
+            break
+
+    low = last
+    high = offset - 1 if offset <= n else n
+    while low < high:
+        mid = (low + high + 1) // 2
+        comparisons += 1
+        if on_step is not None:
+            on_step(COMPARE, key_index, index_base + mid - 1)
+        value = seq[start + mid - 1]
+        if value <= key if right else value < key:
+            low = mid
+        else:
+            high = mid - 1
+    return low, comparisons
+
+
+def tim_sort(numbers, stats=None, on_step=None):
+    # Natural merge sort in the style of Timsort: ascending/descending runs are
+    # found and extended to min_run with binary insertion sort, a stack of runs is
+    # merged while keeping the run lengths balanced, and merges gallop when one
+    # run keeps winning
+    stats = stats if stats is not None else SortStats()
+    arr = numbers
+    n = len(arr)
+    counts = [0, 0, 0]  # comparisons, swaps, writes
+
+    def write(k, value):
+        arr[k] = value
+        counts[2] += 1
+        if on_step is not None:
+            on_step(WRITE, k, value)
+
+    def compare(i, j):
+        counts[0] += 1
+        if on_step is not None:
+            on_step(COMPARE, i, j)
+
+    def count_run(lo):
+        # Length of the run starting at lo, descending runs are reversed in place
+        hi = lo + 1
+        if hi == n:
+            return 1
+        compare(hi, lo)
+        if arr[hi] < arr[lo]:
+            # Strictly descending, so reversing keeps the sort stable
+            hi += 1
+            while hi < n:
+                compare(hi, hi - 1)
+                if not arr[hi] < arr[hi - 1]:
+                    break
+                hi += 1
+            i, j = lo, hi - 1
+            while i < j:
+                arr[i], arr[j] = arr[j], arr[i]
+                counts[1] += 1
+                if on_step is not None:
+                    on_step(SWAP, i, j)
+                i += 1
+                j -= 1
+        else:
+            hi += 1
+            while hi < n:
+                compare(hi, hi - 1)
+                if arr[hi] < arr[hi - 1]:
+                    break
+                hi += 1
+        return hi - lo
+
+    def binary_insertion_sort(lo, hi, start):
+        # arr[lo:start] is sorted, insert arr[start:hi] into it
+        for i in range(start, hi):
+            key = arr[i]
+            left, right = lo, i
+            while left < right:
+                mid = (left + right) // 2
+                compare(i, mid)
+                if key < arr[mid]:
+                    right = mid
+                else:
+                    left = mid + 1
+            for k in range(i, left, -1):
+                write(k, arr[k - 1])
+            if left != i:
+                write(left, key)
+
+    def merge(lo, mid, hi):
+        # Elements of the left run that are <= the first right element are already in place
+        skip, c = gallop(arr[mid], arr, lo, mid, True, on_step, mid, lo)
+        counts[0] += c
+        lo += skip
+        if lo == mid:
+            return
+        # Likewise elements of the right run that are >= the last left element
+        keep, c = gallop(arr[mid - 1], arr, mid, hi, False, on_step, mid - 1, mid)
+        counts[0] += c
+        hi = mid + keep
+
+        left = arr[lo:mid]
+        n1 = len(left)
+        i, j, k = 0, mid, lo
+        min_gallop = MIN_GALLOP
+        while i < n1 and j < hi:
+            # One element at a time until one run wins min_gallop times in a row
+            left_wins = right_wins = 0
+            while i < n1 and j < hi:
+                compare(k, j)
+                if arr[j] < left[i]:
+                    write(k, arr[j])
+                    j += 1
+                    right_wins += 1
+                    left_wins = 0
+                else:
+                    write(k, left[i])
+                    i += 1
+                    left_wins += 1
+                    right_wins = 0
+                k += 1
+                if left_wins >= min_gallop or right_wins >= min_gallop:
+                    break
+
+            # Galloping: copy whole stretches of one run at a time
+            while i < n1 and j < hi:
+                count, c = gallop(arr[j], left, i, n1, True, on_step, j, k)
+                counts[0] += c
+                for value in left[i:i + count]:
+                    write(k, value)
+                    k += 1
+                i += count
+                if i >= n1:
+                    break
+
+                count2, c = gallop(left[i], arr, j, hi, False, on_step, k, j)
+                counts[0] += c
+                for _ in range(count2):
+                    write(k, arr[j])
+                    k += 1
+                    j += 1
+                if j >= hi:
+                    break
+
+                if count < MIN_GALLOP and count2 < MIN_GALLOP:
+                    # Galloping does not pay off here
+                    min_gallop += 1
+                    break
+                min_gallop = max(1, min_gallop - 1)
+
+        # What is left of the right run is already in place
+        while i < n1:
+            write(k, left[i])
+            i += 1
+            k += 1
+
+    def flush():
+        stats.add(*counts)
+        counts[:] = [0, 0, 0]
+
+    def merge_at(runs, index):
+        base, length = runs[index]
+        length2 = runs[index + 1][1]
+        runs[index] = (base, length + length2)
+        del runs[index + 1]
+        merge(base, base + length, base + length + length2)
+        flush()
+
+    def merge_collapse(runs):
+        # Keep len(A) > len(B) + len(C) and len(B) > len(C) for the top runs A, B, C
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if (i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]) or \
+                    (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1]):
+                if runs[i - 1][1] < runs[i + 1][1]:
+                    i -= 1
+                merge_at(runs, i)
+            elif runs[i][1] <= runs[i + 1][1]:
+                merge_at(runs, i)
+            else:
+                break
+
+    try:
+        if n > 1:
+            min_run = min_run_length(n)
+            runs = []
+            lo = 0
+            while lo < n:
+                length = count_run(lo)
+                if length < min_run:
+                    # Extend short runs with binary insertion sort
+                    forced = min(min_run, n - lo)
+                    binary_insertion_sort(lo, lo + forced, lo + length)
+                    length = forced
+                runs.append((lo, length))
+                stats.enter(len(runs))
+                flush()
+                merge_collapse(runs)
+                lo += length
+
+            while len(runs) > 1:
+                i = len(runs) - 2
+                if i > 0 and runs[i - 1][1] < runs[i + 1][1]:
+                    i -= 1
+                merge_at(runs, i)
+    finally:
+        flush()
+    return numbers
+
+
+# Bits of the key handled per pass of radix_sort
+RADIX_BITS = 8
+
+# Largest range of values counting_sort allocates counters for
+COUNTING_SORT_MAX_RANGE = 1 << 24
+
+
+def check_integers(numbers, name):
+    if not all(isinstance(num, int) for num in numbers):
+        raise TypeError(f"{name} can only sort integers")
+
+
+def radix_sort(numbers, stats=None, on_step=None):
+    # LSD radix sort on the value minus the minimum, RADIX_BITS per pass
+    stats = stats if stats is not None else SortStats()
+    check_integers(numbers, "Radix Sort")
+    n = len(numbers)
+    if n < 2:
+        return numbers
+
+    minimum = min(numbers)
+    bits = (max(numbers) - minimum).bit_length()
+    buckets = 1 << RADIX_BITS
+    mask = buckets - 1
+    writes = 0
+    try:
+        for shift in range(0, bits, RADIX_BITS):
+            counts = [0] * (buckets + 1)
+            for num in numbers:
+                counts[((num - minimum) >> shift & mask) + 1] += 1
+
+            # A digit that is the same everywhere does not change the order
+            if max(counts) == n:
+                continue
+
+            for d in range(buckets):
+                counts[d + 1] += counts[d]
+
+            output = [0] * n
+            for num in numbers:
+                digit = (num - minimum) >> shift & mask
+                output[counts[digit]] = num
+                counts[digit] += 1
+
+            for k in range(n):
+                numbers[k] = output[k]
+                writes += 1
+                if on_step is not None:
+                    on_step(WRITE, k, output[k])
+
+            # Publish the counters once per pass
+            stats.add(0, 0, writes)
+            writes = 0
+    finally:
+        stats.add(0, 0, writes)
+    return numbers
+
+
+def counting_sort(numbers, stats=None, on_step=None):
+    stats = stats if stats is not None else SortStats()
+    check_integers(numbers, "Counting Sort")
+    n = len(numbers)
+    if n < 2:
+        return numbers
+
+    minimum = min(numbers)
+    value_range = max(numbers) - minimum + 1
+    if value_range > COUNTING_SORT_MAX_RANGE:
+        raise ValueError(f"Counting Sort needs a range of at most {COUNTING_SORT_MAX_RANGE} values, got {value_range}")
+
+    counts = [0] * value_range
+    for num in numbers:
+        counts[num - minimum] += 1
+
+    writes = 0
+    try:
+        k = 0
+        for offset, count in enumerate(counts):
+            value = minimum + offset
+            for _ in range(count):
+                numbers[k] = value
+                writes += 1
+                if on_step is not None:
+                    on_step(WRITE, k, value)
+                k += 1
+    finally:
+        stats.add(0, 0, writes)
+    return numbers
+
+
+def parallel_merge_sort(numbers, stats=None, on_step=None):
+    # Imported here so the engine itself does not pull in multiprocessing
+    from parallel_sort import parallel_sort
+    return parallel_sort(numbers, merge_sort, stats, on_step)
+
+
+def parallel_quick_sort(numbers, stats=None, on_step=None):
+    # The buckets are sorted by the iterative intro sort, large sorted or duplicate-heavy
+    # buckets would exhaust the recursion of quick_sort
+    from parallel_sort import parallel_sort
+    return parallel_sort(numbers, intro_sort, stats, on_step)
+
+
+# Sorting algorithms registry, in the order they are shown in the GUI
+ALGORITHMS = {
+    "Bubble Sort": bubble_sort,
+    "Selection Sort": selection_sort,
+    "Quick Sort": quick_sort,
+    "Insertion Sort": insertion_sort,
+    "Merge Sort": merge_sort,
+    "Bottom-Up Merge Sort": bottom_up_merge_sort,
+    "Intro Sort": intro_sort,
+    "Heap Sort": heap_sort,
+    "Tim Sort": tim_sort,
+    "Radix Sort": radix_sort,
+    "Counting Sort": counting_sort,
+    "Parallel Merge Sort": parallel_merge_sort,
+    "Parallel Quick Sort": parallel_quick_sort
+}
+
+# Algorithms of the registry that are O(n^2) on average, tools skip them or stop them earlier on large inputs
+QUADRATIC_ALGORITHMS = {"Bubble Sort", "Selection Sort", "Insertion Sort"}
+
+
+# Implementations of the registry: plain lists or NumPy arrays (numpy_backend)
+BACKENDS = ["python", "numpy"]
+
+
+def get_algorithms(backend="python"):
+    if backend == "numpy":
+        # Imported here so NumPy stays an optional dependency
+        from numpy_backend import ALGORITHMS as NUMPY_ALGORITHMS
+        return NUMPY_ALGORITHMS
+    if backend != "python":
+        raise ValueError(f"Unknown backend: {backend}")
+    return ALGORITHMS
+
+
+def sort(numbers, algorithm_name, stats=None, on_step=None, backend="python"):
+    # Sort a copy of the numbers with the named algorithm, timing it in stats
+    stats = stats if stats is not None else SortStats()
+    stats.start()
+    try:
+        return get_algorithms(backend)[algorithm_name](list(numbers), stats, on_step)
+    finally:
+        stats.stop()
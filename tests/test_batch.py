@@ -0,0 +1,66 @@
+import io
+import os
+import random
+import unittest
+from array import array
+from unittest import mock
+
+import batch
+from batch import BatchSorter, choose_algorithm, read_arrays, sort_batch
+
+
+def shared_blocks():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+class BatchSorterTest(unittest.TestCase):
+    def arrays(self):
+        rng = random.Random(5)
+        arrays = []
+        for index in range(300):
+            size = rng.choice((0, 1, 5, 40, 700))
+            if index % 3 == 0:
+                arrays.append([rng.random() for _ in range(size)])
+            else:
+                arrays.append(array("q", (rng.randint(-1000, 1000) for _ in range(size))))
+        return arrays
+
+    def test_results_in_input_order(self):
+        arrays = self.arrays()
+        for executor in batch.EXECUTORS:
+            with self.subTest(executor=executor):
+                # Few tasks in flight, so results of later tasks can finish first
+                with mock.patch.object(batch, "TASK_JOBS", 7):
+                    results = sort_batch(iter(arrays), workers=2, executor=executor)
+                self.assertEqual([result["index"] for result in results], list(range(len(arrays))))
+                for numbers, result in zip(arrays, results):
+                    self.assertIsNone(result["error"])
+                    self.assertEqual(result["algorithm"], choose_algorithm(numbers))
+                    self.assertEqual(list(result["numbers"]), sorted(numbers))
+
+    def test_unreadable_lines_keep_their_place(self):
+        results = sort_batch(read_arrays(io.StringIO("3 1 2\n1,,3\n\n2.5 0.5\n")), workers=1, executor="thread")
+        self.assertEqual([None if result["numbers"] is None else list(result["numbers"]) for result in results],
+                         [[1, 2, 3], None, [], [0.5, 2.5]])
+        self.assertEqual(results[1]["error"], "Value 2: '' is not a number")
+
+    @unittest.skipUnless(os.path.isdir("/dev/shm"), "needs /dev/shm")
+    def test_shared_memory_is_freed(self):
+        rng = random.Random(6)
+        arrays = [array("q", (rng.randint(0, 10 ** 9) for _ in range(3000))) for _ in range(12)]
+        before = shared_blocks()
+        with mock.patch.object(batch, "SHARED_MEMORY_SIZE", 1000):
+            with BatchSorter(workers=2) as sorter:
+                results = list(sorter.sort(arrays))
+                self.assertEqual([list(result["numbers"]) for result in results], [sorted(a) for a in arrays])
+                self.assertEqual(shared_blocks(), before)
+
+                # Stopped after the first result, the blocks of the queued tasks are freed too
+                results = sorter.sort(arrays)
+                next(results)
+                results.close()
+                self.assertEqual(shared_blocks(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import threading
+import unittest
+from array import array
+
+from channel import SnapshotChannel
+
+
+class SnapshotChannelTest(unittest.TestCase):
+    def test_newest_frame_wins(self):
+        notified = []
+        channel = SnapshotChannel([0, 0, 0], on_publish=lambda: notified.append(True))
+        self.assertIsNone(channel.consume())
+        self.assertTrue(channel.publish([1, 2, 3], [0], 10))
+        # Too soon after the last frame
+        self.assertFalse(channel.publish([9, 9, 9]))
+        self.assertTrue(channel.publish([3, 2, 1], [1, 2], 20, force=True))
+        self.assertEqual(len(notified), 1)
+        self.assertEqual(channel.dropped, 1)
+
+        frame = channel.consume()
+        self.assertEqual((frame.numbers, frame.highlighted, frame.position, frame.sequence), ([3, 2, 1], [1, 2], 20, 2))
+        self.assertIsNone(channel.consume())
+        channel.publish([4, 5, 6], force=True)
+        self.assertEqual(len(notified), 2)
+
+    def test_frames_are_copies(self):
+        numbers = array("q", [5, 6])
+        channel = SnapshotChannel(numbers)
+        channel.publish(numbers, force=True)
+        numbers[0] = 0
+        frame = channel.consume()
+        self.assertEqual(frame.numbers, array("q", [5, 6]))
+        self.assertIsNot(frame.numbers, numbers)
+
+    def test_consumer_never_sees_a_torn_frame(self):
+        size = 2000
+        channel = SnapshotChannel([0] * size, interval=0)
+        done = threading.Event()
+
+        def produce():
+            for value in range(1, 3000):
+                channel.publish([value] * size)
+            done.set()
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        last = 0
+        while not done.is_set() or channel.fresh:
+            frame = channel.consume()
+            if frame is not None:
+                self.assertEqual(frame.numbers, [frame.numbers[0]] * size)
+                self.assertGreater(frame.sequence, last)
+                last = frame.sequence
+        producer.join()
+        self.assertEqual(last, channel.published)
+
+
+if __name__ == "__main__":
+    unittest.main()
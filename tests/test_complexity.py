@@ -0,0 +1,44 @@
+import math
+import unittest
+
+from complexity import analyse, fit, geometric_sizes, prefix_source, summary
+
+
+class FitTest(unittest.TestCase):
+    def test_exact_models(self):
+        sizes = geometric_sizes(4096)
+        self.assertEqual(sizes, [16, 32, 64, 128, 256, 512, 1024, 2048, 4096])
+        for model, values in [("n", [3 * n for n in sizes]),
+                              ("n log n", [2 * n * math.log2(n) for n in sizes]),
+                              ("n^2", [n * n / 2 for n in sizes])]:
+            with self.subTest(model=model):
+                fitted = fit(sizes, values)
+                self.assertEqual(fitted["model"], model)
+                self.assertGreater(fitted["confidence"], 0.9)
+
+    def test_too_few_points(self):
+        self.assertIsNone(fit([16], [10]))
+        self.assertIsNone(fit([16, 32], [0, 10]))
+        self.assertLess(fit([16, 32], [16, 32])["confidence"], 0.5)
+
+
+class AnalyseTest(unittest.TestCase):
+    def test_quick_sort_goes_quadratic_on_sorted_input(self):
+        sizes = geometric_sizes(256)
+        result = analyse("Quick Sort", prefix_source(list(range(256))), sizes, repeat=1)
+        self.assertEqual((result["model"], result["deviation"]), ("n^2", "worse"))
+        self.assertIn("worse than the expected O(n log n)", summary(result))
+
+        result = analyse("Merge Sort", prefix_source(list(range(256, 0, -1))), sizes, repeat=1)
+        self.assertEqual((result["model"], result["deviation"]), ("n log n", None))
+
+    def test_failure_keeps_the_measurements_before_it(self):
+        numbers = [0.5] * 64
+        result = analyse("Radix Sort", prefix_source(numbers), geometric_sizes(64), repeat=1)
+        self.assertIn("TypeError at n = 16", result["error"])
+        self.assertEqual(result["measurements"], [])
+        self.assertIsNone(result["model"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import datasets
+from datasets import DISTRIBUTIONS, generate, get_dataset
+from sorting_engine import ALGORITHMS, SortStats
+
+
+def inversions(numbers):
+    return sum(1 for i in range(len(numbers)) for j in range(i + 1, len(numbers)) if numbers[i] > numbers[j])
+
+
+class GenerateTest(unittest.TestCase):
+    def test_seeded(self):
+        for distribution in DISTRIBUTIONS:
+            with self.subTest(distribution=distribution):
+                numbers = generate(distribution, 500, seed=3)
+                self.assertEqual(numbers.typecode, "q")
+                self.assertEqual(len(numbers), 500)
+                self.assertEqual(numbers, generate(distribution, 500, seed=3))
+        self.assertNotEqual(generate("uniform", 500, seed=3), generate("uniform", 500, seed=4))
+
+    def test_shapes(self):
+        self.assertEqual(sorted(generate("permutation", 300)), list(range(1, 301)))
+        self.assertEqual(inversions(generate("nearly-sorted", 300)), 3)
+        self.assertEqual(generate("random", 100), generate("uniform", 100))
+        with self.assertRaisesRegex(ValueError, "Unknown distribution"):
+            generate("bell", 10)
+
+    def test_quicksort_killer(self):
+        # The adversary drives intro_sort into its heap sort fallback
+        size = 2000
+        killer = SortStats()
+        ALGORITHMS["Intro Sort"](list(generate("quicksort-killer", size)), killer)
+        shuffled = SortStats()
+        ALGORITHMS["Intro Sort"](list(generate("permutation", size)), shuffled)
+        self.assertGreater(killer.comparisons, 1.5 * shuffled.comparisons)
+
+
+class GetDatasetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(datasets.memory_cache.clear)
+        datasets.memory_cache.clear()
+
+    def test_copies_and_disk_cache(self):
+        size = datasets.DISK_CACHE_MIN_SIZE
+        numbers = get_dataset("zipf", size, seed=2, cache_dir=self.tmp.name)
+        self.assertEqual(numbers, generate("zipf", size, seed=2))
+        numbers[0] = -1
+        self.assertNotEqual(get_dataset("zipf", size, seed=2, cache_dir=self.tmp.name)[0], -1)
+
+        path = datasets.cache_path("zipf", size, 2, self.tmp.name)
+        self.assertEqual(os.listdir(self.tmp.name), [os.path.basename(path)])
+        # A fresh process reads the file instead of generating the dataset again
+        datasets.memory_cache.clear()
+        with open(path, "r+b") as f:
+            f.write((7).to_bytes(8, sys.byteorder, signed=True))
+        self.assertEqual(get_dataset("zipf", size, seed=2, cache_dir=self.tmp.name)[0], 7)
+
+    def test_small_datasets_stay_in_memory(self):
+        get_dataset("uniform", 100, cache_dir=self.tmp.name)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
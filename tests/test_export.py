@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+import zlib
+
+import export
+from export import export as export_animation, frame_positions
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class FramePositionsTest(unittest.TestCase):
+    def test_first_and_last_frame(self):
+        positions = frame_positions(1000, fps=10, duration=2)
+        self.assertEqual(positions[0], 0)
+        self.assertEqual(positions[-1], 1000)
+        self.assertEqual(len(positions), 21)
+
+    def test_steps_per_frame(self):
+        self.assertEqual(frame_positions(10, fps=30, steps_per_frame=4), [0, 4, 8, 10])
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_png_frames(self):
+        output = os.path.join(self.tmp.name, "frames")
+        frames = export_animation([5, 3, 8, 1, 9, 2], "Bubble Sort", output, width=64, height=48, fps=5,
+                                  duration=1, workers=1)
+        files = sorted(os.listdir(output))
+        self.assertEqual(len(files), frames)
+        with open(os.path.join(output, files[-1]), "rb") as f:
+            data = f.read()
+        self.assertTrue(data.startswith(b"\x89PNG\r\n\x1a\n"))
+        # The IHDR chunk holds the size, and its CRC is right
+        self.assertEqual(data[16:24], (64).to_bytes(4, "big") + (48).to_bytes(4, "big"))
+        self.assertEqual(zlib.crc32(data[12:29]).to_bytes(4, "big"), data[29:33])
+
+    def test_gif(self):
+        output = os.path.join(self.tmp.name, "sort.gif")
+        export_animation(list(range(40, 0, -1)), "Merge Sort", output, width=80, height=40, fps=10,
+                         duration=1, workers=2)
+        with open(output, "rb") as f:
+            data = f.read()
+        self.assertTrue(data.startswith(b"GIF89a"))
+        self.assertEqual(data[-1:], b";")
+
+    def test_failed_sort_is_reported(self):
+        output = os.path.join(self.tmp.name, "quick.gif")
+        with self.assertRaises(SystemExit) as raised:
+            export.main([output, "--algorithm", "Quick Sort", "--distribution", "sorted", "--size", "3000"])
+        self.assertIn("RecursionError", str(raised.exception))
+        self.assertFalse(os.path.exists(output))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import random
+import tempfile
+import unittest
+from array import array
+
+import external_sort
+from external_sort import external_sort as sort_file
+from sorting_engine import ALGORITHMS, SortStats
+
+
+class ExternalSortTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def write_binary(self, name, typecode, values):
+        with open(self.path(name), "wb") as f:
+            array(typecode, values).tofile(f)
+        return self.path(name)
+
+    def read_binary(self, name, typecode):
+        values = array(typecode)
+        with open(self.path(name), "rb") as f:
+            values.frombytes(f.read())
+        return values.tolist()
+
+    def test_tiny_memory_budget(self):
+        # Runs of MIN_BLOCK values, merged two at a time over several passes
+        rng = random.Random(1)
+        values = [rng.randint(-10 ** 12, 10 ** 12) for _ in range(10000)]
+        source = self.write_binary("in.bin", "q", values)
+        stats = SortStats()
+        count = sort_file(source, self.path("out.bin"), "int64", memory=1, stats=stats, tmp_dir=self.tmp.name)
+        self.assertEqual(count, len(values))
+        self.assertEqual(self.read_binary("out.bin", "q"), sorted(values))
+        self.assertGreater(stats.writes, len(values))
+        # Only the output is left, the runs are removed
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["in.bin", "out.bin"])
+
+    def test_text_to_binary(self):
+        rng = random.Random(2)
+        values = [rng.uniform(-1, 1) for _ in range(3000)]
+        with open(self.path("in.txt"), "w") as f:
+            for start in range(0, len(values), 7):
+                f.write(", ".join(map(repr, values[start:start + 7])) + "\n")
+        sort_file(self.path("in.txt"), self.path("out.bin"), "float64", "text", "binary", memory=1)
+        self.assertEqual(self.read_binary("out.bin", "d"), sorted(values))
+
+    def test_worker_processes(self):
+        values = [random.randint(0, 50) for _ in range(5000)]
+        source = self.write_binary("in.bin", "i", values)
+        sort_file(source, self.path("out.bin"), "int32", memory=1, algorithm=ALGORITHMS["Intro Sort"], workers=2)
+        self.assertEqual(self.read_binary("out.bin", "i"), sorted(values))
+
+    def test_recursion_error_is_reported(self):
+        source = self.write_binary("in.bin", "q", range(5000))
+        with self.assertRaises(SystemExit) as raised:
+            external_sort.main([source, self.path("out.bin"), "--algorithm", "Quick Sort"])
+        self.assertIn("RecursionError", str(raised.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+from array import array
+
+from input_loader import load, load_string
+
+
+class LoadStringTest(unittest.TestCase):
+    def test_separators_and_promotion(self):
+        numbers = load_string("3, 1\n2\t5,\n4")
+        self.assertEqual((numbers.typecode, numbers.tolist()), ("q", [3, 1, 2, 5, 4]))
+        numbers = load_string("3 1 2.5")
+        self.assertEqual((numbers.typecode, numbers.tolist()), ("d", [3.0, 1.0, 2.5]))
+
+    def test_values_cut_by_chunks(self):
+        text = "12345, 678,9 -10 2.5e3"
+        for chunk_size in range(1, 8):
+            with self.subTest(chunk_size=chunk_size):
+                numbers = load(io.StringIO(text), "text", chunk_size=chunk_size)
+                self.assertEqual(numbers.tolist(), [12345, 678, 9, -10, 2500])
+
+    def test_bad_values(self):
+        for text, message in [("1 x 3", "Value 2: 'x' is not a number"),
+                              ("1,,3", "Value 2: '' is not a number"),
+                              ("1, ,3", "Value 2: '' is not a number"),
+                              (",1", "Value 1: '' is not a number"),
+                              ("1,2,", "Value 3: '' is not a number"),
+                              ("1 nan", "Value 2: 'nan' is not a finite number"),
+                              ("0.5,-inf", "Value 2: '-inf' is not a finite number"),
+                              ("1e999", "Value 1: '1e999' is not a finite number")]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError) as raised:
+                    load_string(text)
+                self.assertEqual(str(raised.exception), message)
+
+    def test_empty_field_across_chunks(self):
+        for chunk_size in range(1, 8):
+            with self.subTest(chunk_size=chunk_size):
+                with self.assertRaisesRegex(ValueError, "Value 3: ''"):
+                    load(io.StringIO("10,20,  ,30"), "text", chunk_size=chunk_size)
+
+    def test_out_of_range(self):
+        with self.assertRaisesRegex(ValueError, "does not fit"):
+            load_string(str(2 ** 70), "q")
+
+
+class LoadFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_binary(self):
+        path = self.path("keys.i64", array("q", [5, -3, 2 ** 40]).tobytes())
+        self.assertEqual(load(path, chunk_size=5).tolist(), [5, -3, 2 ** 40])
+        with self.assertRaisesRegex(ValueError, "middle of a 8 byte value"):
+            load(self.path("cut.i64", b"\0" * 12))
+
+    def test_npy(self):
+        header = "{'descr': '>i4', 'fortran_order': False, 'shape': (3,), }".encode("latin1")
+        data = b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header + struct.pack(">3i", 7, -1, 4)
+        numbers = load(self.path("keys.npy", data))
+        self.assertEqual((numbers.typecode, numbers.tolist()), ("i", [7, -1, 4]))
+        with self.assertRaisesRegex(ValueError, "holds 2 of its 3 values"):
+            load(self.path("short.npy", data[:-4]))
+
+
+if __name__ == "__main__":
+    unittest.main()
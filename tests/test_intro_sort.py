@@ -0,0 +1,59 @@
+import random
+import unittest
+from unittest import mock
+
+import sorting_engine
+from sort_trace import SortTrace
+from sorting_engine import PIVOT_STRATEGIES, SortStats, intro_sort
+
+
+class IntroSortTest(unittest.TestCase):
+    def sort_without_fallback(self, numbers, pivot):
+        # Sort and return the sizes of the ranges that went to the heap sort fallback
+        fallback = []
+        heap_sort_range = sorting_engine.heap_sort_range
+
+        def spy(arr, low, high, *args):
+            fallback.append(high - low + 1)
+            return heap_sort_range(arr, low, high, *args)
+
+        with mock.patch.object(sorting_engine, "heap_sort_range", spy):
+            result = intro_sort(list(numbers), SortStats(), pivot=pivot)
+        self.assertEqual(result, sorted(numbers))
+        return fallback
+
+    def test_sorted_and_reversed_never_fall_back(self):
+        for pivot in ("median-of-three", "ninther"):
+            for numbers in (list(range(20000)), list(range(20000, 0, -1))):
+                self.assertEqual(self.sort_without_fallback(numbers, pivot), [])
+
+    def test_sorted_costs_no_more_than_random(self):
+        n = 20000
+        sorted_stats = SortStats()
+        intro_sort(list(range(n)), sorted_stats)
+        random_stats = SortStats()
+        intro_sort(random.Random(0).sample(range(n), n), random_stats)
+        self.assertLessEqual(sorted_stats.comparisons, random_stats.comparisons)
+
+    def test_all_strategies_sort(self):
+        rng = random.Random(1)
+        for pivot in PIVOT_STRATEGIES:
+            for _ in range(500):
+                numbers = [rng.randint(0, 10) for _ in range(rng.randint(0, 60))]
+                self.assertEqual(intro_sort(list(numbers), pivot=pivot), sorted(numbers))
+
+    def test_every_comparison_is_a_step(self):
+        # The playback counts the COMPARE steps, they must add up to the counter
+        rng = random.Random(2)
+        for pivot in PIVOT_STRATEGIES:
+            for numbers in ([rng.random() for _ in range(2000)], [rng.randint(0, 3) for _ in range(2000)],
+                            list(range(2000)), list(range(2000, 0, -1))):
+                trace = SortTrace(numbers)
+                stats = SortStats()
+                intro_sort(list(numbers), stats, trace.record, pivot=pivot, rng=random.Random(0))
+                with self.subTest(pivot=pivot):
+                    self.assertEqual(trace.comparisons(), stats.comparisons)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import random
+import unittest
+
+from sorting_engine import ALGORITHMS, SortStats
+
+try:
+    import numpy as np
+    import numpy_backend
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class NumpyBackendTest(unittest.TestCase):
+    def test_counters_match_the_engine(self):
+        rng = random.Random(3)
+        for name in ("Bubble Sort", "Merge Sort"):
+            for n in (0, 1, 2, 3, 17, 100, 257):
+                for numbers in ([rng.random() for _ in range(n)], list(range(n)), list(range(n, 0, -1)),
+                                [rng.randint(0, 3) for _ in range(n)]):
+                    expected_stats = SortStats()
+                    expected = ALGORITHMS[name](list(numbers), expected_stats)
+                    stats = SortStats()
+                    result = numpy_backend.ALGORITHMS[name](np.array(numbers, dtype=float), stats)
+                    with self.subTest(name=name, size=n):
+                        self.assertEqual(result.tolist(), expected)
+                        self.assertEqual(stats.as_dict(), expected_stats.as_dict())
+
+    def test_merge_sort_of_integers(self):
+        # The short runs are padded with the smallest and the largest number
+        rng = random.Random(4)
+        extremes = [np.iinfo(np.int64).min, np.iinfo(np.int64).max]
+        for n in (2, 5, 64, 65, 1000, 5000):
+            numbers = [rng.choice(extremes + [rng.randint(-9, 9)]) for _ in range(n)]
+            expected_stats = SortStats()
+            expected = ALGORITHMS["Merge Sort"](list(numbers), expected_stats)
+            stats = SortStats()
+            result = numpy_backend.ALGORITHMS["Merge Sort"](np.array(numbers, dtype=np.int64), stats)
+            with self.subTest(size=n):
+                self.assertEqual(result.tolist(), expected)
+                self.assertEqual(stats.as_dict(), expected_stats.as_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
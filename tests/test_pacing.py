@@ -0,0 +1,75 @@
+import unittest
+
+from pacing import MAX_CATCH_UP, MAX_RATE, MIN_RATE, StepPacer, rate_from_slider, rate_text
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class StepPacerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+
+    def test_steps_follow_the_clock(self):
+        pacer = StepPacer(rate=10, clock=self.clock)
+        self.assertEqual(pacer.due(), 0)
+        pacer.start()
+        due = 0
+        # Uneven frames still add up to the rate
+        for gap in (0.125, 0.0625, 0.1875, 0.25, 0.0625, 0.0625, 0.25):
+            self.clock.now += gap
+            due += pacer.due()
+        self.assertEqual(due, 10)
+
+    def test_stalls_are_not_caught_up(self):
+        pacer = StepPacer(rate=100, clock=self.clock)
+        pacer.start()
+        self.clock.now += 30
+        self.assertEqual(pacer.due(), int(MAX_CATCH_UP * 100))
+
+    def test_pause_and_rate_change(self):
+        pacer = StepPacer(rate=100, clock=self.clock)
+        pacer.start()
+        self.clock.now += 0.1
+        pacer.pause()
+        self.assertFalse(pacer.running)
+        self.clock.now += 0.1
+        self.assertEqual(pacer.due(), 0)
+
+        pacer.start()
+        self.clock.now += 0.125
+        # The time before the change counts at the old rate
+        pacer.set_rate(1000)
+        self.clock.now += 0.125
+        self.assertEqual(pacer.due(), 137)
+
+    def test_unlimited_fills_half_a_frame(self):
+        pacer = StepPacer(rate=None, frame_rate=25, clock=self.clock)
+        pacer.start()
+        for _ in range(50):
+            pacer.record(1000, 0.004)
+        self.clock.now += 0.04
+        self.assertAlmostEqual(pacer.due(), 5000, delta=5)
+
+
+class SliderTest(unittest.TestCase):
+    def test_range(self):
+        self.assertEqual(rate_from_slider(1), MIN_RATE)
+        self.assertAlmostEqual(rate_from_slider(99), MAX_RATE)
+        self.assertIsNone(rate_from_slider(100))
+        rates = [rate_from_slider(value) for value in range(1, 100)]
+        self.assertEqual(rates, sorted(rates))
+
+    def test_text(self):
+        self.assertEqual(rate_text(None), "unlimited")
+        self.assertEqual(rate_text(2.5), "2.5 steps/s")
+        self.assertEqual(rate_text(12000), "12,000 steps/s")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import parallel_sort
+from parallel_sort import cut_run, parallel_sort as sort_in_parallel
+from sorting_engine import SortStats, intro_sort, merge_sort
+
+
+class ParallelSortTest(unittest.TestCase):
+    def test_equal_splitters_share_the_duplicates(self):
+        run = [1] * 10 + [7] * 90 + [9] * 10
+        cuts = cut_run(run, 0, len(run), [7, 7, 7])
+        sizes = [end - start for start, end in zip(cuts, cuts[1:])]
+        self.assertEqual(sizes, [32, 23, 22, 33])
+
+    def test_single_splitter_cuts_its_value_in_half(self):
+        run = [0] * 4 + [5] * 6 + [8] * 2
+        self.assertEqual(cut_run(run, 0, len(run), [5]), [0, 7, 12])
+
+    def test_duplicates_reach_every_merge(self):
+        sizes = []
+        merge_ranges = parallel_sort.merge_ranges
+
+        def spy(name, out_name, typecode, ranges, out_start):
+            sizes.append(sum(end - start for start, end in ranges))
+            return merge_ranges(name, out_name, typecode, ranges, out_start)
+
+        numbers = [4] * 4000
+        with ThreadPoolExecutor(4) as executor, mock.patch.object(parallel_sort, "merge_ranges", spy), \
+                mock.patch.object(parallel_sort, "PARALLEL_THRESHOLD", 1000):
+            sort_in_parallel(numbers, merge_sort, SortStats(), workers=4, executor=executor)
+        self.assertEqual(sorted(sizes), [1000] * 4)
+
+    def test_duplicate_heavy_input(self):
+        rng = random.Random(5)
+        for algorithm in (merge_sort, intro_sort):
+            for numbers in ([3] * 3000, [rng.randint(0, 2) for _ in range(3000)],
+                            [rng.random() for _ in range(3000)]):
+                with mock.patch.object(parallel_sort, "PARALLEL_THRESHOLD", 1000):
+                    result = sort_in_parallel(list(numbers), algorithm, SortStats(), workers=3)
+                self.assertEqual(result, sorted(numbers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import profiling
+
+
+class ProfilingTest(unittest.TestCase):
+    def setUp(self):
+        profiling.reset()
+        self.addCleanup(profiling.reset)
+        self.addCleanup(profiling.disable)
+
+    def test_disabled_records_nothing(self):
+        self.assertIs(profiling.span("sort"), profiling.NULL_SPAN)
+        with profiling.span("sort"):
+            profiling.counter("Merge Sort", comparisons=1)
+        self.assertEqual(len(profiling.events), 0)
+
+    def test_chrome_trace(self):
+        profiling.enable()
+        with profiling.span("sort", algorithm="Merge Sort"):
+            profiling.counter("Merge Sort", comparisons=42)
+
+        def paint():
+            with profiling.span("paint"):
+                pass
+
+        worker = threading.Thread(target=paint, name="painter")
+        worker.start()
+        worker.join()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            profiling.write_chrome_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        events = trace["traceEvents"]
+        counter, sort, paint, thread_name = events
+        self.assertEqual((counter["ph"], counter["args"]), ("C", {"comparisons": 42}))
+        self.assertEqual((sort["name"], sort["ph"], sort["args"]), ("sort", "X", {"algorithm": "Merge Sort"}))
+        # The counter was recorded inside the span
+        self.assertLessEqual(sort["ts"], counter["ts"])
+        self.assertLessEqual(counter["ts"], sort["ts"] + sort["dur"])
+        self.assertNotEqual(paint["tid"], sort["tid"])
+        # Only threads still running are named
+        self.assertEqual((thread_name["ph"], thread_name["tid"], thread_name["args"]),
+                         ("M", sort["tid"], {"name": threading.current_thread().name}))
+
+
+class FrameStatsTest(unittest.TestCase):
+    def test_summary(self):
+        stats = profiling.FrameStats(window=3)
+        self.assertEqual(stats.summary()["fps"], 0.0)
+        for frame_time, draw_calls in ((0.010, 5), (0.030, 6), (0.020, 7), (0.040, 8)):
+            stats.add(frame_time, draw_calls, 1000)
+        summary = stats.summary()
+        self.assertAlmostEqual(summary["frame_ms"], 30.0)
+        self.assertAlmostEqual(summary["max_frame_ms"], 40.0)
+        self.assertEqual((summary["draw_calls"], summary["elements"]), (8, 1000))
+        self.assertIn("8 draw calls", stats.text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import multiprocessing
+import os
+import time
+import unittest
+
+from race import own_process_group, stop_worker
+
+
+def alive(pid):
+    # A zombie has stopped running, even if nobody has waited for it yet
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def worker_with_child(connection):
+    # Stands in for a worker running a parallel sort with a pool of its own
+    own_process_group()
+    child = multiprocessing.get_context("fork").Process(target=time.sleep, args=(60,))
+    child.start()
+    connection.send(child.pid)
+    time.sleep(60)
+
+
+@unittest.skipUnless(hasattr(os, "killpg") and os.path.isdir("/proc"), "needs process groups and /proc")
+class StopWorkerTest(unittest.TestCase):
+    def test_children_of_the_worker_stop_too(self):
+        context = multiprocessing.get_context("fork")
+        receiver, sender = context.Pipe(duplex=False)
+        worker = context.Process(target=worker_with_child, args=(sender,))
+        worker.start()
+        child = receiver.recv()
+        self.assertTrue(alive(child))
+
+        stop_worker(worker)
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+        deadline = time.monotonic() + 5
+        while alive(child) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(alive(child))
+
+
+if __name__ == "__main__":
+    unittest.main()
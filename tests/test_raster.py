@@ -0,0 +1,67 @@
+import unittest
+from array import array
+
+try:
+    import numpy
+    from raster import HIGHLIGHT_RGB, TOP_MARGIN, RasterRenderer, gradient_colours
+except ImportError:
+    numpy = None
+
+BACKGROUND = (255, 255, 255)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class RasterRendererTest(unittest.TestCase):
+    def renderer(self, numbers, graph_type="Column (Bar) Graph"):
+        renderer = RasterRenderer()
+        renderer.set_numbers(numbers)
+        renderer.set_colours(gradient_colours(graph_type), BACKGROUND)
+        return renderer
+
+    def column_heights(self, frame):
+        return (frame != numpy.array(BACKGROUND, dtype=numpy.uint8)).any(axis=2).sum(axis=0).tolist()
+
+    def test_columns_show_the_extremes(self):
+        # Two elements per pixel column, the higher one sets the height
+        numbers = array("q", range(1, 9))
+        renderer = self.renderer(numbers)
+        frame = renderer.render(4, TOP_MARGIN + 80, "Column (Bar) Graph", 1, 8, 255 / 7)
+        self.assertEqual(frame.shape, (TOP_MARGIN + 80, 4, 3))
+        self.assertEqual(self.column_heights(frame), [20, 40, 60, 80])
+        # The lower element fills the bottom of the column in its own colour
+        colours = gradient_colours("Column (Bar) Graph")
+        self.assertEqual(tuple(frame[-1, 3]), colours[int(6 * 255 / 7)])
+        self.assertEqual(tuple(frame[-71, 3]), colours[255])
+
+    def test_arrays_are_shared_and_lists_updated(self):
+        numbers = array("q", [8, 8, 8, 8])
+        renderer = self.renderer(numbers)
+        numbers[0] = 4
+        frame = renderer.render(4, TOP_MARGIN + 80, "Column (Bar) Graph", 0, 8, 255 / 8)
+        self.assertEqual(self.column_heights(frame), [40, 80, 80, 80])
+
+        numbers = [8, 8, 8, 8]
+        renderer = self.renderer(numbers)
+        numbers[1] = 2
+        renderer.update(numbers, [1])
+        frame = renderer.render(4, TOP_MARGIN + 80, "Column (Bar) Graph", 0, 8, 255 / 8)
+        self.assertEqual(self.column_heights(frame), [80, 20, 80, 80])
+
+    def test_highlighted(self):
+        renderer = self.renderer(array("q", range(1, 9)))
+        frame = renderer.render(4, TOP_MARGIN + 80, "Column (Bar) Graph", 1, 8, 255 / 7, highlighted=[7, 99])
+        highlighted = (frame == numpy.array(HIGHLIGHT_RGB, dtype=numpy.uint8)).all(axis=2)
+        self.assertEqual(highlighted.sum(axis=0).tolist(), [0, 0, 0, 80])
+
+    def test_every_graph_type_renders(self):
+        renderer = self.renderer(list(range(1, 5001)))
+        for graph_type in ("Column (Bar) Graph", "Scatter Chart", "Stem Graph"):
+            with self.subTest(graph_type=graph_type):
+                renderer.set_colours(gradient_colours(graph_type), BACKGROUND)
+                frame = renderer.render(300, 200, graph_type, 1, 5000, 255 / 4999, highlighted=[10])
+                self.assertEqual(frame.shape, (200, 300, 3))
+                self.assertGreater(max(self.column_heights(frame)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+from sonification import MidiSonifier, NoteScale, NullOutput
+
+
+class MidiSonifierTest(unittest.TestCase):
+    def test_default_construction(self):
+        sonifier = MidiSonifier()
+        try:
+            self.assertIsInstance(sonifier.output, NullOutput)
+            self.assertIsInstance(sonifier.scale, NoteScale)
+            sonifier.set_range(0, 100)
+            sonifier.play([0, 50, 100])
+        finally:
+            sonifier.close()
+
+    def test_scale_covers_range(self):
+        scale = NoteScale()
+        scale.set_range(0, 100)
+        self.assertEqual(scale.note(0), scale.base_note)
+        self.assertGreater(scale.note(100), scale.note(50))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import threading
+import unittest
+
+from sort_steps import STEP_BATCH, get_steps
+from sort_trace import SortTrace
+from sorting_engine import ALGORITHMS, WRITE, SortStats
+
+
+class SortStepsTest(unittest.TestCase):
+    def inputs(self, name):
+        rng = random.Random(7)
+        integers = name in ("Radix Sort", "Counting Sort")
+        for n in (0, 1, 2, 3, 17, 100, 300, 3000):
+            yield [rng.randint(-50, 500) if integers else rng.random() for _ in range(n)]
+            yield list(range(n))
+            yield list(range(n, 0, -1))
+            yield [rng.randint(0, 3) for _ in range(n)]
+
+    def test_steps_match_the_engine(self):
+        # Same events, same counters and the same result as a recorded run of the engine
+        for name in ALGORITHMS:
+            for numbers in self.inputs(name):
+                if name in ("Bubble Sort", "Selection Sort", "Insertion Sort", "Quick Sort") and len(numbers) > 300:
+                    # Slow at that size, and quick sort recurses too deep on sorted input
+                    continue
+                trace = SortTrace(numbers)
+                expected_stats = SortStats()
+                expected = ALGORITHMS[name](list(numbers), expected_stats, trace.record)
+                events = list(zip(trace.events, trace.first,
+                                  [trace.values[j] if e == WRITE else j for e, j in zip(trace.events, trace.second)]))
+
+                stats = SortStats()
+                result = list(numbers)
+                steps = list(get_steps(name)(result, stats))
+                with self.subTest(name=name, size=len(numbers)):
+                    self.assertEqual(result, expected)
+                    self.assertEqual(steps, events)
+                    self.assertEqual(stats.as_dict(), expected_stats.as_dict())
+
+    def test_close_stops_the_sort(self):
+        numbers = [random.random() for _ in range(20000)]
+        full = SortStats()
+        ALGORITHMS["Tim Sort"](list(numbers), full)
+
+        threads = threading.active_count()
+        stats = SortStats()
+        steps = get_steps("Tim Sort")(list(numbers), stats)
+        for _ in range(10):
+            next(steps)
+        # The sort waits until more steps are asked for
+        self.assertLessEqual(stats.comparisons, 2 * STEP_BATCH)
+        steps.close()
+        for thread in threading.enumerate():
+            if thread.name == "sort steps":
+                thread.join(5)
+        self.assertEqual(threading.active_count(), threads)
+        self.assertLess(stats.comparisons, full.comparisons)
+
+    def test_errors_reach_the_consumer(self):
+        with self.assertRaises(TypeError):
+            list(get_steps("Radix Sort")([0.5, 0.25], SortStats()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import random
+import unittest
+
+from sort_trace import SortTrace, TracePlayer
+from sorting_engine import ALGORITHMS, SortStats
+
+
+class TracePlayerTest(unittest.TestCase):
+    def test_counters_follow_the_steps(self):
+        numbers = [random.randint(0, 50) for _ in range(60)]
+        for name in ("Quick Sort", "Merge Sort", "Radix Sort"):
+            trace = SortTrace(numbers)
+            stats = SortStats()
+            ALGORITHMS[name](list(numbers), stats, trace.record)
+            player = TracePlayer(trace)
+            with self.subTest(name=name):
+                player.seek(len(trace))
+                self.assertEqual((player.comparisons, player.swaps, player.writes),
+                                 (stats.comparisons, stats.swaps, stats.writes))
+                player.seek(len(trace) // 2)
+                player.seek(0)
+                self.assertEqual((player.comparisons, player.swaps, player.writes), (0, 0, 0))
+                self.assertEqual(player.numbers.tolist(), numbers)
+
+
+if __name__ == "__main__":
+    unittest.main()